@@ -0,0 +1,6 @@
+"""
+Núcleo de leitura e análise usado pelo dashboard (teste_novo5.py).
+
+Os módulos deste pacote não dependem do Streamlit: recebem bytes/arquivos e
+devolvem DataFrames e dicionários, deixando a exibição para a interface.
+"""
@@ -0,0 +1,5 @@
+"""python -m analise: processamento em lote sem interface (ver analise.lote)."""
+from analise.lote import main
+
+if __name__ == "__main__":
+    raise SystemExit(main())
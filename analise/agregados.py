@@ -0,0 +1,165 @@
+"""
+Agregados Time/IP pré-calculados.
+
+O estado é um group-by por (dia local, IP) com contagem e primeiro/último
+instante de cada grupo (ns UTC). Dele saem, sem voltar às linhas, as
+contagens por dia (linha do tempo), por IP (top IPs e distintos), o total e
+o período coberto. Estados de partes diferentes dos dados se combinam
+somando contagens e tomando mín./máx., o que permite atualizar o estado só
+com as linhas de um arquivo novo.
+
+Recortes por seleção de IPs e por intervalo de tempo também saem do estado:
+os grupos inteiramente dentro do intervalo são aproveitados e apenas os
+dias em que o intervalo corta algum grupo precisam ser recontados nas
+linhas (no máximo os dias das duas pontas).
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from analise.esquema import NAT_NS, _por_valor, normalizar_ips
+
+_COLUNAS_GRUPOS = ["dia", "ip", "contagem", "tmin", "tmax"]
+
+@dataclass(frozen=True)
+class EstadoAgregado:
+    # dia/tmin/tmax em ns UTC (NAT_NS = sem horário); ip canônico ou None
+    grupos: pd.DataFrame
+    linhas: int
+    fuso: str | None
+    # os IPs das linhas já estavam na forma canônica (seleções de IP podem ser respondidas pelo estado)
+    ips_canonicos: bool = True
+    # (col_tempo, col_ip, dtype da coluna de tempo) de onde o estado saiu
+    origem: tuple = ()
+
+    def por_dia(self) -> pd.Series:
+        """Eventos por dia local, em ordem cronológica (índice: meia-noite no fuso do estado)."""
+        g = self.grupos[self.grupos["dia"] != NAT_NS]
+        por_dia = g.groupby("dia", sort=True)["contagem"].sum()
+        por_dia.index = pd.DatetimeIndex(por_dia.index.to_numpy(dtype="datetime64[ns]"), tz="UTC").tz_convert(self.fuso)
+        return por_dia.rename("count")
+
+    def por_ip(self) -> pd.Series:
+        """Ocorrências por IP, da maior para a menor (empates em ordem de IP)."""
+        g = self.grupos[self.grupos["ip"].notna()]
+        por_ip = g.groupby("ip", sort=False)["contagem"].sum().reset_index()
+        por_ip = por_ip.sort_values(["contagem", "ip"], ascending=[False, True], kind="stable")
+        return pd.Series(por_ip["contagem"].to_numpy(), index=pd.Index(por_ip["ip"].to_numpy(dtype=object)),
+                         name="count")
+
+    def periodo(self) -> tuple[pd.Timestamp, pd.Timestamp] | None:
+        g = self.grupos[self.grupos["dia"] != NAT_NS]
+        if g.empty:
+            return None
+        return (pd.Timestamp(int(g["tmin"].min()), tz="UTC").tz_convert(self.fuso),
+                pd.Timestamp(int(g["tmax"].max()), tz="UTC").tz_convert(self.fuso))
+
+    def filtrar(self, ips=None, intervalo: tuple[int, int] | None = None):
+        """
+        Recorte do estado para uma seleção de IPs e/ou um intervalo [início, fim]
+        em ns UTC. Devolve (estado, dias_parciais): o estado cobre os dias
+        resolvidos só pelos grupos; os dias_parciais (ns UTC da meia-noite local)
+        devem ser recontados nas linhas e somados com combinar().
+        """
+        g = self.grupos
+        if ips is not None:
+            g = g[g["ip"].isin(list(ips))]
+        dias_parciais = np.empty(0, dtype=np.int64)
+        if intervalo is not None:
+            inicio, fim = intervalo
+            g = g[g["dia"] != NAT_NS]
+            dentro = (g["tmin"] >= inicio) & (g["tmax"] <= fim)
+            fora = (g["tmax"] < inicio) | (g["tmin"] > fim)
+            dias_parciais = np.unique(g.loc[~dentro & ~fora, "dia"].to_numpy())
+            g = g[dentro & ~g["dia"].isin(dias_parciais)]
+        g = g.reset_index(drop=True)
+        return EstadoAgregado(g, int(g["contagem"].sum()), self.fuso, self.ips_canonicos, self.origem), dias_parciais
+
+    def fim_do_dia(self, dia: int) -> int:
+        """ns UTC da meia-noite local seguinte a `dia`."""
+        inicio = pd.Timestamp(dia, tz="UTC").tz_convert(self.fuso)
+        return _meia_noite(pd.DatetimeIndex([inicio]), dias=1)[0].value
+
+def _meia_noite(indice: pd.DatetimeIndex, dias: int = 0) -> pd.DatetimeIndex:
+    # início do dia local (`dias` depois); se a meia-noite não existiu (horário de verão), 01:00
+    parede = indice.tz_localize(None).normalize() + pd.Timedelta(days=dias)
+    if indice.tz is None:
+        return parede
+    return parede.tz_localize(indice.tz, ambiguous=True, nonexistent="shift_forward")
+
+def _grupos_vazios() -> pd.DataFrame:
+    return pd.DataFrame({"dia": np.empty(0, np.int64), "ip": pd.Series([], dtype=object),
+                         "contagem": np.empty(0, np.int64), "tmin": np.empty(0, np.int64),
+                         "tmax": np.empty(0, np.int64)})
+
+def agregar(tempos: pd.Series | None, ips: pd.Series | None, origem: tuple = ()) -> EstadoAgregado:
+    """
+    Uma passagem sobre as linhas. `tempos` já no fuso de exibição (o dia é o
+    dia local); `ips` como vierem (são normalizados aqui, como em contar_ips).
+    Qualquer um dos dois pode ser None.
+    """
+    n = len(tempos) if tempos is not None else len(ips)
+    fuso = None
+    if tempos is not None:
+        indice = pd.DatetimeIndex(tempos)
+        fuso = str(indice.tz) if indice.tz is not None else None
+        t = indice.as_unit("ns").asi8
+        dia = _meia_noite(indice).as_unit("ns").asi8
+    else:
+        t = dia = np.full(n, NAT_NS, dtype=np.int64)
+
+    ips_canonicos = True
+    if ips is not None:
+        if isinstance(ips.dtype, pd.CategoricalDtype) and len(ips.cat.categories) > len(ips):
+            # recortes pequenos de uma coluna categórica: normaliza só as categorias presentes
+            ips = ips.cat.remove_unused_categories()
+        _, valores = _por_valor(ips)
+        normalizada = normalizar_ips(ips)
+        # as categorias saem na ordem dos valores originais: iguais a eles só se já eram canônicos
+        ips_canonicos = bool(np.array_equal(np.asarray(normalizada.cat.categories, dtype=object),
+                                            np.asarray(valores, dtype=object)))
+        codigos = normalizada.cat.codes.to_numpy()
+        # a posição extra (código -1) é o IP nulo
+        categorias = np.append(np.asarray(normalizada.cat.categories, dtype=object), None)
+    else:
+        codigos = np.full(n, -1, dtype=np.int64)
+        categorias = np.array([None], dtype=object)
+
+    if n == 0:
+        return EstadoAgregado(_grupos_vazios(), 0, fuso, ips_canonicos, origem)
+    grupos = (pd.DataFrame({"dia": dia, "ip": codigos, "t": t})
+                .groupby(["dia", "ip"], sort=False)["t"]
+                .agg(["size", "min", "max"])
+                .reset_index())
+    grupos = pd.DataFrame({
+        "dia": grupos["dia"].to_numpy(np.int64),
+        "ip": pd.Series(categorias[grupos["ip"].to_numpy()], dtype=object),
+        "contagem": grupos["size"].to_numpy(np.int64),
+        "tmin": grupos["min"].to_numpy(np.int64),
+        "tmax": grupos["max"].to_numpy(np.int64),
+    })
+    return EstadoAgregado(grupos, n, fuso, ips_canonicos, origem)
+
+def combinar(estados, grupos_disjuntos: bool = False) -> EstadoAgregado:
+    """
+    Soma estados de partes disjuntas das linhas (ex.: o estado anterior e o
+    de um arquivo novo). Com grupos_disjuntos=True (nenhum par dia/IP em
+    mais de um estado, como nos dias recontados de filtrar) só concatena.
+    """
+    estados = list(estados)
+    if len(estados) == 1:
+        return estados[0]
+    grupos = pd.concat([e.grupos for e in estados], ignore_index=True)
+    if not grupos_disjuntos:
+        # agrupa pelos códigos dos IPs (inteiros), não pelo texto
+        codigos, valores = pd.factorize(grupos["ip"])
+        grupos = (grupos.assign(ip=codigos)
+                        .groupby(["dia", "ip"], sort=False)
+                        .agg(contagem=("contagem", "sum"), tmin=("tmin", "min"), tmax=("tmax", "max"))
+                        .reset_index()[_COLUNAS_GRUPOS])
+        grupos["ip"] = pd.Series(np.append(np.asarray(valores, dtype=object), None)[grupos["ip"].to_numpy()],
+                                 dtype=object)
+    fuso = next((e.fuso for e in estados if e.fuso), None)
+    return EstadoAgregado(grupos, sum(e.linhas for e in estados), fuso,
+                          all(e.ips_canonicos for e in estados), estados[0].origem)
@@ -0,0 +1,182 @@
+"""
+Extração de artefatos (telefones, e-mails, IMEIs, IPv4/IPv6 com horário)
+do texto de um documento, numa passagem só.
+
+Todos os padrões ficam numa única expressão compilada (um grupo nomeado por
+tipo), percorrida uma vez; a alternativa que casa em cada posição diz o
+tipo. Um candidato recusado na conferência (IMEI sem Luhn, IPv6 que o
+ipaddress não aceita) dá lugar às alternativas seguintes na mesma posição. IPs são associados ao primeiro horário ISO (UTC, "Z")
+que começa até JANELA_PAR caracteres depois deles, na mesma linha, como o
+`.{0,40}?` do extrator antigo, mas sem reprocurar o texto a partir de cada
+IP.
+
+- IPv6 aceita a forma comprimida ("2001:db8::1", "::ffff:10.0.0.1"); o
+  candidato é conferido com ipaddress (horas e MACs não passam);
+- IMEI: 15 dígitos (ou 2-6-6-1 com hífens) com dígito verificador (Luhn)
+  válido;
+- todos os padrões exigem borda antes e depois (um IP não é tirado do meio
+  de um número maior).
+
+O texto pode vir em pedaços (ex.: linhas de um HTML lido em blocos): cada
+pedaço é procurado junto com o final do anterior (SOBREPOSICAO caracteres,
+mais que o maior artefato), e só valem os achados que terminam antes dessa
+sobra; o resultado é o mesmo do texto inteiro.
+"""
+import ipaddress
+import itertools
+import re
+from functools import lru_cache
+
+# distância máxima (caracteres) entre o fim do IP e o início do horário
+JANELA_PAR = 40
+# final de cada pedaço procurado de novo com o pedaço seguinte; maior que qualquer artefato
+SOBREPOSICAO = 512
+# caracteres juntados por pedaço em extrair_artefatos_html
+TAMANHO_PEDACO = 1 << 20
+
+_OCTETO = r"(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)"
+_IPV4 = rf"{_OCTETO}(?:\.{_OCTETO}){{3}}"
+_HEX = r"[0-9A-Fa-f]{1,4}"
+
+# uma alternativa por tipo, nesta ordem de preferência
+_ALTERNATIVAS = [
+    ("data_hora", r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d{1,9})?Z"),
+    ("email", r"(?<![.%+-])[A-Za-z0-9._%+-]{1,64}@[A-Za-z0-9-]{1,63}(?:\.[A-Za-z0-9-]{1,63}){0,6}\.[A-Za-z]{2,24}(?![\w-])"),
+    ("ipv6", rf"(?<![:.])(?:{_HEX}|:)(?::(?:{_HEX})?){{1,7}}(?::{_IPV4}|\.\d{{1,3}}\.\d{{1,3}}\.\d{{1,3}})?(?![\w:])"),
+    ("ipv4", rf"(?<!\.){_IPV4}(?!\w|\.\d)"),
+    ("imei", r"(?<!-)\d{2}-?\d{6}-?\d{6}-?\d(?![\w-])"),
+    ("telefone", r"(?<!\+)\+?\d{1,3}[ \t-]?\(?\d{2,3}\)?[ \t-]?\d{4,5}[ \t-]?\d{4}(?!\d)"),
+]
+# tipos cujo candidato ainda é conferido fora da expressão
+_CONFERIR = {"ipv6", "imei"}
+
+@lru_cache(maxsize=None)
+def _padrao(recusados: frozenset = frozenset()) -> re.Pattern:
+    # o (?<!\w) comum descarta de uma vez as posições no meio de palavras
+    grupos = "|".join(f"(?P<{tipo}>{rx})" for tipo, rx in _ALTERNATIVAS if tipo not in recusados)
+    return re.compile(rf"(?<!\w)(?:{grupos})")
+
+PADRAO = _padrao()
+
+def _luhn(digitos: str) -> bool:
+    soma = 0
+    for i, d in enumerate(reversed(digitos)):
+        n = int(d) * (2 if i % 2 else 1)
+        soma += n - 9 if n > 9 else n
+    return soma % 10 == 0
+
+@lru_cache(maxsize=1 << 16)
+def _valido(tipo: str, valor: str) -> bool:
+    if tipo == "imei":
+        return _luhn(valor.replace("-", ""))
+    # o padrão aceita qualquer sequência de grupos hex com ':'; quem decide é o ipaddress
+    try:
+        ipaddress.IPv6Address(valor)
+    except ValueError:
+        return False
+    return any(c.isalnum() for c in valor)
+
+def _conferido(texto: str, m: re.Match | None) -> re.Match | None:
+    """
+    `m`, se o candidato passar na conferência; senão, o que as alternativas
+    seguintes casam na mesma posição (ex.: 15 dígitos sem Luhn como telefone).
+    """
+    recusados = frozenset()
+    while m is not None and m.lastgroup in _CONFERIR and not _valido(m.lastgroup, m.group()):
+        recusados |= {m.lastgroup}
+        m = _padrao(recusados).match(texto, m.start())
+    return m
+
+def _achados(pedacos, sobreposicao: int = SOBREPOSICAO):
+    """
+    Gera (tipo, valor, início, fim, última quebra de linha antes do início),
+    com posições no texto inteiro, a partir de uma str ou de um iterável de
+    pedaços de texto.
+    """
+    if isinstance(pedacos, str):
+        pedacos = (pedacos,)
+    resto, base, inicio = "", 0, 0  # base: posição de resto[0] no texto inteiro
+    quebra, visto = -1, 0  # visto: até onde o texto já foi procurado por quebras de linha
+    for pedaco in itertools.chain(pedacos, [None]):
+        final = pedaco is None
+        texto = resto + (pedaco or "")
+        limite = len(texto) if final else len(texto) - sobreposicao
+        if limite <= inicio:
+            resto = texto
+            continue
+        retomada, pos = limite, inicio
+        while (m := PADRAO.search(texto, pos)) is not None:
+            a, b = m.span()
+            if b > limite and not final:
+                # pode continuar (ou ser outro artefato) com o próximo pedaço
+                retomada = a
+                break
+            m = _conferido(texto, m)
+            if m is None:
+                pos = b
+                continue
+            b = m.end()
+            if b > limite and not final:
+                retomada = a
+                break
+            pos = b
+            i = texto.rfind("\n", visto - base, a)
+            if i >= 0:
+                quebra = base + i
+            visto = base + b
+            yield m.lastgroup, m.group(), base + a, base + b, quebra
+        i = texto.rfind("\n", visto - base, retomada)
+        if i >= 0:
+            quebra = base + i
+        visto = max(visto, base + retomada)
+        # um caractere antes do ponto de retomada fica, para os lookbehinds
+        manter = max(retomada - 1, 0)
+        resto = texto[manter:]
+        base += manter
+        inicio = retomada - manter
+
+def extrair_artefatos(pedacos, janela: int = JANELA_PAR) -> dict:
+    """
+    {"telefones", "emails", "imeis": listas na ordem do texto;
+     "ipv4", "ipv6": listas de (ip, horário UTC)} de uma str ou de um
+    iterável de pedaços de texto.
+    """
+    res = {"telefones": [], "emails": [], "imeis": [], "ipv4": [], "ipv6": []}
+    listas = {"telefone": res["telefones"], "email": res["emails"], "imei": res["imeis"]}
+    pendentes = {"ipv4": [], "ipv6": []}  # IPs à espera de um horário: (ip, fim)
+    for tipo, valor, inicio, fim, quebra in _achados(pedacos):
+        if tipo in pendentes:
+            # os que já ficaram longe (ou numa linha anterior) não casam com mais nada
+            pendentes[tipo] = [p for p in pendentes[tipo] if inicio - p[1] <= janela and quebra < p[1]]
+            pendentes[tipo].append((valor, fim))
+        elif tipo == "data_hora":
+            for familia, espera in pendentes.items():
+                for ip, fim_ip in espera:
+                    if inicio - fim_ip <= janela and quebra < fim_ip:
+                        res[familia].append((ip, valor))
+                        break
+                espera.clear()
+        else:
+            listas[tipo].append(valor)
+    return res
+
+def _pedacos_linhas(linhas, tamanho: int):
+    lote, n = [], 0
+    for ln in linhas:
+        lote.append(ln)
+        n += len(ln) + 1
+        if n >= tamanho:
+            yield " ".join(lote) + " "
+            lote, n = [], 0
+    if lote:
+        yield " ".join(lote)
+
+def extrair_artefatos_html(fonte, encoding: str = "utf-8", tamanho_pedaco: int = TAMANHO_PEDACO) -> dict:
+    """
+    extrair_artefatos sobre o texto de um HTML (str ou arquivo binário, lido
+    em blocos): as linhas de texto dos elementos, separadas por espaço, como
+    soup.get_text(" ") com os espaços de cada linha aparados.
+    """
+    from analise.ingestao import iter_linhas_html
+    linhas = iter_linhas_html(fonte, encoding, tabelas=False)
+    return extrair_artefatos(_pedacos_linhas(linhas, tamanho_pedaco))
@@ -0,0 +1,127 @@
+"""
+Cache em disco das leituras, endereçado pelo conteúdo do arquivo.
+
+A chave é o SHA-512 dos bytes originais + extensão + VERSAO_PARSER, de modo
+que um mesmo arquivo reenviado (ou relido a cada rerun do Streamlit) não
+precisa ser analisado de novo. O DataFrame é guardado em Feather (Arrow);
+sem o pyarrow, ou se o frame não cabe no Feather, a leitura simplesmente
+não é guardada (pickle de um diretório compartilhado executaria código ao
+ser lido). wa_doc e avisos ficam num JSON ao lado. O diretório é limitado
+em tamanho e os itens menos usados recentemente são removidos primeiro.
+"""
+import json
+import os
+import tempfile
+
+import pandas as pd
+
+from analise.dependencias import disponivel
+from analise.hashing import gerar_hash
+from analise.ingestao import VERSAO_PARSER
+
+# ====== (opcional) pyarrow para Feather ======
+# (só verifica a instalação: quem importa o pyarrow é o pandas, na primeira leitura/escrita)
+ARROW_OK = disponivel("pyarrow")
+
+DIRETORIO_PADRAO = os.environ.get(
+    "ANALISE_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "analistic-doc")
+)
+LIMITE_PADRAO_MB = int(os.environ.get("ANALISE_CACHE_MAX_MB", "2048"))
+
+def _escrever_atomico(caminho: str, escrever):
+    # grava num temporário do mesmo diretório e renomeia: leitores nunca veem arquivo pela metade
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(caminho), suffix=".tmp")
+    os.close(fd)
+    try:
+        escrever(tmp)
+        os.replace(tmp, caminho)
+    except Exception:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+class CacheLeitura:
+    def __init__(self, diretorio: str = DIRETORIO_PADRAO, limite_mb: int = LIMITE_PADRAO_MB):
+        self.diretorio = diretorio
+        self.limite_bytes = limite_mb * 2**20
+        os.makedirs(self.diretorio, exist_ok=True)
+
+    @staticmethod
+    def chave(nome: str, conteudo: bytes | None = None, digest: str | None = None, modo: str = "") -> str:
+        # `modo`: opções de leitura que mudam o resultado (ex.: "todas" as tabelas)
+        ext = nome.split('.')[-1].lower()
+        digest = digest or gerar_hash(conteudo, "sha512")
+        return f"{digest}-{ext}-v{VERSAO_PARSER}" + (f"-{modo}" if modo else "")
+
+    def _caminhos(self, chave: str):
+        base = os.path.join(self.diretorio, chave)
+        # ".pkl": itens de versões antigas, nunca lidos, só removidos no despejo
+        return base + ".json", base + ".feather", base + ".pkl"
+
+    def obter(self, chave: str, nome: str | None = None) -> dict | None:
+        # `nome`: nome do envio atual; os mesmos bytes podem ter chegado antes com outro nome
+        meta_path, feather_path, _ = self._caminhos(chave)
+        try:
+            with open(meta_path, encoding="utf-8") as fh:
+                meta = json.load(fh)
+            if meta["formato"] == "feather":
+                df = pd.read_feather(feather_path)
+            elif meta["formato"] is None:
+                df = None
+            else:
+                return None
+        except Exception:
+            return None
+        os.utime(meta_path)  # marca como usado recentemente (LRU)
+        return {
+            "nome": nome or meta["nome"],
+            "df": df,
+            "wa_doc": meta["wa_doc"],
+            "avisos": [tuple(a) for a in meta["avisos"]],
+        }
+
+    def guardar(self, chave: str, resultado: dict):
+        meta_path, feather_path, _ = self._caminhos(chave)
+        df = resultado["df"]
+        formato = None
+        if df is not None:
+            if not ARROW_OK:
+                return
+            try:
+                _escrever_atomico(feather_path, df.reset_index(drop=True).to_feather)
+            except Exception:
+                return  # colunas mistas/nomes não textuais: fica sem cache
+            formato = "feather"
+        meta = {
+            "nome": resultado["nome"],
+            "wa_doc": resultado["wa_doc"],
+            "avisos": resultado["avisos"],
+            "formato": formato,
+        }
+
+        def _json(caminho):
+            with open(caminho, "w", encoding="utf-8") as fh:
+                json.dump(meta, fh, ensure_ascii=False)
+
+        _escrever_atomico(meta_path, _json)
+        self._despejar()
+
+    def _despejar(self):
+        itens, total = {}, 0
+        for entrada in os.scandir(self.diretorio):
+            if not entrada.is_file() or entrada.name.endswith(".tmp"):
+                continue
+            chave = entrada.name.rsplit(".", 1)[0]
+            info = entrada.stat()
+            total += info.st_size
+            tam, uso = itens.get(chave, (0, 0.0))
+            if entrada.name.endswith(".json"):
+                uso = info.st_mtime
+            itens[chave] = (tam + info.st_size, uso)
+        for chave, (tam, _) in sorted(itens.items(), key=lambda kv: kv[1][1]):
+            if total <= self.limite_bytes:
+                break
+            for caminho in self._caminhos(chave):
+                if os.path.exists(caminho):
+                    os.remove(caminho)
+            total -= tam
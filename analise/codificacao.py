@@ -0,0 +1,119 @@
+"""
+Detecção de encoding compartilhada pelos caminhos HTML/TXT e CSV.
+
+Ordem das tentativas, da mais barata para a mais cara:
+1. BOM (UTF-8, UTF-16, UTF-32);
+2. UTF-8 estrito sobre uma amostra do início do arquivo;
+3. detector incremental do chardet alimentado só com essa amostra.
+
+O resultado fica guardado por hash do arquivo, e apenas a amostra é lida:
+o arquivo é rebobinado para a leitura principal, que o percorre uma vez.
+
+Como só a amostra é examinada, o restante do arquivo pode trazer bytes que
+não decodificam no encoding detectado (ex.: linhas Latin-1 no fim de um CSV
+UTF-8 concatenado). A leitura principal usa então ERROS_DECODIFICACAO: cada
+trecho inválido é lido como Windows-1252, em vez de abortar a leitura, e
+bytes_substituidos() conta esses bytes para o aviso ao usuário.
+"""
+import codecs
+import threading
+from collections import OrderedDict
+
+# bytes do início do arquivo usados na detecção
+TAMANHO_AMOSTRA = 256 * 1024
+# bloco entregue de cada vez ao detector do chardet
+_BLOCO_DETECTOR = 16 * 1024
+# quantos arquivos (por hash) lembrar
+_LIMITE_MEMO = 1024
+
+_BOMS = (
+    # UTF-32 antes de UTF-16: o BOM UTF-32 LE começa com o BOM UTF-16 LE
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+_memo = OrderedDict()
+
+# nome do tratador de erros (encoding_errors= do pandas, errors= dos codecs)
+ERROS_DECODIFICACAO = "analise-cp1252"
+# contagem por thread: o tratador roda na thread que decodifica
+_substituicoes = threading.local()
+
+def _ler_como_cp1252(erro):
+    if not isinstance(erro, UnicodeDecodeError):
+        raise erro
+    trecho = erro.object[erro.start:erro.end]
+    _substituicoes.bytes = bytes_substituidos() + len(trecho)
+    return bytes(trecho).decode("cp1252", errors="replace"), erro.end
+
+codecs.register_error(ERROS_DECODIFICACAO, _ler_como_cp1252)
+
+def bytes_substituidos() -> int:
+    """Bytes lidos como Windows-1252 pelo ERROS_DECODIFICACAO nesta thread (acumulado)."""
+    return getattr(_substituicoes, "bytes", 0)
+
+def _por_bom(amostra: bytes) -> str | None:
+    for bom, enc in _BOMS:
+        if amostra.startswith(bom):
+            return enc
+    return None
+
+def _utf8_estrito(amostra: bytes, completa: bool) -> bool:
+    # a amostra pode cortar um caractere multibyte no fim: só o arquivo completo exige final=True
+    try:
+        codecs.getincrementaldecoder("utf-8")("strict").decode(amostra, final=completa)
+        return True
+    except UnicodeDecodeError:
+        return False
+
+def _por_chardet(amostra: bytes) -> str | None:
+    import chardet  # só para arquivos que não são UTF-8 nem têm BOM
+    detector = chardet.UniversalDetector()
+    for inicio in range(0, len(amostra), _BLOCO_DETECTOR):
+        detector.feed(amostra[inicio:inicio + _BLOCO_DETECTOR])
+        if detector.done:
+            break
+    detector.close()
+    return detector.result["encoding"]
+
+def detectar_encoding_amostra(amostra: bytes, completa: bool = False) -> str:
+    enc = _por_bom(amostra)
+    if enc is None and _utf8_estrito(amostra, completa):
+        enc = "utf-8"
+    if enc is None:
+        enc = _por_chardet(amostra) or "utf-8"
+    try:
+        return codecs.lookup(enc).name
+    except LookupError:
+        return "utf-8"
+
+def detectar_encoding(fonte, digest: str | None = None, tamanho_amostra: int = TAMANHO_AMOSTRA) -> str:
+    """
+    Detecta o encoding de um arquivo binário lendo no máximo `tamanho_amostra`
+    bytes e devolve o arquivo rebobinado. Com `digest` (SHA-512 do arquivo)
+    o resultado é memorizado.
+    """
+    if digest is not None and digest in _memo:
+        _memo.move_to_end(digest)
+        return _memo[digest]
+
+    try:
+        amostra = fonte.read(tamanho_amostra + 1)
+    finally:
+        fonte.seek(0)
+    completa = len(amostra) <= tamanho_amostra
+    enc = detectar_encoding_amostra(amostra[:tamanho_amostra], completa)
+
+    if digest is not None:
+        _memo[digest] = enc
+        if len(_memo) > _LIMITE_MEMO:
+            _memo.popitem(last=False)
+    return enc
+
+def esquecer_encoding(digest: str | None):
+    """Descarta o encoding memorizado para o arquivo (a amostra não representou o arquivo inteiro)."""
+    if digest is not None:
+        _memo.pop(digest, None)
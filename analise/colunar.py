@@ -0,0 +1,106 @@
+"""
+Formatos colunares (Parquet e Feather/Arrow IPC) para exportar e reabrir casos.
+
+Reabrir um caso grande a partir de HTML/CSV significa refazer a análise de
+texto; um arquivo colunar guarda o resultado já tipado. Datas com fuso
+voltam com o mesmo fuso e a coluna de IP, se categórica (normalizada),
+volta categórica com as mesmas categorias: os metadados do pandas vão no
+esquema Arrow.
+
+- Parquet: compactado (zstd), menor para guardar/enviar;
+- Feather (Arrow IPC) sem compressão: o arquivo é lido sem cópia
+  (memory map num caminho em disco, ou o próprio buffer do upload), de
+  modo que abrir o caso custa pouco mais que converter as colunas de texto.
+
+A escrita é feita em grupos de linhas, com o esquema tirado do frame
+inteiro (o mesmo para todos os grupos).
+"""
+import os
+
+import pandas as pd
+
+from analise.dependencias import disponivel
+
+# ====== (opcional) pyarrow, importado nas funções (só quando um arquivo colunar é lido/gravado) ======
+ARROW_OK = disponivel("pyarrow")
+
+FORMATOS_COLUNARES = ("parquet", "feather", "arrow")
+LINHAS_POR_GRUPO = 1_000_000
+COMPRESSAO_PARQUET = "zstd"
+
+def _preparar(df: pd.DataFrame):
+    """
+    (frame, esquema Arrow). Nomes de coluna viram texto e colunas object com
+    tipos misturados também (o Arrow exige um tipo por coluna).
+    """
+    import pyarrow as pa
+    df = df.reset_index(drop=True)
+    if not all(isinstance(c, str) for c in df.columns):
+        df.columns = [str(c) for c in df.columns]
+    try:
+        return df, pa.Schema.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        pass
+    convertidas = {}
+    for col in df.columns:
+        serie = df[col]
+        if serie.dtype == object and pd.api.types.infer_dtype(serie, skipna=True) not in ("string", "empty"):
+            convertidas[col] = serie.astype(str).where(serie.notna(), None)
+    if convertidas:
+        df = df.copy(deep=False)
+        for col, serie in convertidas.items():
+            df[col] = serie
+    return df, pa.Schema.from_pandas(df, preserve_index=False)
+
+def _grupos(df: pd.DataFrame, esquema, linhas_por_grupo: int):
+    import pyarrow as pa
+    for inicio in range(0, max(len(df), 1), linhas_por_grupo):
+        yield pa.Table.from_pandas(df.iloc[inicio:inicio + linhas_por_grupo], schema=esquema, preserve_index=False)
+
+def escrever_parquet(df: pd.DataFrame, destino, linhas_por_grupo: int = LINHAS_POR_GRUPO):
+    """Parquet (zstd) num arquivo binário aberto; um row group por grupo de linhas."""
+    import pyarrow.parquet as pq
+    df, esquema = _preparar(df)
+    with pq.ParquetWriter(destino, esquema, compression=COMPRESSAO_PARQUET) as escritor:
+        for tabela in _grupos(df, esquema, linhas_por_grupo):
+            escritor.write_table(tabela)
+
+def escrever_feather(df: pd.DataFrame, destino, linhas_por_grupo: int = LINHAS_POR_GRUPO):
+    """Feather v2 (arquivo Arrow IPC) sem compressão, para leitura sem cópia."""
+    import pyarrow as pa
+    df, esquema = _preparar(df)
+    opcoes = pa.ipc.IpcWriteOptions(compression=None)
+    with pa.ipc.new_file(destino, esquema, options=opcoes) as escritor:
+        for tabela in _grupos(df, esquema, linhas_por_grupo):
+            escritor.write_table(tabela)
+
+def _origem_arrow(fonte):
+    import pyarrow as pa
+    # arquivo aberto em disco: memory map; upload em memória (BytesIO): o próprio buffer, sem cópia
+    caminho = getattr(fonte, "name", None)
+    if isinstance(caminho, str) and os.path.isfile(caminho):
+        return pa.memory_map(caminho)
+    if hasattr(fonte, "getvalue"):
+        # BytesIO(bytes) devolve os próprios bytes em getvalue(); getbuffer() copiaria
+        return pa.BufferReader(fonte.getvalue())
+    fonte.seek(0)
+    return pa.BufferReader(pa.py_buffer(fonte.read()))
+
+def ler_tabela(fonte, ext: str):
+    """pyarrow.Table de um arquivo Parquet ou Feather/Arrow IPC (formato arquivo ou stream)."""
+    import pyarrow as pa
+    import pyarrow.feather as pa_feather
+    import pyarrow.parquet as pq
+    origem = _origem_arrow(fonte)
+    if ext == "parquet":
+        return pq.read_table(origem)
+    try:
+        return pa_feather.read_table(origem, memory_map=True)
+    except pa.ArrowInvalid:
+        # .arrow gravado no formato stream (sem rodapé) em vez do formato arquivo
+        origem.seek(0)
+        return pa.ipc.open_stream(origem).read_all()
+
+def ler_colunar(fonte, ext: str) -> pd.DataFrame:
+    # split_blocks: cada coluna vira um bloco próprio, sem consolidar (e copiar) as colunas do mesmo tipo
+    return ler_tabela(fonte, ext).to_pandas(split_blocks=True)
@@ -0,0 +1,33 @@
+"""
+Dependências pesadas ou opcionais carregadas só no primeiro uso.
+
+Importar reportlab, python-docx, matplotlib, plotly ou pyarrow custa de
+dezenas a centenas de ms cada, e a maior parte das execuções do dashboard
+(inclusive todo início a frio) não usa nenhum deles. Os módulos de analise
+só verificam se o pacote está instalado (disponivel, sem importá-lo) e o
+importam dentro das funções que o usam; o script do dashboard usa
+ModuloAdiado para os módulos de gráficos.
+"""
+import importlib
+import importlib.util
+from functools import lru_cache
+
+@lru_cache(maxsize=None)
+def disponivel(nome: str) -> bool:
+    """O módulo está instalado? Só procura o módulo, sem importá-lo."""
+    try:
+        return importlib.util.find_spec(nome) is not None
+    except (ImportError, ValueError):
+        return False
+
+class ModuloAdiado:
+    """Módulo importado no primeiro acesso a um atributo (px = ModuloAdiado("plotly.express"))."""
+
+    def __init__(self, nome: str):
+        self._nome = nome
+
+    def __getattr__(self, atributo):
+        return getattr(importlib.import_module(self._nome), atributo)
+
+    def __repr__(self):
+        return f"<ModuloAdiado {self._nome!r}>"
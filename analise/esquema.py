@@ -0,0 +1,168 @@
+"""
+Normalização dos IPs dos pares Time/IP.
+
+Os IPs chegam como texto em grafias variadas (zeros à esquerda, IPv6
+expandido ou em maiúsculas, IPv4 mapeado em IPv6, porta ou colchetes). Aqui
+eles são normalizados para uma forma canônica, numa coluna categórica (um
+dicionário de IPs distintos + códigos inteiros por linha). A porta, quando
+vem junto do endereço, não faz parte da forma canônica mas também não é
+descartada: sai numa coluna própria (portas_ips), necessária para atribuir
+acessos atrás de CGNAT; a zona de um IPv6 ("fe80::1%eth0") fica no
+endereço. Todo o trabalho por texto é feito uma vez por valor distinto
+(pd.factorize) e espalhado para as linhas pelos códigos.
+
+Ao juntar os arquivos de um caso (concatenar com `origens`), cada linha
+ganha o arquivo de origem numa coluna categórica (COLUNA_ARQUIVO): um
+código int8/int16 por linha, em vez do nome repetido como texto.
+"""
+import ipaddress
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+NAT_NS = np.iinfo(np.int64).min
+COLUNA_PORTA = "Porta"
+COLUNA_ARQUIVO = "Arquivo de origem"
+
+_IPV4_COM_PORTA = re.compile(r"^(\d{1,3}(?:\.\d{1,3}){3}):(\d{1,5})$")
+_IPV6_COM_COLCHETES = re.compile(r"^\[([^\]]+)\](?::(\d{1,5}))?$")
+# IPv4 já na forma canônica (sem zeros à esquerda): dispensa o módulo ipaddress
+_OCTETO = r"(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)"
+_IPV4_CANONICO = rf"{_OCTETO}(?:\.{_OCTETO}){{3}}"
+
+def _ip_porta(texto) -> tuple[ipaddress.IPv4Address | ipaddress.IPv6Address | None, int | None]:
+    # (endereço, porta ou None); (None, None) se não for IP
+    if texto is None or (not isinstance(texto, str) and pd.isna(texto)):
+        return None, None
+    texto = str(texto).strip().strip("\"'")
+    porta = None
+    m = _IPV6_COM_COLCHETES.match(texto) or _IPV4_COM_PORTA.match(texto)
+    if m:
+        texto, porta = m.group(1), m.group(2)
+        porta = None if porta is None else int(porta)
+        if porta is not None and porta > 65535:
+            return None, None
+    partes = texto.split(".")
+    if len(partes) == 4 and all(p.isdigit() and len(p) <= 3 for p in partes):
+        # o módulo ipaddress recusa zeros à esquerda ("010.000.001.002")
+        octetos = [int(p) for p in partes]
+        if max(octetos) > 255:
+            return None, None
+        return ipaddress.IPv4Address(bytes(octetos)), porta
+    try:
+        # a zona ("%eth0") é aceita e mantida no endereço
+        ip = ipaddress.ip_address(texto)
+    except ValueError:
+        return None, None
+    if ip.version == 6 and ip.ipv4_mapped is not None:
+        return ip.ipv4_mapped, porta
+    return ip, porta
+
+@lru_cache(maxsize=1 << 16)
+def normalizar_ip(texto) -> str | None:
+    """Forma canônica do endereço (IPv6 comprimido e minúsculo, sem a porta); None se não for IP."""
+    ip, _ = _ip_porta(texto)
+    return None if ip is None else str(ip)
+
+def _por_valor(serie: pd.Series):
+    # códigos por linha (-1 = nulo) e valores distintos
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        return serie.cat.codes.to_numpy(), serie.cat.categories
+    return pd.factorize(serie, sort=False)
+
+def _ipv4_canonicos(valores: pd.Index) -> np.ndarray:
+    if not len(valores):
+        return np.zeros(0, dtype=bool)
+    texto = pd.Index(valores.astype(str), dtype=object)
+    return np.asarray(texto.str.fullmatch(_IPV4_CANONICO), dtype=bool)
+
+def normalizar_ips(serie: pd.Series) -> pd.Series:
+    """
+    Normaliza a coluna inteira como categórica de IPs canônicos. Valores que
+    não são IP ficam como texto aparado, para não sumirem de contagens e
+    tabelas. A porta sai do endereço: guarde-a antes com portas_ips.
+    """
+    codigos, valores = _por_valor(serie)
+    canonicos = np.asarray(valores.astype(str), dtype=object)
+    for i in np.flatnonzero(~_ipv4_canonicos(valores)):
+        canonicos[i] = normalizar_ip(valores[i]) or str(valores[i]).strip()
+    novos, categorias = pd.factorize(pd.Index(canonicos, dtype=object), sort=False)
+    mapa = np.append(novos, -1)  # o código -1 (nulo) continua nulo
+    return pd.Series(pd.Categorical.from_codes(mapa[codigos], categories=categorias),
+                     index=serie.index, name=serie.name)
+
+def portas_ips(serie: pd.Series) -> pd.Series | None:
+    """
+    Porta de cada IP que veio com ela ("1.2.3.4:443", "[2001:db8::1]:8080"),
+    como UInt16 (nula nos demais); None se nenhum valor trouxer porta.
+    """
+    codigos, valores = _por_valor(serie)
+    portas = np.zeros(len(valores) + 1, dtype=np.uint16)  # posição extra para o código -1
+    presentes = np.zeros(len(valores) + 1, dtype=bool)
+    # IPv4 canônico não tem porta: só os demais passam pelo parser
+    for i in np.flatnonzero(~_ipv4_canonicos(valores)):
+        ip, porta = _ip_porta(valores[i])
+        if ip is not None and porta is not None:
+            portas[i], presentes[i] = porta, True
+    if not presentes.any():
+        return None
+    return pd.Series(pd.arrays.IntegerArray(portas[codigos], ~presentes[codigos]),
+                     index=serie.index, name=COLUNA_PORTA)
+
+def ips_com_porta(ips: pd.Series, portas: pd.Series) -> pd.Series:
+    """Texto "ip:porta" ("[ipv6]:porta") onde há porta; o próprio IP nas demais linhas."""
+    texto = ips.astype(object)
+    tem = (portas.notna() & ips.notna()).to_numpy()
+    if tem.any():
+        sel = ips[tem].astype(str)
+        sel = sel.where(~sel.str.contains(":", regex=False), "[" + sel + "]")
+        texto = texto.copy()
+        texto[tem] = sel + ":" + portas[tem].astype(str)
+    return texto
+
+def contar_ips(serie: pd.Series) -> pd.Series:
+    """Equivalente a value_counts() sobre os IPs normalizados, sem converter linha a linha para str."""
+    normalizada = normalizar_ips(serie)
+    codigos = normalizada.cat.codes.to_numpy()
+    contagens = np.bincount(codigos[codigos >= 0], minlength=len(normalizada.cat.categories))
+    ordem = np.argsort(-contagens, kind="stable")
+    ordem = ordem[contagens[ordem] > 0]
+    return pd.Series(contagens[ordem], index=normalizada.cat.categories.take(ordem),
+                     name="count")
+
+def com_origem(df: pd.DataFrame, nome: str) -> pd.DataFrame:
+    """`df` com COLUNA_ARQUIVO categórica valendo `nome` em todas as linhas."""
+    if COLUNA_ARQUIVO in df.columns:
+        # caso reaberto (Parquet/Feather exportado daqui): vale a origem já registrada
+        if isinstance(df[COLUNA_ARQUIVO].dtype, pd.CategoricalDtype):
+            return df
+        return df.assign(**{COLUNA_ARQUIVO: df[COLUNA_ARQUIVO].astype("category")})
+    origem = pd.Categorical.from_codes(np.zeros(len(df), dtype=np.int8), categories=[nome])
+    return df.assign(**{COLUNA_ARQUIVO: origem})
+
+def concatenar(frames, origens=None) -> pd.DataFrame:
+    """
+    pd.concat que mantém as colunas categóricas compactas: categorias
+    diferentes entre os frames são unidas, em vez de a coluna virar object.
+    Com `origens` (o nome do arquivo de cada frame), as linhas ganham a
+    coluna COLUNA_ARQUIVO.
+    """
+    frames = list(frames)
+    if origens is not None:
+        frames = [com_origem(f, nome) for f, nome in zip(frames, origens)]
+    if len(frames) < 2:
+        return frames[0].reset_index(drop=True) if frames else pd.DataFrame()
+    unidas = {}
+    for col in frames[0].columns:
+        partes = [f[col] for f in frames if col in f.columns]
+        if len(partes) == len(frames) and all(isinstance(p.dtype, pd.CategoricalDtype) for p in partes):
+            if len({p.cat.categories.dtype for p in partes}) > 1:
+                # categorias de tipos diferentes (ex.: int num Parquet, texto noutro): object em comum
+                partes = [p.cat.set_categories(p.cat.categories.astype(object)) for p in partes]
+            unidas[col] = union_categoricals(partes, ignore_order=True).categories
+    if unidas:
+        frames = [f.astype({c: pd.CategoricalDtype(cats) for c, cats in unidas.items()}) for f in frames]
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,168 @@
+"""
+Exportação dos dados filtrados (aba Exportações) em blocos, direto para arquivo.
+
+Cada formato é escrito bloco a bloco num arquivo binário aberto, sem montar
+o arquivo inteiro em memória nem copiar o DataFrame:
+
+- Excel: xlsxwriter em modo constant_memory (cada linha vai para o disco ao
+  ser escrita); sem xlsxwriter, openpyxl em modo write-only. Acima do
+  limite de linhas de uma planilha, os dados continuam em novas abas;
+- CSV: to_csv por bloco, só o primeiro com cabeçalho;
+- JSON: lista de registros, com os blocos emendados;
+- NDJSON: um registro por linha;
+- Parquet e Feather: ver analise.colunar (só com pyarrow).
+
+exportar() escreve bloco a bloco num arquivo temporário em disco e devolve o
+conteúdo em bytes, fechando (e apagando) o temporário em seguida; passado ao
+download_button por um callable, só roda quando o botão é clicado.
+"""
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from analise.colunar import ARROW_OK, escrever_feather, escrever_parquet
+from analise.dependencias import disponivel
+
+# ====== (opcional) xlsxwriter: Excel em modo constant_memory (importado na primeira exportação) ======
+XLSXWRITER_OK = disponivel("xlsxwriter")
+
+# linhas por planilha do Excel, incluindo o cabeçalho
+LIMITE_LINHAS_EXCEL = 1_048_576
+LINHAS_POR_BLOCO = 50_000
+FORMATO_DATA_EXCEL = "yyyy-mm-dd hh:mm:ss"
+
+def _blocos(df: pd.DataFrame, linhas_por_bloco: int):
+    for inicio in range(0, len(df), linhas_por_bloco):
+        yield df.iloc[inicio:inicio + linhas_por_bloco]
+
+# ---------- Excel ----------
+def _valores_excel(serie: pd.Series) -> list:
+    """Valores de uma coluna em tipos que os escritores de Excel aceitam; nulos viram None (célula vazia)."""
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        if getattr(serie.dt, "tz", None) is not None:
+            # o Excel não tem fuso: fica o horário local, como no to_excel de antes
+            serie = serie.dt.tz_localize(None)
+        valores = serie.dt.to_pydatetime()
+        valores[serie.isna().to_numpy()] = None
+        return valores.tolist()
+    categorica = isinstance(serie.dtype, pd.CategoricalDtype)
+    if not categorica and (pd.api.types.is_bool_dtype(serie) or pd.api.types.is_integer_dtype(serie)):
+        return serie.astype(object).where(serie.notna(), None).tolist()
+    if not categorica and pd.api.types.is_numeric_dtype(serie):
+        valores = serie.to_numpy(dtype=np.float64, na_value=np.nan)
+        resultado = valores.astype(object)
+        # NaN/inf não existem no Excel
+        resultado[~np.isfinite(valores)] = None
+        return resultado.tolist()
+    valores = serie.astype(object)
+    nulos = valores.isna().to_numpy()
+    resultado = valores.to_numpy(dtype=object, copy=True)
+    if pd.api.types.infer_dtype(resultado, skipna=True) not in ("string", "empty"):
+        # colunas mistas: o que não for texto/número vira texto
+        resultado = np.array([v if isinstance(v, (str, bool, int, float)) else str(v) for v in resultado],
+                             dtype=object)
+    resultado[nulos] = None
+    return resultado.tolist()
+
+def _linhas_excel(df: pd.DataFrame, linhas_por_bloco: int):
+    for bloco in _blocos(df, linhas_por_bloco):
+        yield from zip(*(_valores_excel(bloco[col]) for col in bloco.columns))
+
+def _nome_aba(numero: int) -> str:
+    return "Dados" if numero == 1 else f"Dados {numero}"
+
+def escrever_excel(df: pd.DataFrame, destino, linhas_por_bloco: int = LINHAS_POR_BLOCO,
+                   limite_linhas: int = LIMITE_LINHAS_EXCEL):
+    """
+    Escreve o .xlsx num arquivo binário aberto (com seek). Cada aba recebe o
+    cabeçalho e até `limite_linhas - 1` linhas de dados.
+    """
+    cabecalho = [str(c) for c in df.columns]
+    por_aba = limite_linhas - 1
+    if XLSXWRITER_OK:
+        import xlsxwriter
+        livro = xlsxwriter.Workbook(destino, {
+            "constant_memory": True,
+            "default_date_format": FORMATO_DATA_EXCEL,
+            # texto vai como texto: nada de fórmulas/links a partir dos dados
+            "strings_to_formulas": False,
+            "strings_to_urls": False,
+        })
+        negrito = livro.add_format({"bold": True})
+        aba, linha, numero = None, por_aba, 0
+        for valores in _linhas_excel(df, linhas_por_bloco):
+            if linha == por_aba:
+                numero += 1
+                aba = livro.add_worksheet(_nome_aba(numero))
+                aba.write_row(0, 0, cabecalho, negrito)
+                linha = 0
+            linha += 1
+            aba.write_row(linha, 0, valores)
+        if aba is None:
+            livro.add_worksheet(_nome_aba(1)).write_row(0, 0, cabecalho, negrito)
+        livro.close()
+        return
+
+    from openpyxl import Workbook
+    livro = Workbook(write_only=True)
+    aba, linha, numero = None, por_aba, 0
+    for valores in _linhas_excel(df, linhas_por_bloco):
+        if linha == por_aba:
+            numero += 1
+            aba = livro.create_sheet(_nome_aba(numero))
+            aba.append(cabecalho)
+            linha = 0
+        linha += 1
+        aba.append(valores)
+    if aba is None:
+        livro.create_sheet(_nome_aba(1)).append(cabecalho)
+    livro.save(destino)
+
+# ---------- CSV / JSON / NDJSON ----------
+def escrever_csv(df: pd.DataFrame, destino, linhas_por_bloco: int = LINHAS_POR_BLOCO):
+    """Mesmo conteúdo de df.to_csv(index=False) (utf-8), escrito bloco a bloco."""
+    destino.write(df.iloc[:0].to_csv(index=False).encode("utf-8"))
+    for bloco in _blocos(df, linhas_por_bloco):
+        destino.write(bloco.to_csv(index=False, header=False).encode("utf-8"))
+
+def escrever_json(df: pd.DataFrame, destino, linhas_por_bloco: int = LINHAS_POR_BLOCO):
+    """Lista JSON de registros (datas em ISO 8601), escrita bloco a bloco."""
+    destino.write(b"[")
+    separador = b""
+    for bloco in _blocos(df, linhas_por_bloco):
+        registros = bloco.to_json(orient="records", force_ascii=False, date_format="iso")
+        # cada bloco é "[...]": os colchetes saem e os blocos são emendados com ","
+        destino.write(separador + registros[1:-1].encode("utf-8"))
+        separador = b","
+    destino.write(b"]")
+
+def escrever_ndjson(df: pd.DataFrame, destino, linhas_por_bloco: int = LINHAS_POR_BLOCO):
+    """Um registro JSON por linha (JSON Lines), escrito bloco a bloco."""
+    for bloco in _blocos(df, linhas_por_bloco):
+        # cada bloco já termina com "\n"
+        destino.write(bloco.to_json(orient="records", lines=True, force_ascii=False,
+                                    date_format="iso").encode("utf-8"))
+
+ESCRITORES = {
+    "xlsx": escrever_excel,
+    "csv": escrever_csv,
+    "json": escrever_json,
+    "ndjson": escrever_ndjson,
+}
+if ARROW_OK:
+    ESCRITORES.update(parquet=escrever_parquet, feather=escrever_feather)
+
+def exportar(df: pd.DataFrame, formato: str, linhas_por_bloco: int | None = None) -> bytes:
+    """
+    Escreve `df` no formato pedido num arquivo temporário e devolve o
+    conteúdo. Sem `linhas_por_bloco`, cada escritor usa o seu padrão.
+    """
+    # o temporário fecha aqui mesmo: nada fica aberto entre os reruns
+    with tempfile.TemporaryFile() as destino:
+        if linhas_por_bloco is None:
+            ESCRITORES[formato](df, destino)
+        else:
+            ESCRITORES[formato](df, destino, linhas_por_bloco)
+        destino.seek(0)
+        return destino.read()
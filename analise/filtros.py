@@ -0,0 +1,112 @@
+"""
+Motor de filtros indexado da aba Filtros.
+
+Cada coluna filtrada é codificada por dicionário uma única vez (pd.factorize)
+e ganha listas de linhas por valor (layout CSR: linhas ordenadas por código
++ deslocamentos). Uma seleção de valores vira um bitmap (máscara booleana)
+montado só a partir das listas dos valores escolhidos; filtros de intervalo
+(datas e números) viram bitmaps por comparação vetorizada. Os bitmaps ficam
+em cache por filtro e o resultado é a interseção deles: mudar um filtro
+recalcula apenas o bitmap daquele filtro.
+"""
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_bool_dtype, is_datetime64_any_dtype, is_numeric_dtype
+
+_LIMITE_BITMAPS = 64
+
+class IndiceColuna:
+    def __init__(self, serie: pd.Series):
+        self.codigos, valores = pd.factorize(serie, sort=False)
+        self.valores = pd.Index(valores)
+        self.contagens = np.bincount(self.codigos[self.codigos >= 0], minlength=len(self.valores))
+        ordem = np.argsort(self.codigos, kind="stable")
+        self._linhas = ordem[self.codigos[ordem] >= 0]
+        self._deslocamentos = np.concatenate([[0], np.cumsum(self.contagens)])
+        self._por_frequencia = None
+        self._texto = None
+
+    def bitmap(self, selecao) -> np.ndarray:
+        mascara = np.zeros(len(self.codigos), dtype=bool)
+        for codigo in self.valores.get_indexer(list(selecao)):
+            if codigo >= 0:
+                mascara[self._linhas[self._deslocamentos[codigo]:self._deslocamentos[codigo + 1]]] = True
+        return mascara
+
+    def buscar(self, termo: str = "", inicio: int = 0, limite: int = 200):
+        """
+        Valores em ordem decrescente de frequência, opcionalmente filtrados
+        por substring (sem diferenciar maiúsculas). Devolve (valores,
+        contagens, total de valores que casam com o termo).
+        """
+        if self._por_frequencia is None:
+            self._por_frequencia = np.argsort(-self.contagens, kind="stable")
+        codigos = self._por_frequencia
+        if termo:
+            if self._texto is None:
+                self._texto = pd.Index(self.valores.astype(str)).str.lower()
+            casam = self._texto.str.contains(termo.lower(), regex=False)
+            codigos = codigos[np.asarray(casam)[codigos]]
+        pagina = codigos[inicio:inicio + limite]
+        return list(self.valores.take(pagina)), self.contagens[pagina], len(codigos)
+
+def intervalo_de_parede(ini, fim, tz=None) -> tuple[pd.Timestamp, pd.Timestamp]:
+    """
+    (início, fim) de um seletor de datas em horário de parede com precisão de
+    minuto -> instantes no fuso `tz` da coluna (sem fuso se `tz` for None). O
+    fim cobre o minuto inteiro. Nas trocas de horário de verão o intervalo
+    fica o mais largo possível: um horário ambíguo (repetido) vale pela
+    primeira ocorrência no início e pela segunda no fim, e um inexistente
+    (pulado) avança até a troca no início e recua até ela no fim.
+    """
+    ini, fim = pd.Timestamp(ini), pd.Timestamp(fim) + pd.Timedelta(seconds=59.999999)
+    if tz is not None:
+        ini = ini.tz_localize(tz, ambiguous=True, nonexistent="shift_forward")
+        fim = fim.tz_localize(tz, ambiguous=False, nonexistent="shift_backward")
+    return ini, fim
+
+def filtro_por_intervalo(serie: pd.Series) -> bool:
+    return (is_datetime64_any_dtype(serie) or is_numeric_dtype(serie)) and not is_bool_dtype(serie)
+
+class MotorFiltros:
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self._indices = {}
+        self._bitmaps = OrderedDict()
+
+    def indice(self, col) -> IndiceColuna:
+        if col not in self._indices:
+            self._indices[col] = IndiceColuna(self.df[col])
+        return self._indices[col]
+
+    def _bitmap(self, filtro) -> np.ndarray:
+        if filtro in self._bitmaps:
+            self._bitmaps.move_to_end(filtro)
+            return self._bitmaps[filtro]
+        col, tipo, arg = filtro
+        if tipo == "valores":
+            bitmap = self.indice(col).bitmap(arg)
+        else:
+            inicio, fim = arg
+            serie = self.df[col]
+            bitmap = (serie >= inicio).to_numpy(dtype=bool, na_value=False) & \
+                     (serie <= fim).to_numpy(dtype=bool, na_value=False)
+        self._bitmaps[filtro] = bitmap
+        if len(self._bitmaps) > _LIMITE_BITMAPS:
+            self._bitmaps.popitem(last=False)
+        return bitmap
+
+    def aplicar(self, filtros) -> pd.DataFrame:
+        """
+        `filtros` é uma sequência de (coluna, "valores", tupla_de_valores) ou
+        (coluna, "intervalo", (início, fim)). Sem filtros devolve o próprio df.
+        """
+        filtros = [f for f in filtros if f[2]]
+        if not filtros:
+            return self.df
+        mascara = self._bitmap(filtros[0]).copy()
+        for filtro in filtros[1:]:
+            mascara &= self._bitmap(filtro)
+        return self.df[mascara]
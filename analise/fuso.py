@@ -0,0 +1,52 @@
+"""
+Conversão de horários UTC para o fuso local (America/Sao_Paulo), vetorizada.
+
+Os instantes são tratados como arrays int64 de nanossegundos desde a época
+(UTC), e o horário de parede sai das regras do banco de fusos (via
+pandas), inclusive o horário de verão brasileiro (até 2019) que um
+deslocamento fixo de -3 h ignora. Horários em texto (ISO 8601, ex.:
+"2024-03-01T12:00:00Z") são convertidos uma vez por valor distinto:
+registros repetem muito o mesmo horário, e o resultado de cada valor é
+espalhado de volta para as linhas.
+"""
+import numpy as np
+import pandas as pd
+
+FUSO_PADRAO = "America/Sao_Paulo"
+_NAT = np.iinfo(np.int64).min
+
+def utc_para_local(utc_ns, fuso=FUSO_PADRAO) -> np.ndarray:
+    """Horário de parede no `fuso` (int64 ns, sem fuso) de instantes UTC em int64 ns; NaT continua NaT."""
+    indice = pd.DatetimeIndex(np.asarray(utc_ns, dtype=np.int64).view("M8[ns]"), tz="UTC")
+    return indice.tz_convert(fuso).tz_localize(None).asi8
+
+def para_fuso(serie: pd.Series, fuso=FUSO_PADRAO) -> pd.Series:
+    """Série datetime no `fuso`; valores sem fuso são tratados como UTC."""
+    if serie.dt.tz is None:
+        serie = serie.dt.tz_localize("UTC")
+    return serie.dt.tz_convert(fuso)
+
+def formatar_iso(local_ns: np.ndarray) -> np.ndarray:
+    """"YYYY-MM-DD HH:MM:SS" (array de objetos, None no NaT) de horários de parede em int64 ns."""
+    nulos = local_ns == _NAT
+    segundos = np.where(nulos, 0, local_ns // 1_000_000_000).astype("M8[s]")
+    caracteres = np.datetime_as_string(segundos, unit="s").astype("U19").view("U1").reshape(-1, 19)
+    caracteres[:, 10] = " "
+    texto = np.ascontiguousarray(caracteres).view("U19").ravel().astype(object)
+    texto[nulos] = None
+    return texto
+
+def iso_utc_para_local(valores, fuso=FUSO_PADRAO) -> np.ndarray:
+    """
+    Horários ISO 8601 em UTC (texto) -> horário local "YYYY-MM-DD HH:MM:SS"
+    (None onde o valor é vazio ou inválido). Cada valor distinto é lido,
+    convertido e formatado uma vez.
+    """
+    codigos, unicos = pd.factorize(np.asarray(valores, dtype=object))
+    if not len(unicos):
+        return np.full(len(codigos), None, dtype=object)
+    utc = pd.to_datetime(pd.Index(unicos, dtype=object), format="ISO8601", utc=True, errors="coerce")
+    # "as_unit": o ISO pode vir em s/ms/us; a conversão trabalha em ns
+    convertidos = formatar_iso(utc_para_local(utc.as_unit("ns").asi8, fuso))
+    # código -1: valor vazio (None/NaN)
+    return np.append(convertidos, None)[codigos]
@@ -0,0 +1,186 @@
+"""
+Gráficos PNG do relatório, com cache e desenho fora da thread do script.
+
+Cada gráfico é pedido como (tipo, dados, parâmetros), com os dados já
+agregados (contagem por dia, top IPs) em tipos simples. A chave do cache é
+o hash desse pedido: regerar o relatório com os mesmos dados e parâmetros
+devolve os mesmos bytes PNG sem desenhar nada. Os pedidos que faltam no
+cache são desenhados num pool persistente (processos com o backend Agg
+quando há mais de uma CPU; senão uma thread auxiliar), enquanto
+montar_modelo segue com a tabela e os hashes.
+
+O desenho usa matplotlib.figure.Figure + FigureCanvasAgg diretamente, sem
+o estado global do pyplot; o matplotlib só é importado no primeiro desenho
+(quem só consulta o cache não paga a importação).
+"""
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date
+from io import BytesIO
+
+from analise.hashing import gerar_hash
+
+# mudar o desenho exige mudar a versão: invalida as entradas antigas do cache
+VERSAO_GRAFICOS = 1
+DPI = 180
+LIMITE_CACHE_MB = 64
+
+def _png(fig, dpi: int) -> bytes:
+    buf = BytesIO()
+    fig.savefig(buf, format="png", bbox_inches="tight", dpi=dpi)
+    return buf.getvalue()
+
+def _desenhar_timeline(ax, dados, params):
+    dias, contagens = dados
+    ax.plot([date.fromisoformat(d) for d in dias], contagens, marker="o")
+    ax.set_title("Linha do tempo de eventos por dia")
+    ax.set_xlabel("Data")
+    ax.set_ylabel("Quantidade de eventos")
+    ax.grid(True, linewidth=0.3)
+
+def _desenhar_top_ips(ax, dados, params):
+    ips, contagens = dados
+    # mesmo desenho de Series.plot(kind="barh"): uma barra por posição, rótulos nos ticks
+    ax.barh(range(len(ips)), contagens, height=0.5, align="center")
+    ax.set_yticks(range(len(ips)), ips)
+    ax.set_ylim(-0.5, len(ips) - 0.5)
+    ax.invert_yaxis()
+    ax.set_title(f"Top {len(ips)} IPs por frequência")
+    ax.set_xlabel("Ocorrências")
+
+_DESENHOS = {"timeline": _desenhar_timeline, "top_ips": _desenhar_top_ips}
+
+def desenhar(pedido) -> bytes:
+    """Desenha um pedido (tipo, dados, params) e devolve o PNG. É o que roda no pool."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    tipo, dados, params = pedido
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    _DESENHOS[tipo](fig.subplots(), dados, params)
+    return _png(fig, params["dpi"])
+
+def pedido_timeline(por_dia, dpi: int = DPI):
+    """`por_dia`: Series de contagens indexada pela meia-noite de cada dia (EstadoAgregado.por_dia)."""
+    if por_dia.empty:
+        return None
+    dias = tuple(d.isoformat() for d in por_dia.index.date)
+    return ("timeline", (dias, tuple(int(v) for v in por_dia.to_numpy())), {"dpi": dpi})
+
+def pedido_top_ips(contagem_ips, top_n: int = 10, dpi: int = DPI):
+    cont = contagem_ips.head(top_n)
+    if cont.empty:
+        return None
+    return ("top_ips", (tuple(map(str, cont.index)), tuple(int(v) for v in cont.to_numpy())), {"dpi": dpi})
+
+def chave(pedido) -> str:
+    tipo, dados, params = pedido
+    texto = json.dumps([VERSAO_GRAFICOS, tipo, dados, params], ensure_ascii=False, sort_keys=True)
+    return gerar_hash(texto.encode("utf-8"), "sha256")
+
+class CacheGraficos:
+    """PNG por chave do pedido, em memória, limitado em bytes (LRU)."""
+    def __init__(self, limite_mb: int = LIMITE_CACHE_MB):
+        self.limite_bytes = limite_mb * 2**20
+        self._itens = OrderedDict()
+        self._total = 0
+        self._trava = threading.Lock()
+
+    def obter(self, chave_pedido: str) -> bytes | None:
+        with self._trava:
+            png = self._itens.get(chave_pedido)
+            if png is not None:
+                self._itens.move_to_end(chave_pedido)
+            return png
+
+    def guardar(self, chave_pedido: str, png: bytes):
+        with self._trava:
+            if chave_pedido in self._itens:
+                return
+            self._itens[chave_pedido] = png
+            self._total += len(png)
+            while self._total > self.limite_bytes and len(self._itens) > 1:
+                _, antigo = self._itens.popitem(last=False)
+                self._total -= len(antigo)
+
+_cache = CacheGraficos()
+_pool = None
+_trava_pool = threading.Lock()
+
+def _iniciar_processo():
+    import matplotlib
+    matplotlib.use("Agg")
+
+def _descartar_pool():
+    # pool quebrado (processo morto): o próximo pedido cria outro
+    global _pool
+    with _trava_pool:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+def _executor(processos: int | None):
+    global _pool
+    with _trava_pool:
+        if _pool is None:
+            processos = processos or min(2, os.cpu_count() or 1)
+            if processos > 1:
+                _pool = ProcessPoolExecutor(max_workers=processos, initializer=_iniciar_processo)
+            else:
+                _pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="graficos")
+        return _pool
+
+def iniciar_pool(processos: int | None = None):
+    """
+    Cria o pool de desenho, se ainda não existe. Com processos=1 é uma thread
+    auxiliar: é o que se quer dentro de um processo que já é worker de outro
+    pool (ex.: o processamento em lote de analise.lote).
+    """
+    _executor(processos)
+
+def solicitar(pedidos, cache: CacheGraficos | None = None, processos: int | None = None) -> list:
+    """
+    Devolve um Future por pedido (None para pedido None). Os que estão no
+    cache já vêm resolvidos; os demais são desenhados no pool e entram no
+    cache ao terminar. Se o pool falhar, o gráfico é desenhado aqui mesmo.
+    """
+    cache = _cache if cache is None else cache
+    futuros = []
+    for pedido in pedidos:
+        if pedido is None:
+            futuros.append(None)
+            continue
+        k = chave(pedido)
+        png = cache.obter(k)
+        if png is None:
+            try:
+                futuro = _executor(processos).submit(desenhar, pedido)
+            except Exception:
+                _descartar_pool()
+                futuro = Future()
+                futuro.set_result(desenhar(pedido))
+            futuro.add_done_callback(
+                lambda f, k=k: cache.guardar(k, f.result()) if not f.exception() else None)
+        else:
+            futuro = Future()
+            futuro.set_result(png)
+        futuros.append(futuro)
+    return futuros
+
+def coletar(futuros, pedidos) -> list:
+    """PNG de cada Future de solicitar(); um processo do pool que morreu não derruba o relatório."""
+    pngs = []
+    for futuro, pedido in zip(futuros, pedidos):
+        if futuro is None:
+            pngs.append(None)
+            continue
+        try:
+            pngs.append(futuro.result())
+        except Exception:
+            _descartar_pool()
+            pngs.append(desenhar(pedido))
+    return pngs
@@ -0,0 +1,163 @@
+"""
+Hashes de evidência (SHA-512 por padrão).
+
+- gerar_hash: bytes já em memória.
+- hash_arquivo: arquivo em disco ou objeto de arquivo, lido em blocos.
+- hash_dataframe: conjunto de registros normalizado, coluna a coluna sobre
+  os buffers (não depende do tamanho dos blocos lidos).
+- hash_arvore: modo paralelo opcional. É um digest DIFERENTE do SHA-512 do
+  arquivo: folhas de tamanho fixo com hash em paralelo (threads; o hashlib
+  libera o GIL) e uma raiz sobre os digests das folhas. Deve ser informado
+  sempre junto com o nome do esquema (ESQUEMA_ARVORE) e o tamanho da folha.
+"""
+import hashlib
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+TAMANHO_BLOCO = 1 << 20
+TAMANHO_FOLHA = 4 << 20
+LINHAS_POR_BLOCO = 1 << 16
+ESQUEMA_ARVORE = "arvore-v1"
+
+# ---------- HASH (SHA-512) ----------
+def gerar_hash(conteudo_bytes: bytes, algoritmo: str = "sha512") -> str:
+    h = hashlib.new(algoritmo)
+    h.update(conteudo_bytes)
+    return h.hexdigest()
+
+def _blocos_arquivo(fonte, tamanho_bloco: int):
+    if isinstance(fonte, (str, os.PathLike)):
+        with open(fonte, "rb") as f:
+            yield from iter(lambda: f.read(tamanho_bloco), b"")
+        return
+    posicao = fonte.tell() if hasattr(fonte, "tell") else None
+    if posicao is not None:
+        fonte.seek(0)
+    try:
+        yield from iter(lambda: fonte.read(tamanho_bloco), b"")
+    finally:
+        if posicao is not None:
+            fonte.seek(posicao)
+
+def hash_arquivo(fonte, algoritmo: str = "sha512", tamanho_bloco: int = TAMANHO_BLOCO) -> str:
+    """
+    Mesmo digest de gerar_hash(conteúdo inteiro), sem carregar o arquivo:
+    `fonte` é um caminho ou um objeto de arquivo binário (lido desde o início;
+    a posição original é restaurada).
+    """
+    h = hashlib.new(algoritmo)
+    for bloco in _blocos_arquivo(fonte, tamanho_bloco):
+        h.update(bloco)
+    return h.hexdigest()
+
+# ---------- registros normalizados ----------
+def _tipo_coluna(serie: pd.Series) -> str:
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return "tempo"
+    if pd.api.types.is_bool_dtype(serie):
+        return "bool"
+    if pd.api.types.is_numeric_dtype(serie):
+        return "numero"
+    return "texto"
+
+def _categorias_codificadas(serie: pd.Series):
+    # categorias codificadas uma vez por coluna; os blocos só indexam pelos códigos
+    cats = np.empty(len(serie.cat.categories), dtype=object)
+    cats[:] = [str(c).encode("utf-8") for c in serie.cat.categories]
+    return cats, np.fromiter(map(len, cats), dtype="<i8", count=len(cats))
+
+def _dtype_cabecalho(serie: pd.Series, tipo: str) -> str:
+    if tipo == "tempo":
+        # como os dados (ns UTC): nem o fuso de exibição nem a unidade entram no hash
+        return "datetime64[ns, UTC]" if isinstance(serie.dtype, pd.DatetimeTZDtype) else "datetime64[ns]"
+    return str(serie.dtype)
+
+def _atualizar_coluna(h_dados, h_tamanhos, h_nulos, serie: pd.Series, tipo: str, categorias=None):
+    nulos = serie.isna().to_numpy()
+    # um byte por linha (packbits dependeria do alinhamento de cada bloco)
+    h_nulos.update(nulos.view(np.uint8).tobytes())
+    if tipo == "tempo":
+        # instante em ns UTC: o fuso de exibição não muda o hash
+        valores = pd.DatetimeIndex(serie).as_unit("ns").asi8
+        h_dados.update(np.ascontiguousarray(valores, dtype="<i8").tobytes())
+    elif tipo == "bool":
+        h_dados.update(serie.fillna(False).to_numpy(dtype=np.uint8).tobytes())
+    elif tipo == "numero":
+        # nulos entram como 0 nos dados; a máscara de nulos os distingue
+        valores = np.asarray(serie.fillna(0) if nulos.any() else serie)
+        h_dados.update(np.ascontiguousarray(valores, dtype=valores.dtype.newbyteorder("<")).tobytes())
+    elif categorias is not None:
+        codigos = serie.cat.codes.to_numpy()
+        codigos = codigos[codigos >= 0]
+        h_tamanhos.update(categorias[1][codigos].tobytes())
+        h_dados.update(b"".join(categorias[0][codigos]))
+    else:
+        # texto (e demais tipos) pela representação str, com o tamanho de cada valor
+        codificados = [str(v).encode("utf-8") for v in serie[~nulos]]
+        h_tamanhos.update(np.fromiter(map(len, codificados), dtype="<i8", count=len(codificados)).tobytes())
+        h_dados.update(b"".join(codificados))
+
+def hash_dataframe(df: pd.DataFrame, algoritmo: str = "sha512",
+                   linhas_por_bloco: int = LINHAS_POR_BLOCO) -> str:
+    """
+    Hash do conjunto de registros (valores, ordem das linhas, nomes e tipos
+    das colunas). Cada coluna é percorrida em blocos alimentando fluxos
+    separados de dados, tamanhos e nulos, de modo que o resultado não depende
+    de linhas_por_bloco.
+    """
+    h = hashlib.new(algoritmo)
+    h.update(struct.pack("<qq", len(df), df.shape[1]))
+    for col in df.columns:
+        serie = df[col]
+        tipo = _tipo_coluna(serie)
+        categorias = (_categorias_codificadas(serie)
+                      if tipo == "texto" and isinstance(serie.dtype, pd.CategoricalDtype) else None)
+        h_dados, h_tamanhos, h_nulos = (hashlib.new(algoritmo) for _ in range(3))
+        for inicio in range(0, len(serie), linhas_por_bloco):
+            _atualizar_coluna(h_dados, h_tamanhos, h_nulos, serie.iloc[inicio:inicio + linhas_por_bloco],
+                              tipo, categorias)
+        cabecalho = f"{col}\x1f{_dtype_cabecalho(serie, tipo)}".encode("utf-8")
+        h.update(struct.pack("<q", len(cabecalho)) + cabecalho)
+        for parcial in (h_dados, h_tamanhos, h_nulos):
+            h.update(parcial.digest())
+    return h.hexdigest()
+
+# ---------- hash em árvore (paralelo) ----------
+def _folha(dados, algoritmo: str) -> bytes:
+    # prefixos distintos para folha e raiz (0x00 / 0x01)
+    h = hashlib.new(algoritmo)
+    h.update(b"\x00")
+    h.update(dados)
+    return h.digest()
+
+def hash_arvore(fonte, algoritmo: str = "sha512", tamanho_folha: int = TAMANHO_FOLHA,
+                max_workers: int | None = None) -> str:
+    """
+    Digest em árvore de dois níveis: raiz = H(0x01 || tamanho_folha || H(0x00 || folha_1) || ...).
+    `fonte` é um caminho, bytes/memoryview ou objeto de arquivo binário. Não é
+    igual ao SHA-512 do arquivo.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    raiz = hashlib.new(algoritmo)
+    raiz.update(b"\x01" + struct.pack("<q", tamanho_folha))
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        if isinstance(fonte, (bytes, bytearray, memoryview)):
+            dados = memoryview(fonte)
+            folhas = ex.map(lambda i: _folha(dados[i:i + tamanho_folha], algoritmo),
+                            range(0, len(dados), tamanho_folha))
+            for digest in folhas:
+                raiz.update(digest)
+        else:
+            # no máximo 2 folhas por worker em memória ao mesmo tempo
+            pendentes = []
+            for bloco in _blocos_arquivo(fonte, tamanho_folha):
+                pendentes.append(ex.submit(_folha, bloco, algoritmo))
+                if len(pendentes) >= 2 * max_workers:
+                    raiz.update(pendentes.pop(0).result())
+            for futuro in pendentes:
+                raiz.update(futuro.result())
+    return raiz.hexdigest()
@@ -0,0 +1,724 @@
+import codecs
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from html.parser import HTMLParser
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+from pandas.io.parsers import TextParser
+
+from analise import leitura_csv
+from analise.codificacao import bytes_substituidos, detectar_encoding, esquecer_encoding
+from analise.colunar import ARROW_OK, FORMATOS_COLUNARES, ler_colunar
+from analise.dependencias import disponivel
+from analise.esquema import COLUNA_PORTA, concatenar, normalizar_ips, portas_ips
+from analise.hashing import gerar_hash
+from analise.leitura_csv import ler_csv, ler_csv_em_blocos
+from analise.leitura_xlsx import iter_planilhas
+
+# ====== (opcional) lxml: tokenizador em C (importado no primeiro HTML lido) ======
+LXML_OK = disponivel("lxml")
+
+# incrementar sempre que a saída da leitura mudar (invalida o cache em disco)
+VERSAO_PARSER = 6
+
+# tamanho das fatias (bytes/caracteres) entregues ao parser
+TAMANHO_FATIA = 1 << 20
+# registros Time/IP convertidos de uma vez para os buffers colunares
+TAMANHO_BLOCO = 1 << 16
+# linhas guardadas para o resumo do WhatsApp Business Record (cabeçalho)
+LIMITE_CABECALHO = 20_000
+
+# =============================
+# Decodificação
+# =============================
+
+def _fatias_texto(fonte, encoding: str):
+    if isinstance(fonte, str):
+        for inicio in range(0, len(fonte), TAMANHO_FATIA):
+            yield fonte[inicio:inicio + TAMANHO_FATIA]
+        return
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    while True:
+        bloco = fonte.read(TAMANHO_FATIA)
+        if not bloco:
+            break
+        yield decoder.decode(bloco)
+    resto = decoder.decode(b"", final=True)
+    if resto:
+        yield resto
+
+# =============================
+# Passagem única sobre o HTML
+# =============================
+
+_TAGS_SEM_TEXTO = {"script", "style", "template"}
+_ESPACOS = re.compile(r"[\s\xa0]+")
+
+def _expandir_spans(celulas, restante):
+    """
+    Expande colspan/rowspan de uma linha (mesma regra do pd.read_html).
+    `celulas` é uma lista de (texto, rowspan, colspan) e `restante` guarda as
+    células de linhas anteriores que ainda ocupam espaço nesta linha.
+    """
+    textos, proximo = [], []
+    index = 0
+    for texto, rowspan, colspan in celulas:
+        while restante and restante[0][0] <= index:
+            prev_i, prev_texto, prev_rowspan = restante.pop(0)
+            textos.append(prev_texto)
+            if prev_rowspan > 1:
+                proximo.append((prev_i, prev_texto, prev_rowspan - 1))
+            index += 1
+        for _ in range(colspan):
+            textos.append(texto)
+            if rowspan > 1:
+                proximo.append((index, texto, rowspan - 1))
+            index += 1
+    for prev_i, prev_texto, prev_rowspan in restante:
+        textos.append(prev_texto)
+        if prev_rowspan > 1:
+            proximo.append((prev_i, prev_texto, prev_rowspan - 1))
+    return textos, proximo
+
+def _span(attrs, nome) -> int:
+    try:
+        return max(int(attrs.get(nome) or 1), 1)
+    except (TypeError, ValueError):
+        return 1
+
+class _TabelaEmConstrucao:
+    def __init__(self):
+        self.cabecalho, self.corpo, self.rodape = [], [], []
+        self.secao = None
+        self.linha = None
+        self.celula = None
+        self.so_th = True
+        self.th_iniciais = 0
+        self._restante = []
+
+    def abrir_secao(self, secao):
+        self.fechar_linha()
+        self._fechar_restante()
+        self.secao = secao
+
+    def fechar_secao(self):
+        self.fechar_linha()
+        self._fechar_restante()
+        self.secao = None
+
+    def abrir_linha(self):
+        self.fechar_linha()
+        self.linha = []
+        self.so_th = True
+
+    def abrir_celula(self, tag, attrs):
+        if self.linha is None:
+            self.abrir_linha()
+        self.fechar_celula()
+        self.celula = [[], _span(attrs, "rowspan"), _span(attrs, "colspan")]
+        if tag != "th":
+            self.so_th = False
+
+    def fechar_celula(self):
+        if self.celula is not None:
+            partes, rowspan, colspan = self.celula
+            texto = _ESPACOS.sub(" ", "".join(partes)).strip()
+            self.linha.append((texto, rowspan, colspan))
+            self.celula = None
+
+    def fechar_linha(self):
+        if self.linha is None:
+            return
+        self.fechar_celula()
+        if self.linha:
+            textos, self._restante = _expandir_spans(self.linha, self._restante)
+            self._destino().append(textos)
+            if self.secao != "thead" and self.secao != "tfoot":
+                if self.so_th and self.th_iniciais == len(self.corpo) - 1:
+                    self.th_iniciais += 1
+        self.linha = None
+
+    def _fechar_restante(self):
+        while self._restante:
+            textos, self._restante = _expandir_spans([], self._restante)
+            self._destino().append(textos)
+
+    def _destino(self):
+        if self.secao == "thead":
+            return self.cabecalho
+        if self.secao == "tfoot":
+            return self.rodape
+        return self.corpo
+
+    def para_dataframe(self) -> pd.DataFrame | None:
+        self.fechar_secao()
+        cabecalho, corpo = self.cabecalho, self.corpo
+        if not cabecalho and self.th_iniciais:
+            cabecalho, corpo = corpo[:self.th_iniciais], corpo[self.th_iniciais:]
+        header = None
+        if cabecalho:
+            if len(cabecalho) == 1:
+                header = 0
+            else:
+                header = [i for i, row in enumerate(cabecalho) if any(t for t in row)]
+        linhas = cabecalho + corpo + self.rodape
+        if not linhas:
+            return None
+        largura = max(len(r) for r in linhas)
+        for r in linhas:
+            if len(r) < largura:
+                r.extend([""] * (largura - len(r)))
+        with TextParser(linhas, header=header, thousands=",") as tp:
+            return tp.read()
+
+class _ColetorHTML:
+    """
+    Alvo de parser (interface start/end/data/close do lxml) que percorre o
+    documento uma única vez e produz, ao mesmo tempo, as linhas de texto
+    (equivalentes a soup.get_text("\\n")) e as tabelas encontradas.
+    """
+
+    def __init__(self):
+        self.linhas = []
+        self.tabelas = []
+        self._buffer = []
+        self._sem_texto = 0
+        self._pilha = []
+
+    def _descarregar(self):
+        if not self._buffer:
+            return
+        texto = "".join(self._buffer)
+        self._buffer = []
+        if self._sem_texto:
+            return
+        for ln in texto.splitlines():
+            ln = ln.strip()
+            if ln:
+                self.linhas.append(ln)
+
+    def start(self, tag, attrs):
+        self._descarregar()
+        tag = tag.lower() if isinstance(tag, str) else ""
+        if tag in _TAGS_SEM_TEXTO:
+            self._sem_texto += 1
+        elif tag == "table":
+            self._pilha.append(_TabelaEmConstrucao())
+        elif self._pilha:
+            tabela = self._pilha[-1]
+            if tag in ("thead", "tbody", "tfoot"):
+                tabela.abrir_secao(tag)
+            elif tag == "tr":
+                tabela.abrir_linha()
+            elif tag in ("td", "th"):
+                tabela.abrir_celula(tag, attrs)
+
+    def end(self, tag):
+        self._descarregar()
+        tag = tag.lower() if isinstance(tag, str) else ""
+        if tag in _TAGS_SEM_TEXTO:
+            self._sem_texto = max(self._sem_texto - 1, 0)
+        elif tag == "table" and self._pilha:
+            tabela = self._pilha.pop()
+            try:
+                df = tabela.para_dataframe()
+            except Exception:
+                df = None
+            if df is not None:
+                self.tabelas.append(df)
+        elif self._pilha:
+            tabela = self._pilha[-1]
+            if tag in ("thead", "tbody", "tfoot"):
+                tabela.fechar_secao()
+            elif tag == "tr":
+                tabela.fechar_linha()
+            elif tag in ("td", "th"):
+                tabela.fechar_celula()
+
+    def data(self, texto):
+        self._buffer.append(texto)
+        if self._pilha and not self._sem_texto:
+            celula = self._pilha[-1].celula
+            if celula is not None:
+                celula[0].append(texto)
+
+    def drenar(self):
+        linhas, self.linhas = self.linhas, []
+        return linhas
+
+    def close(self):
+        self._descarregar()
+        while self._pilha:
+            self.end("table")
+        return self
+
+class _ColetorTexto(_ColetorHTML):
+    """Só as linhas de texto, sem montar as tabelas."""
+
+    def start(self, tag, attrs):
+        self._descarregar()
+        if isinstance(tag, str) and tag.lower() in _TAGS_SEM_TEXTO:
+            self._sem_texto += 1
+
+    def end(self, tag):
+        self._descarregar()
+        if isinstance(tag, str) and tag.lower() in _TAGS_SEM_TEXTO:
+            self._sem_texto = max(self._sem_texto - 1, 0)
+
+    def data(self, texto):
+        self._buffer.append(texto)
+
+class _AdaptadorHTMLParser(HTMLParser):
+    """Reaproveita o _ColetorHTML com o tokenizador da biblioteca padrão (sem lxml)."""
+
+    def __init__(self, alvo):
+        super().__init__(convert_charrefs=True)
+        self._alvo = alvo
+
+    def handle_starttag(self, tag, attrs):
+        self._alvo.start(tag, dict(attrs))
+
+    def handle_startendtag(self, tag, attrs):
+        self._alvo.start(tag, dict(attrs))
+        self._alvo.end(tag)
+
+    def handle_endtag(self, tag):
+        self._alvo.end(tag)
+
+    def handle_data(self, data):
+        self._alvo.data(data)
+
+    def close(self):
+        super().close()
+        return self._alvo.close()
+
+def _novo_parser(alvo):
+    if LXML_OK:
+        from lxml import etree
+        return etree.HTMLParser(target=alvo, huge_tree=True, recover=True)
+    return _AdaptadorHTMLParser(alvo)
+
+def iter_linhas_html(fonte, encoding: str = "utf-8", coletor: _ColetorHTML | None = None,
+                     tabelas: bool = True):
+    """
+    Gera as linhas de texto do documento à medida que ele é lido.
+    `fonte` pode ser uma str ou um arquivo binário (lido em blocos); as
+    tabelas encontradas ficam em `coletor.tabelas` (com tabelas=False, e
+    sem coletor, elas nem são montadas).
+    """
+    if coletor is None:
+        coletor = _ColetorHTML() if tabelas else _ColetorTexto()
+    parser = _novo_parser(coletor)
+    for fatia in _fatias_texto(fonte, encoding):
+        parser.feed(fatia)
+        yield from coletor.drenar()
+    parser.close()
+    yield from coletor.drenar()
+
+# ---------- Sanitizador para WhatsApp Business Record ----------
+def _sanitize_wa_value(value: str, key_en: str) -> str:
+    v = value or ""
+    v = re.sub(r"(WhatsApp\s+Business\s+Record\s+Page\s*\d+|Página\s*\d+)", "", v, flags=re.I)
+    v = re.sub(r"\s{2,}", " ", v).strip()
+    if key_en == "ip addresses definition":
+        cut_tokens = ["IP Addresses:", "Ip Addresses", "IP Address", "Time 20", "Time 19"]
+        for tok in cut_tokens:
+            idx = v.find(tok)
+            if idx != -1:
+                v = v[:idx].strip()
+                break
+    m = re.search(r"\b20\d{2}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}\s+UTC\b", v)
+    if m:
+        v = v[:m.start()].strip()
+    return v
+
+def _parse_whatsapp_business_record(lines: list[str]) -> dict | None:
+    lower_lines = [ln.lower() for ln in lines]
+
+    keys_en = [
+        "service",
+        "account identifier",
+        "account type",
+        "generated",
+        "date range",
+        "ncmec reports definition",
+        "ncmec cybertips",
+        "emails definition",
+        "registered email addresses",
+        "ip addresses definition",
+    ]
+    map_pt = {
+        "service": "Serviço",
+        "account identifier": "Identificador da Conta",
+        "account type": "Tipo de Conta",
+        "generated": "Gerado em",
+        "date range": "Intervalo de Datas",
+        "ncmec reports definition": "Definição – Relatórios NCMEC",
+        "ncmec cybertips": "NCMEC CyberTips",
+        "emails definition": "Definição – E-mails",
+        "registered email addresses": "E-mails Cadastrados",
+        "ip addresses definition": "Definição – Endereços IP",
+    }
+
+    idxs = {}
+    for i, ll in enumerate(lower_lines):
+        for k in keys_en:
+            if ll == k and k not in idxs:
+                idxs[k] = i
+
+    if "service" not in idxs:
+        return None
+
+    result = {}
+    for pos, k in enumerate(keys_en):
+        if k not in idxs:
+            continue
+        start = idxs[k] + 1
+        next_idx = None
+        for j in range(pos + 1, len(keys_en)):
+            if keys_en[j] in idxs:
+                next_idx = idxs[keys_en[j]]
+                break
+        end = next_idx if next_idx is not None else len(lines)
+
+        chunk = lines[start:end]
+        chunk = [c for c in chunk if c.lower() not in keys_en]
+        value = " ".join(chunk).strip()
+        value = _sanitize_wa_value(value, k)
+        if value:
+            result[map_pt[k]] = value
+
+    return result or None
+
+def iter_time_ip(linhas):
+    """Consome linhas uma a uma e gera os pares (Time, IP Address) do registro."""
+    skip_prefixes = ("WhatsApp Business Record Page",)
+    tempo = ip = None
+    aguardando = None
+    for ln in linhas:
+        if not ln or ln.startswith(skip_prefixes):
+            continue
+        if aguardando is not None:
+            if aguardando == "Time":
+                tempo = ln
+            else:
+                ip = ln
+            aguardando = None
+            if tempo and ip:
+                yield tempo, ip
+                tempo = ip = None
+            continue
+        low = ln.lower()
+        if low == "time":
+            aguardando = "Time"
+        elif low in ("ip address", "ip addresses", "ipaddress", "ip"):
+            aguardando = "IP Address"
+
+class _BufferTimeIP:
+    """
+    Buffers colunares pré-alocados para os pares Time/IP: o tempo vira int64
+    (ns UTC) em blocos e o IP é codificado por dicionário (int32), de modo que
+    nenhuma lista de dicts por registro é mantida. O IP sai como categórica.
+    """
+
+    def __init__(self, capacidade: int = TAMANHO_BLOCO):
+        self._tempos = np.empty(capacidade, dtype="int64")
+        self._codigos = np.empty(capacidade, dtype="int32")
+        self._n = 0
+        self._ips = {}
+        self._pend_tempos = []
+        self._pend_codigos = []
+
+    def __len__(self):
+        return self._n + len(self._pend_tempos)
+
+    def adicionar(self, tempo: str, ip: str):
+        codigo = self._ips.get(ip)
+        if codigo is None:
+            codigo = self._ips[ip] = len(self._ips)
+        self._pend_tempos.append(tempo)
+        self._pend_codigos.append(codigo)
+        if len(self._pend_tempos) >= TAMANHO_BLOCO:
+            self._descarregar()
+
+    def _descarregar(self):
+        k = len(self._pend_tempos)
+        if not k:
+            return
+        fim = self._n + k
+        if fim > len(self._tempos):
+            capacidade = max(fim, 2 * len(self._tempos))
+            self._tempos = np.resize(self._tempos, capacidade)
+            self._codigos = np.resize(self._codigos, capacidade)
+        try:
+            convertidos = pd.to_datetime(pd.Index(self._pend_tempos), errors="coerce", utc=True)
+            self._tempos[self._n:fim] = convertidos.as_unit("ns").asi8
+        except Exception:
+            self._tempos[self._n:fim] = np.iinfo("int64").min
+        self._codigos[self._n:fim] = self._pend_codigos
+        self._n = fim
+        self._pend_tempos, self._pend_codigos = [], []
+
+    def para_dataframe(self) -> pd.DataFrame | None:
+        self._descarregar()
+        if not self._n:
+            return None
+        tempos = pd.DatetimeIndex(self._tempos[:self._n].view("M8[ns]")).tz_localize("UTC")
+        ips = pd.Series(pd.Categorical.from_codes(self._codigos[:self._n],
+                                                  categories=pd.Index(list(self._ips), dtype=object)))
+        df = pd.DataFrame({
+            "Time": tempos,
+            # o dicionário já existe: a coluna fica categórica, com a grafia normalizada
+            "IP Address": normalizar_ips(ips),
+        })
+        portas = portas_ips(ips)
+        if portas is not None:
+            # a porta sai do endereço normalizado mas fica no registro (atribuição atrás de CGNAT)
+            df[COLUNA_PORTA] = portas
+        return df
+
+def analisar_html(fonte, encoding: str = "utf-8") -> dict:
+    """
+    Tokeniza o documento uma única vez e alimenta, a partir dessa passagem,
+    o resumo do WhatsApp Business Record, as tabelas e o extrator Time/IP.
+    `fonte` pode ser a str já decodificada ou o arquivo binário, que então é
+    lido em blocos com memória limitada.
+    """
+    coletor = _ColetorHTML()
+    buffer = _BufferTimeIP()
+    cabecalho = []
+
+    def _linhas():
+        # o cabeçalho WA fica antes dos registros; paramos de guardá-lo no primeiro par
+        for ln in iter_linhas_html(fonte, encoding, coletor):
+            if len(cabecalho) < LIMITE_CABECALHO and not len(buffer):
+                cabecalho.append(ln)
+            yield ln
+
+    for tempo, ip in iter_time_ip(_linhas()):
+        buffer.adicionar(tempo, ip)
+
+    try:
+        wa_doc = _parse_whatsapp_business_record(cabecalho)
+    except Exception:
+        wa_doc = None
+
+    time_ip = None if coletor.tabelas else buffer.para_dataframe()
+    return {"wa_doc": wa_doc, "tabelas": coletor.tabelas, "time_ip": time_ip}
+
+# =============================
+# Leitura de arquivos enviados
+# =============================
+
+def _esquema(df: pd.DataFrame) -> tuple:
+    return tuple(str(c) for c in df.columns)
+
+def combinar_tabelas(tabelas) -> tuple[pd.DataFrame | None, list]:
+    """
+    Junta as tabelas (nome, df) de um arquivo. Tabelas com o mesmo esquema
+    (mesmas colunas, na mesma ordem) formam um grupo; uma tabela sem
+    cabeçalho (colunas 0..n-1) com a largura do grupo anterior é tratada como
+    continuação dele (tabela quebrada por página). Esquemas diferentes são
+    unidos por nome de coluna. Devolve (df, contagens), com contagens
+    [(nome, linhas, número do grupo)].
+    """
+    grupos, contagens, partes = [], [], []
+    anterior = None
+    for nome, df in tabelas:
+        if df is None or df.empty:
+            contagens.append((nome, 0, None))
+            continue
+        sem_cabecalho = list(df.columns) == list(range(len(df.columns)))
+        if sem_cabecalho and anterior is not None and len(df.columns) == len(anterior):
+            df = df.set_axis(list(partes[-1].columns), axis=1)
+        esquema = _esquema(df)
+        if esquema not in grupos:
+            grupos.append(esquema)
+        contagens.append((nome, len(df), grupos.index(esquema) + 1))
+        partes.append(df)
+        anterior = esquema
+    if not partes:
+        return None, contagens
+    return concatenar(partes), contagens
+
+# tabelas listadas nominalmente no aviso de contagens
+LIMITE_TABELAS_AVISO = 30
+
+def _tamanho(fonte) -> int:
+    posicao = fonte.tell()
+    try:
+        return fonte.seek(0, os.SEEK_END)
+    finally:
+        fonte.seek(posicao)
+
+def _avisos_tabelas(contagens: list, tipo: str) -> list:
+    grupos = {g for _, _, g in contagens if g is not None}
+    itens = [f"{nome}: {linhas} linhas" + (f" (esquema {g})" if len(grupos) > 1 and g else "")
+             for nome, linhas, g in contagens[:LIMITE_TABELAS_AVISO]]
+    if len(contagens) > LIMITE_TABELAS_AVISO:
+        itens.append(f"… e mais {len(contagens) - LIMITE_TABELAS_AVISO}")
+    avisos = [("info", f"{len(contagens)} {tipo} lidas — " + "; ".join(itens))]
+    if len(grupos) > 1:
+        avisos.append(("warning", f"{len(grupos)} esquemas de colunas diferentes: as tabelas foram unidas "
+                                  "por nome de coluna (células sem valor ficam vazias)."))
+    return avisos
+
+def ler_arquivo(nome: str, fonte, digest: str | None = None, todas_tabelas: bool = False) -> dict:
+    """
+    Lê um arquivo HTML/HTM/TXT, XLSX, CSV, Parquet ou Feather/Arrow sem
+    depender da interface.
+    Devolve {"nome", "df", "wa_doc", "avisos"}, em que `avisos` é uma lista de
+    (nível, mensagem) com nível "info", "warning" ou "error". `digest` (SHA-512
+    do arquivo, se já conhecido) permite reaproveitar a detecção de encoding.
+    Com `todas_tabelas`, todas as abas do XLSX e todas as tabelas do HTML são
+    lidas e combinadas (combinar_tabelas), com as linhas de cada uma nos
+    avisos; sem, só a primeira.
+    """
+    ext = nome.split('.')[-1].lower()
+    resultado = {"nome": nome, "df": None, "wa_doc": None, "avisos": []}
+    avisos = resultado["avisos"]
+
+    if ext == "xlsx":
+        try:
+            # aba por aba, em blocos de linhas (mesmo resultado do pd.read_excel)
+            planilhas = iter_planilhas(fonte, todas=todas_tabelas)
+            if todas_tabelas:
+                resultado["df"], contagens = combinar_tabelas(
+                    (f"Planilha '{aba}'", df) for aba, df in planilhas)
+                avisos.extend(_avisos_tabelas(contagens, "planilhas"))
+            else:
+                resultado["df"] = next(planilhas)[1]
+        finally:
+            fonte.seek(0)
+
+    elif ext == "csv":
+        try:
+            enc = detectar_encoding(fonte, digest)
+            avisos.append(("info", f"Arquivo CSV detectado com encoding: **{enc}**"))
+            substituidos = bytes_substituidos()
+            if _tamanho(fonte) > leitura_csv.LIMIAR_BLOCOS:
+                avisos.append(("info", "CSV grande: lido em blocos de "
+                                       f"{leitura_csv.TAMANHO_BLOCO:,} linhas".replace(",", ".")))
+                resultado["df"] = ler_csv_em_blocos(fonte, enc)
+            else:
+                resultado["df"] = ler_csv(fonte, enc)
+            substituidos = bytes_substituidos() - substituidos
+            if substituidos:
+                # a amostra não representou o arquivo: a detecção memorizada não vale mais
+                esquecer_encoding(digest)
+                avisos.append(("warning", f"{substituidos} byte(s) inválidos em {enc} (encodings misturados "
+                                          "no arquivo) foram lidos como Windows-1252; confira os textos acentuados."))
+        except Exception as e:
+            avisos.append(("error", f"Erro ao ler CSV: {e}"))
+        finally:
+            fonte.seek(0)
+
+    elif ext in ("html", "htm", "txt"):
+        try:
+            # Uma única passagem, lida em blocos, alimenta o resumo WA, as tabelas e o extrator Time/IP
+            fonte.seek(0)
+            enc = detectar_encoding(fonte, digest)
+            doc = analisar_html(fonte, enc)
+            resultado["wa_doc"] = doc["wa_doc"]
+
+            if doc["tabelas"] and todas_tabelas:
+                resultado["df"], contagens = combinar_tabelas(
+                    (f"Tabela {i}", df) for i, df in enumerate(doc["tabelas"], start=1))
+                avisos.extend(_avisos_tabelas(contagens, "tabelas"))
+            elif doc["tabelas"]:
+                resultado["df"] = doc["tabelas"][0]
+            elif doc["time_ip"] is not None and not doc["time_ip"].empty:
+                resultado["df"] = doc["time_ip"]
+            else:
+                avisos.append(("error", "Não foi possível extrair dados: sem <table> e formato não corresponde a Time/IP."))
+        except Exception as e:
+            avisos.append(("error", f"Erro ao ler arquivo de texto/HTML: {e}"))
+        finally:
+            fonte.seek(0)
+
+    elif ext in FORMATOS_COLUNARES:
+        if not ARROW_OK:
+            avisos.append(("error", "Para Parquet/Feather, instale o pacote: pip install pyarrow"))
+        else:
+            try:
+                resultado["df"] = ler_colunar(fonte, ext)
+            except Exception as e:
+                avisos.append(("error", f"Erro ao ler {ext.upper()}: {e}"))
+            finally:
+                fonte.seek(0)
+
+    else:
+        avisos.append(("warning", "Extensão não suportada. Use HTML/HTM/TXT, XLSX, CSV, Parquet ou Feather."))
+
+    return resultado
+
+def _ler_arquivo_bytes(nome: str, conteudo: bytes, digest: str | None = None,
+                       todas_tabelas: bool = False) -> dict:
+    # Ponto de entrada dos processos do pool: um erro fica restrito ao próprio arquivo
+    try:
+        return ler_arquivo(nome, BytesIO(conteudo), digest, todas_tabelas)
+    except Exception as e:
+        return {"nome": nome, "df": None, "wa_doc": None,
+                "avisos": [("error", f"Erro ao ler {nome}: {e}")]}
+
+def iter_ler_arquivos(arquivos, max_workers: int | None = None, cache=None, digests=None,
+                      todas_tabelas: bool = False):
+    """
+    Lê vários arquivos, recebidos como pares (nome, bytes), e gera
+    (índice, resultado) à medida que cada um termina. Com mais de um worker a
+    leitura é distribuída num pool de processos; o índice permite remontar a
+    ordem original antes do pd.concat.
+
+    Com `cache` (analise.cache.CacheLeitura), arquivos já lidos são servidos do
+    disco e só os demais vão para o parser. `digests` opcional traz o SHA-512
+    de cada arquivo, já calculado, na mesma ordem de `arquivos`.
+    `todas_tabelas` é repassado a ler_arquivo.
+    """
+    arquivos = list(arquivos)
+    digests = list(digests) if digests else [None] * len(arquivos)
+    chaves = [None] * len(arquivos)
+    pendentes = []
+    for i, (nome, conteudo) in enumerate(arquivos):
+        if nome.split('.')[-1].lower() in FORMATOS_COLUNARES:
+            # já colunar: lido aqui mesmo, sem cópia do buffer; nem cache nem pool (o frame voltaria por pickle)
+            yield i, _ler_arquivo_bytes(nome, conteudo, digests[i], todas_tabelas)
+            continue
+        if cache is not None:
+            digests[i] = digests[i] or gerar_hash(conteudo, "sha512")
+            chaves[i] = cache.chave(nome, digest=digests[i], modo="todas" if todas_tabelas else "")
+            resultado = cache.obter(chaves[i], nome)
+            if resultado is not None:
+                yield i, resultado
+                continue
+        pendentes.append(i)
+
+    def _concluido(i, resultado):
+        if cache is not None and not any(nivel == "error" for nivel, _ in resultado["avisos"]):
+            try:
+                cache.guardar(chaves[i], resultado)
+            except Exception:
+                pass  # cache é só otimização
+        return i, resultado
+
+    if max_workers is None:
+        max_workers = min(len(pendentes), os.cpu_count() or 1)
+    if max_workers <= 1 or len(pendentes) <= 1:
+        for i in pendentes:
+            yield _concluido(i, _ler_arquivo_bytes(*arquivos[i], digests[i], todas_tabelas))
+        return
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futuros = {pool.submit(_ler_arquivo_bytes, *arquivos[i], digests[i], todas_tabelas): i
+                   for i in pendentes}
+        for futuro in as_completed(futuros):
+            i = futuros[futuro]
+            try:
+                yield _concluido(i, futuro.result())
+            except Exception as e:
+                # processo do pool encerrado de forma anormal
+                nome = arquivos[i][0]
+                yield i, {"nome": nome, "df": None, "wa_doc": None,
+                          "avisos": [("error", f"Erro ao ler {nome}: {e}")]}
@@ -0,0 +1,156 @@
+"""
+Leitura rápida de CSV.
+
+O dialeto (separador e aspas) e os tipos das colunas textuais são deduzidos
+de uma amostra pequena do início do arquivo; a leitura completa vai então
+para o engine pyarrow (multithread) ou C do pandas, com dtypes explícitos.
+Arquivos acima de LIMIAR_BLOCOS (ex.: CDR de operadora com vários GB) são
+lidos por `iter_csv`, em blocos, e cada bloco é compactado (colunas de
+texto repetitivo viram categóricas) antes de ser juntado aos demais, de modo
+que o texto de todas as linhas nunca fica em memória de uma vez; o
+resultado ainda é um único DataFrame, pois filtros, hash e relatórios
+trabalham sobre o frame inteiro. Bytes fora do encoding detectado não
+interrompem nenhum dos caminhos (ver analise.codificacao). O caminho
+antigo (sep=None, engine="python") fica só como último recurso.
+"""
+import csv
+
+import pandas as pd
+from pandas.api.types import is_bool_dtype, is_numeric_dtype, is_object_dtype, is_string_dtype
+
+from analise import tipos
+from analise.codificacao import ERROS_DECODIFICACAO
+from analise.dependencias import disponivel
+from analise.esquema import concatenar
+
+# ====== (opcional) pyarrow como engine do read_csv ======
+# (só verifica a instalação: quem importa o pyarrow é o pandas, na primeira leitura/escrita)
+ARROW_OK = disponivel("pyarrow")
+
+# bytes usados para deduzir o dialeto
+TAMANHO_AMOSTRA = 64 * 1024
+# linhas usadas para deduzir os tipos
+LINHAS_AMOSTRA = 1000
+# linhas por bloco em iter_csv
+TAMANHO_BLOCO = 200_000
+# arquivos maiores que isto (bytes) são lidos em blocos por ler_csv_em_blocos
+LIMIAR_BLOCOS = 256 * 2**20
+# coluna de texto com até esta fração de valores distintos (no primeiro bloco) vira categórica
+FRACAO_CATEGORICA = 0.5
+DELIMITADORES = ",;\t|"
+
+def _amostra_texto(fonte, encoding: str) -> str:
+    try:
+        raw = fonte.read(TAMANHO_AMOSTRA)
+    finally:
+        fonte.seek(0)
+    texto = raw.decode(encoding, errors="replace")
+    # descarta a última linha, provavelmente cortada no meio
+    corte = max(texto.rfind("\n"), texto.rfind("\r"))
+    if corte > 0 and len(raw) == TAMANHO_AMOSTRA:
+        texto = texto[:corte]
+    return texto
+
+def detectar_dialeto(fonte, encoding: str) -> dict:
+    """Deduz separador e aspas a partir da amostra; levanta csv.Error se não conseguir."""
+    amostra = _amostra_texto(fonte, encoding)
+    try:
+        dialeto = csv.Sniffer().sniff(amostra, delimiters=DELIMITADORES)
+    except csv.Error:
+        if not any(d in amostra for d in DELIMITADORES):
+            return {"sep": ",", "quotechar": '"'}  # uma coluna só
+        raise
+    return {"sep": dialeto.delimiter, "quotechar": dialeto.quotechar or '"'}
+
+def _dtypes_explicitos(fonte, encoding: str, dialeto: dict) -> dict:
+    # colunas textuais na amostra são lidas como texto, sem inferência numérica linha a linha
+    try:
+        amostra = pd.read_csv(fonte, engine="c", encoding=encoding, encoding_errors=ERROS_DECODIFICACAO,
+                              nrows=LINHAS_AMOSTRA, **dialeto)
+    finally:
+        fonte.seek(0)
+    return {
+        col: amostra[col].dtype
+        for col in amostra.columns
+        if not is_numeric_dtype(amostra[col]) and not is_bool_dtype(amostra[col])
+    }
+
+def _preparar(fonte, encoding: str):
+    dialeto = detectar_dialeto(fonte, encoding)
+    return dialeto, _dtypes_explicitos(fonte, encoding, dialeto)
+
+def _colunas_binarias(df: pd.DataFrame) -> list:
+    # o pyarrow entrega como bytes (sem erro) a coluna não tipada em que há texto inválido no encoding
+    return [col for col in df.columns
+            if is_object_dtype(df[col]) and pd.api.types.infer_dtype(df[col].head(LINHAS_AMOSTRA)) == "bytes"]
+
+def ler_csv(fonte, encoding: str) -> pd.DataFrame:
+    """Lê o CSV inteiro pelo engine mais rápido disponível (pyarrow, depois C, depois python)."""
+    try:
+        dialeto, dtypes = _preparar(fonte, encoding)
+    except Exception:
+        fonte.seek(0)
+        return pd.read_csv(fonte, sep=None, engine="python", encoding=encoding,
+                           encoding_errors=ERROS_DECODIFICACAO)
+
+    engines = ["pyarrow", "c"] if ARROW_OK else ["c"]
+    for engine in engines:
+        # o pyarrow não aceita o tratador: decodifica estrito; o C lê os trechos inválidos como Windows-1252
+        erros = {} if engine == "pyarrow" else {"encoding_errors": ERROS_DECODIFICACAO}
+        try:
+            df = pd.read_csv(fonte, engine=engine, encoding=encoding, dtype=dtypes, **erros, **dialeto)
+        except Exception:
+            continue
+        finally:
+            fonte.seek(0)
+        if engine == "pyarrow" and _colunas_binarias(df):
+            continue
+        return df
+    return pd.read_csv(fonte, sep=None, engine="python", encoding=encoding,
+                       encoding_errors=ERROS_DECODIFICACAO)
+
+def iter_csv(fonte, encoding: str, tamanho_bloco: int = TAMANHO_BLOCO):
+    """Gera o CSV em DataFrames de até `tamanho_bloco` linhas (engine C)."""
+    try:
+        dialeto, dtypes = _preparar(fonte, encoding)
+    except Exception:
+        dialeto, dtypes = None, {}
+
+    if dialeto is None:
+        # sem dialeto confiável: o engine python deduz o separador
+        with pd.read_csv(fonte, sep=None, engine="python", encoding=encoding,
+                         encoding_errors=ERROS_DECODIFICACAO, chunksize=tamanho_bloco) as leitor:
+            yield from leitor
+        return
+
+    # bytes inválidos no encoding não interrompem a leitura (os blocos já lidos valem)
+    with pd.read_csv(fonte, engine="c", encoding=encoding, encoding_errors=ERROS_DECODIFICACAO, dtype=dtypes,
+                     chunksize=tamanho_bloco, **dialeto) as leitor:
+        yield from leitor
+
+def _colunas_categoricas(bloco: pd.DataFrame) -> list:
+    colunas = []
+    for col in bloco.columns:
+        serie = bloco[col]
+        if not (is_object_dtype(serie) or is_string_dtype(serie)):
+            continue
+        if serie.nunique() > FRACAO_CATEGORICA * len(serie):
+            continue
+        # datas ficam como texto: a detecção de datas (analise.tipos) trabalha sobre texto
+        if tipos.inferir_formato(serie.dropna().head(tipos.TAMANHO_AMOSTRA)) is not None:
+            continue
+        colunas.append(col)
+    return colunas
+
+def ler_csv_em_blocos(fonte, encoding: str, tamanho_bloco: int = TAMANHO_BLOCO) -> pd.DataFrame:
+    """
+    Lê o CSV por iter_csv e junta os blocos já compactados: as colunas de
+    texto repetitivo do primeiro bloco (IPs, ERBs, operadoras...) são
+    categóricas em todos os blocos.
+    """
+    categoricas, blocos = None, []
+    for bloco in iter_csv(fonte, encoding, tamanho_bloco):
+        if categoricas is None:
+            categoricas = _colunas_categoricas(bloco)
+        blocos.append(bloco.astype({c: "category" for c in categoricas if c in bloco.columns}))
+    return concatenar(blocos)
@@ -0,0 +1,147 @@
+"""
+Leitura de XLSX aba por aba, em blocos de linhas.
+
+pd.read_excel monta a aba inteira como uma lista de listas de objetos
+Python (uma por célula) antes de criar o DataFrame; em planilhas grandes
+essa lista ocupa muitas vezes o tamanho do resultado. Aqui as linhas vêm
+do openpyxl em modo read-only (ou do calamine, se instalado) e são
+convertidas em blocos pelo mesmo TextParser que o read_excel usa, com a
+mesma conversão de células: o resultado é o de read_excel(header=0), com
+memória limitada a um bloco de linhas.
+"""
+from datetime import date, datetime, time, timedelta
+
+import numpy as np
+import pandas as pd
+from pandas.io.parsers import TextParser
+
+from analise.dependencias import disponivel
+
+# ====== (opcional) calamine: leitor de planilhas em Rust (importado na primeira leitura) ======
+CALAMINE_OK = disponivel("python_calamine")
+
+LINHAS_POR_BLOCO = 50_000
+
+# ---------- fontes de linhas (conversão de células igual à do pandas) ----------
+def _celula_openpyxl(cell):
+    from openpyxl.cell.cell import TYPE_ERROR, TYPE_NUMERIC
+    if cell.value is None:
+        return ""
+    if cell.data_type == TYPE_ERROR:
+        return np.nan
+    if cell.data_type == TYPE_NUMERIC:
+        inteiro = int(cell.value)
+        return inteiro if inteiro == cell.value else float(cell.value)
+    return cell.value
+
+def _abas_openpyxl(fonte, todas: bool):
+    from openpyxl import load_workbook
+    livro = load_workbook(fonte, read_only=True, data_only=True, keep_links=False)
+    try:
+        for aba in livro.worksheets if todas else livro.worksheets[:1]:
+            # a dimensão gravada no arquivo pode estar errada: as linhas são lidas até o fim
+            aba.reset_dimensions()
+            yield aba.title, ([_celula_openpyxl(c) for c in linha] for linha in aba.rows)
+    finally:
+        livro.close()
+
+def _celula_calamine(valor):
+    if isinstance(valor, float):
+        inteiro = int(valor)
+        return inteiro if inteiro == valor else valor
+    if isinstance(valor, (datetime, date)) and not isinstance(valor, time):
+        return pd.Timestamp(valor)
+    if isinstance(valor, timedelta):
+        return pd.Timedelta(valor)
+    return valor
+
+def _abas_calamine(fonte, todas: bool):
+    from python_calamine import CalamineWorkbook
+    livro = CalamineWorkbook.from_filelike(fonte)
+    nomes = livro.sheet_names if todas else livro.sheet_names[:1]
+    for nome in nomes:
+        linhas = livro.get_sheet_by_name(nome).iter_rows()
+        yield nome, ([_celula_calamine(v) for v in linha] for linha in linhas)
+
+# ---------- linhas -> DataFrame ----------
+def _bloco_para_dataframe(bloco: list, colunas: list | None) -> pd.DataFrame:
+    largura = max(max(len(linha) for linha in bloco), len(colunas or ()))
+    for linha in bloco:
+        if len(linha) < largura:
+            linha.extend([""] * (largura - len(linha)))
+    if colunas is None:
+        with TextParser(bloco, header=0) as tp:
+            return tp.read()
+    if largura > len(colunas):
+        # linhas mais largas que o cabeçalho: as colunas extras ganham o nome que o read_excel daria
+        colunas.extend(f"Unnamed: {i}" for i in range(len(colunas), largura))
+    with TextParser(bloco, header=None, names=colunas) as tp:
+        return tp.read()
+
+def linhas_para_dataframe(linhas, linhas_por_bloco: int = LINHAS_POR_BLOCO) -> pd.DataFrame:
+    """DataFrame de um iterável de linhas (listas de células já convertidas), cabeçalho na primeira linha."""
+    partes, bloco, colunas = [], [], None
+    vazias = 0
+    for linha in linhas:
+        while linha and linha[-1] == "":
+            linha.pop()
+        if not linha:
+            # linhas vazias só contam se vier alguma linha com dados depois (as do fim são descartadas)
+            vazias += 1
+            continue
+        if vazias:
+            bloco.extend([] for _ in range(vazias))
+            vazias = 0
+        bloco.append(linha)
+        if len(bloco) >= linhas_por_bloco:
+            partes.append(_bloco_para_dataframe(bloco, colunas))
+            colunas = list(partes[0].columns) if colunas is None else colunas
+            bloco = []
+    if bloco:
+        partes.append(_bloco_para_dataframe(bloco, colunas))
+    if not partes:
+        return pd.DataFrame()
+    if len(partes) == 1:
+        return partes[0]
+    return _concatenar_blocos(partes, colunas)
+
+def _concatenar_blocos(partes: list, colunas: list) -> pd.DataFrame:
+    """
+    Junta os blocos com o tipo que a aba inteira teria: um bloco em que a
+    coluna está toda vazia (ou ainda não existia) não decide o tipo. Sem
+    isso, uma coluna de datas com um bloco vazio viraria object.
+    """
+    partes = [p.reindex(columns=colunas) for p in partes if len(p)] or partes[:1]
+    mistas = []
+    for col in colunas:
+        vazias = [p[col].isna().all() for p in partes]
+        tipos = {str(p[col].dtype): p[col].dtype for p, vazia in zip(partes, vazias) if not vazia}
+        if len(tipos) > 1:
+            if set(tipos) <= {"bool", "float64"}:
+                tipos = {"float64": np.dtype(np.float64)}  # bool com vazios vira float, como no read_excel
+            else:
+                mistas.append(col)
+                continue
+        if len(tipos) != 1 or not any(vazias):
+            continue
+        tipo = next(iter(tipos.values()))
+        if pd.api.types.is_bool_dtype(tipo) or pd.api.types.is_integer_dtype(tipo):
+            tipo = np.float64  # inteiros/bool com vazios viram float
+        for parte in partes:
+            parte[col] = parte[col].astype(tipo)
+    df = pd.concat(partes, ignore_index=True)
+    for col in mistas:
+        # coluna object de blocos com tipos diferentes: vazio é NaN (não NaT/None), como no read_excel
+        if df[col].dtype == object:
+            df[col] = df[col].where(df[col].notna(), np.nan)
+    return df
+
+def iter_planilhas(fonte, todas: bool = True, linhas_por_bloco: int = LINHAS_POR_BLOCO):
+    """
+    Gera (nome da aba, DataFrame) para cada aba do arquivo (ou só a primeira,
+    com todas=False), lendo uma aba de cada vez.
+    """
+    abas = _abas_calamine if CALAMINE_OK else _abas_openpyxl
+    fonte.seek(0)
+    for nome, linhas in abas(fonte, todas):
+        yield nome, linhas_para_dataframe(linhas, linhas_por_bloco)
@@ -0,0 +1,244 @@
+"""
+Processamento em lote, sem interface: leitura das evidências e relatórios.
+
+Cada caso é uma pasta com os arquivos de evidência (HTML/HTM/TXT, XLSX,
+CSV, Parquet, Feather/Arrow, inclusive em subpastas). Para cada caso são
+feitos a mesma leitura e o mesmo relatório do dashboard (sem filtros), e
+gravados em <saída>/<caso>/ os formatos pedidos, um resumo.json com hashes,
+contagens e avisos, e um lote.json na raiz da saída.
+
+Os casos são distribuídos num pool de processos (um caso por worker); ao
+final é informada a vazão em arquivos/min.
+
+Uso:
+    python -m analise casos/*/ --metadados metadados.json --saida relatorios/ [--processos 4]
+
+O JSON de metadados (rótulo -> valor, como no formulário do relatório)
+vale para todos os casos; um metadados.json dentro da pasta do caso
+sobrepõe as chaves dele.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from analise import graficos
+from analise.colunar import FORMATOS_COLUNARES
+from analise.esquema import concatenar
+from analise.hashing import ESQUEMA_ARVORE, TAMANHO_FOLHA, hash_arquivo, hash_arvore
+from analise.ingestao import ler_arquivo
+from analise.relatorio import (DOCX_OK, FUSO_RELATORIO, PDF_OK, escrever_html, escrever_txt, gerar_pdf_hash,
+                               montar_modelo, renderizar_docx, renderizar_pdf)
+from analise.tipos import detectar_colunas_datetime
+
+EXTENSOES = ("html", "htm", "txt", "xlsx", "csv") + FORMATOS_COLUNARES
+FORMATOS = ("html", "txt", "docx", "pdf", "hash")
+ARQUIVO_METADADOS = "metadados.json"
+TITULO_PDF = "Relatório Policial - Análise de IPs"
+# metadados impressos no PDF do hash (como no dashboard)
+METADADOS_HASH = ("Nº do Procedimento/BO", "Data/Hora de Geração", "Local/Timezone")
+
+def arquivos_do_caso(pasta: str) -> list[str]:
+    """Arquivos de evidência da pasta (e subpastas), em ordem de caminho."""
+    encontrados = []
+    for raiz, subpastas, nomes in os.walk(pasta):
+        subpastas.sort()
+        for nome in sorted(nomes):
+            if nome == ARQUIVO_METADADOS or nome.split('.')[-1].lower() not in EXTENSOES:
+                continue
+            encontrados.append(os.path.join(raiz, nome))
+    return encontrados
+
+def _metadados_do_caso(pasta: str, metadados: dict) -> dict:
+    caminho = os.path.join(pasta, ARQUIVO_METADADOS)
+    combinados = dict(metadados)
+    if os.path.isfile(caminho):
+        with open(caminho, encoding="utf-8") as fh:
+            combinados.update(json.load(fh))
+    combinados.setdefault("Local/Timezone", FUSO_RELATORIO)
+    combinados["Data/Hora de Geração"] = pd.Timestamp.now(tz=FUSO_RELATORIO).strftime("%d/%m/%Y %H:%M:%S %Z")
+    return combinados
+
+def processar_caso(pasta: str, destino: str, metadados: dict, formatos=FORMATOS, incluir_graficos: bool = True,
+                   arvore: bool = False, todas_tabelas: bool = False, processos_pdf: int | None = None) -> dict:
+    """
+    Lê as evidências de `pasta` e grava os relatórios em `destino`. Devolve o
+    resumo do caso (também gravado em destino/resumo.json).
+    """
+    inicio = time.perf_counter()
+    os.makedirs(destino, exist_ok=True)
+    metadados = _metadados_do_caso(pasta, metadados)
+    caminhos = arquivos_do_caso(pasta)
+    resumo = {"caso": os.path.basename(os.path.normpath(pasta)), "pasta": pasta, "arquivos": [],
+              "linhas": 0, "content_hash": None, "saidas": [], "avisos": []}
+
+    manifesto, dfs, origens, wa_doc = [], [], [], None
+    for caminho in caminhos:
+        nome = os.path.relpath(caminho, pasta)
+        digest = hash_arquivo(caminho)
+        entrada = {"arquivo": nome, "bytes": os.path.getsize(caminho), "sha512": digest}
+        if arvore:
+            entrada["arvore"] = hash_arvore(caminho)
+            entrada["esquema_arvore"] = f"{ESQUEMA_ARVORE}, folha de {TAMANHO_FOLHA} bytes"
+        manifesto.append(entrada)
+        with open(caminho, "rb") as fh:
+            resultado = ler_arquivo(nome, fh, digest, todas_tabelas)
+        resumo["avisos"].extend(f"{nome}: [{nivel}] {mensagem}" for nivel, mensagem in resultado["avisos"])
+        resumo["arquivos"].append({**entrada, "linhas": 0 if resultado["df"] is None else len(resultado["df"])})
+        if resultado["df"] is not None:
+            dfs.append(resultado["df"])
+            origens.append(nome)
+        if resultado["wa_doc"]:
+            wa_doc = resultado["wa_doc"]
+
+    if not dfs:
+        resumo["avisos"].append("[error] nenhum dado lido: relatório não gerado")
+        resumo["segundos"] = time.perf_counter() - inicio
+        _gravar_json(os.path.join(destino, "resumo.json"), resumo)
+        return resumo
+
+    df = detectar_colunas_datetime(concatenar(dfs, origens))
+    modelo = montar_modelo(df_base=df, df_filtrado=None, incluir_graficos=incluir_graficos,
+                           metadados=metadados, wa_doc=wa_doc, manifesto=manifesto)
+    resumo["linhas"] = len(df)
+    resumo["content_hash"] = modelo.content_hash
+
+    def _gravar(nome_arquivo, escrever):
+        with open(os.path.join(destino, nome_arquivo), "wb") as fh:
+            escrever(fh)
+        resumo["saidas"].append(nome_arquivo)
+
+    if "html" in formatos:
+        _gravar("relatorio_policial.html", lambda fh: escrever_html(modelo, fh))
+    if "txt" in formatos:
+        _gravar("relatorio_policial.txt", lambda fh: escrever_txt(modelo, fh))
+    if "docx" in formatos:
+        if DOCX_OK:
+            _gravar("relatorio_policial.docx", lambda fh: fh.write(renderizar_docx(modelo)))
+        else:
+            resumo["avisos"].append("[warning] DOCX não gerado: instale o pacote python-docx")
+    if "pdf" in formatos or "hash" in formatos:
+        if not PDF_OK:
+            resumo["avisos"].append("[warning] PDF não gerado: instale o pacote reportlab")
+        else:
+            if "pdf" in formatos:
+                _gravar("relatorio_policial.pdf",
+                        lambda fh: fh.write(renderizar_pdf(modelo, titulo=TITULO_PDF, processos=processos_pdf)))
+            if "hash" in formatos:
+                essenciais = {k: metadados.get(k, "") for k in METADADOS_HASH}
+                _gravar("assinatura_criptografica.pdf",
+                        lambda fh: fh.write(gerar_pdf_hash(hash_str=modelo.content_hash, metadados=essenciais)))
+
+    resumo["segundos"] = time.perf_counter() - inicio
+    _gravar_json(os.path.join(destino, "resumo.json"), resumo)
+    return resumo
+
+def _gravar_json(caminho: str, dados):
+    with open(caminho, "w", encoding="utf-8") as fh:
+        json.dump(dados, fh, ensure_ascii=False, indent=2)
+
+def _processar_seguro(pasta, destino, metadados, opcoes) -> dict:
+    # ponto de entrada dos workers: a falha de um caso não derruba o lote
+    try:
+        return processar_caso(pasta, destino, metadados, **opcoes)
+    except Exception as e:
+        return {"caso": os.path.basename(os.path.normpath(pasta)), "pasta": pasta, "arquivos": [],
+                "linhas": 0, "content_hash": None, "saidas": [], "erro": f"{type(e).__name__}: {e}"}
+
+def _iniciar_worker():
+    # os gráficos do caso são desenhados numa thread do próprio worker, sem outro pool de processos
+    graficos.iniciar_pool(1)
+
+def _destinos(pastas, saida: str) -> list[str]:
+    # pastas de mesmo nome (ex.: a/caso1 e b/caso1) ganham sufixo
+    usados, destinos = {}, []
+    for pasta in pastas:
+        nome = os.path.basename(os.path.normpath(pasta)) or "caso"
+        usados[nome] = usados.get(nome, 0) + 1
+        destinos.append(os.path.join(saida, nome if usados[nome] == 1 else f"{nome}_{usados[nome]}"))
+    return destinos
+
+def processar_lote(pastas, saida: str, metadados: dict, processos: int | None = None, **opcoes):
+    """
+    Processa os casos em paralelo e gera (índice, resumo) à medida que cada
+    um termina. `opcoes` são repassadas a processar_caso.
+    """
+    pastas = list(pastas)
+    destinos = _destinos(pastas, saida)
+    processos = processos or min(len(pastas), os.cpu_count() or 1)
+    if processos <= 1 or len(pastas) <= 1:
+        for i, (pasta, destino) in enumerate(zip(pastas, destinos)):
+            yield i, _processar_seguro(pasta, destino, metadados, opcoes)
+        return
+    # com vários casos ao mesmo tempo, cada PDF fica num processo só
+    opcoes.setdefault("processos_pdf", 1)
+    with ProcessPoolExecutor(max_workers=processos, initializer=_iniciar_worker) as pool:
+        futuros = {pool.submit(_processar_seguro, pasta, destino, metadados, opcoes): i
+                   for i, (pasta, destino) in enumerate(zip(pastas, destinos))}
+        for futuro in as_completed(futuros):
+            i = futuros[futuro]
+            try:
+                yield i, futuro.result()
+            except Exception as e:
+                # worker encerrado de forma anormal
+                yield i, {"caso": os.path.basename(os.path.normpath(pastas[i])), "pasta": pastas[i],
+                          "arquivos": [], "linhas": 0, "content_hash": None, "saidas": [],
+                          "erro": f"{type(e).__name__}: {e}"}
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m analise", description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("pastas", nargs="+", help="uma pasta por caso")
+    ap.add_argument("--metadados", help="JSON com os metadados do relatório (rótulo -> valor)")
+    ap.add_argument("--saida", required=True, help="pasta onde os relatórios são gravados")
+    ap.add_argument("--processos", type=int, default=None, help="casos em paralelo (padrão: número de CPUs)")
+    ap.add_argument("--formatos", default=",".join(FORMATOS),
+                    help=f"formatos separados por vírgula (padrão: {','.join(FORMATOS)})")
+    ap.add_argument("--sem-graficos", action="store_true", help="não inclui os gráficos no relatório")
+    ap.add_argument("--arvore", action="store_true", help="inclui o hash em árvore no manifesto")
+    ap.add_argument("--todas-tabelas", action="store_true", help="lê todas as abas (XLSX) e tabelas (HTML)")
+    args = ap.parse_args(argv)
+
+    formatos = tuple(f.strip().lower() for f in args.formatos.split(",") if f.strip())
+    invalidos = set(formatos) - set(FORMATOS)
+    if invalidos:
+        ap.error(f"formatos desconhecidos: {', '.join(sorted(invalidos))}")
+    pastas = [p for p in args.pastas if os.path.isdir(p)]
+    for p in set(args.pastas) - set(pastas):
+        print(f"ignorado (não é pasta): {p}", file=sys.stderr)
+    if not pastas:
+        ap.error("nenhuma pasta de caso")
+    metadados = {}
+    if args.metadados:
+        with open(args.metadados, encoding="utf-8") as fh:
+            metadados = json.load(fh)
+    os.makedirs(args.saida, exist_ok=True)
+
+    inicio = time.perf_counter()
+    resumos = [None] * len(pastas)
+    for concluidos, (i, resumo) in enumerate(
+            processar_lote(pastas, args.saida, metadados, args.processos, formatos=formatos,
+                           incluir_graficos=not args.sem_graficos, arvore=args.arvore,
+                           todas_tabelas=args.todas_tabelas), start=1):
+        resumos[i] = resumo
+        if "erro" in resumo:
+            situacao = f"ERRO {resumo['erro']}"
+        else:
+            situacao = f"{len(resumo['arquivos'])} arquivos, {resumo['linhas']} linhas, {resumo['segundos']:.1f} s"
+        print(f"[{concluidos}/{len(pastas)}] {resumo['caso']}: {situacao}", flush=True)
+    decorrido = time.perf_counter() - inicio
+
+    arquivos = sum(len(r["arquivos"]) for r in resumos)
+    falhas = sum(1 for r in resumos if "erro" in r or r["content_hash"] is None)
+    vazao = {"casos": len(resumos), "arquivos": arquivos, "falhas": falhas, "segundos": decorrido,
+             "arquivos_por_min": arquivos / decorrido * 60 if decorrido else 0.0,
+             "casos_por_min": len(resumos) / decorrido * 60 if decorrido else 0.0}
+    _gravar_json(os.path.join(args.saida, "lote.json"), {"vazao": vazao, "casos": resumos})
+    print(f"{len(resumos)} casos, {arquivos} arquivos em {decorrido:.1f} s: "
+          f"{vazao['arquivos_por_min']:.1f} arquivos/min ({vazao['casos_por_min']:.1f} casos/min); "
+          f"{falhas} sem relatório")
+    return 1 if falhas else 0
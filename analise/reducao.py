@@ -0,0 +1,153 @@
+"""
+Redução dos dados dos gráficos interativos (Plotly) no servidor.
+
+O Plotly serializa cada ponto em JSON para o navegador; com milhões de
+linhas o payload trava a aba. Aqui os dados são reduzidos antes do gráfico,
+com tamanho limitado por um orçamento de pontos:
+
+- histograma: contagens por faixa calculadas com numpy (as barras já vêm
+  prontas, em vez de uma linha por registro);
+- linhas: LTTB (Largest-Triangle-Three-Buckets), que preserva a forma da
+  série, ou mín./máx. por faixa, que preserva os picos;
+- barras/pizza: as N maiores categorias e o restante somado em "Outros".
+"""
+import numpy as np
+import pandas as pd
+
+ORCAMENTO_PONTOS = 5_000
+MAX_CATEGORIAS = 20
+ROTULO_OUTROS = "Outros"
+
+def _valores_float(serie: pd.Series) -> np.ndarray:
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        ns = pd.DatetimeIndex(serie).as_unit("ns").asi8.astype(np.float64)
+        ns[serie.isna().to_numpy()] = np.nan
+        return ns
+    return serie.to_numpy(dtype=np.float64, na_value=np.nan)
+
+def histograma(serie: pd.Series, nbins: int | None = None, orcamento: int = ORCAMENTO_PONTOS) -> pd.DataFrame:
+    """
+    Contagens por faixa de largura igual (colunas inicio, fim, centro,
+    contagem, largura). Sem `nbins`, usa o estimador "auto" do numpy, com no
+    máximo `orcamento` faixas. Datas voltam como datas (largura em ms, como
+    o Plotly espera em eixos de data).
+    """
+    valores = _valores_float(serie)
+    valores = valores[~np.isnan(valores)]
+    if not len(valores):
+        # tipado: o Plotly recusa a largura das barras num array object vazio
+        vazio = np.empty(0, dtype=np.float64)
+        return pd.DataFrame({"inicio": vazio, "fim": vazio, "centro": vazio,
+                             "contagem": np.empty(0, dtype=np.int64), "largura": vazio})
+    if nbins is None:
+        bordas = np.histogram_bin_edges(valores, bins="auto")
+        if len(bordas) - 1 > orcamento:
+            bordas = np.histogram_bin_edges(valores, bins=orcamento)
+    else:
+        bordas = np.histogram_bin_edges(valores, bins=min(nbins, orcamento))
+    contagem, bordas = np.histogram(valores, bins=bordas)
+    inicio, fim = bordas[:-1], bordas[1:]
+    largura = fim - inicio
+    centro = inicio + largura / 2
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        tz = getattr(serie.dt, "tz", None)
+
+        def _datas(ns):
+            datas = pd.to_datetime(ns.astype(np.int64))
+            return datas.tz_localize("UTC").tz_convert(tz) if tz is not None else datas
+
+        inicio, fim, centro = _datas(inicio), _datas(fim), _datas(centro)
+        largura = largura / 1e6
+    return pd.DataFrame({"inicio": inicio, "fim": fim, "centro": centro, "contagem": contagem, "largura": largura})
+
+def lttb(x: np.ndarray, y: np.ndarray, n: int) -> np.ndarray:
+    """
+    Índices dos `n` pontos escolhidos pelo LTTB (x crescente, sem NaN). O
+    primeiro e o último ponto são sempre mantidos; de cada faixa intermediária
+    fica o ponto que forma o maior triângulo com o ponto escolhido na faixa
+    anterior e a média da faixa seguinte.
+    """
+    m = len(x)
+    if n >= m:
+        return np.arange(m)
+    if n < 3:
+        return np.array([0, m - 1][:max(n, 1)])
+    bordas = np.linspace(1, m - 1, n - 1).astype(np.int64)
+    # somas acumuladas: média de qualquer faixa em O(1)
+    soma_x = np.concatenate([[0.0], np.cumsum(x)])
+    soma_y = np.concatenate([[0.0], np.cumsum(y)])
+    escolhidos = np.empty(n, dtype=np.int64)
+    escolhidos[0], escolhidos[-1] = 0, m - 1
+    a = 0
+    for i in range(n - 2):
+        inicio, fim = bordas[i], bordas[i + 1]
+        if i + 2 < n - 1:
+            prox_inicio, prox_fim = bordas[i + 1], bordas[i + 2]
+            k = max(prox_fim - prox_inicio, 1)
+            media_x = (soma_x[prox_fim] - soma_x[prox_inicio]) / k
+            media_y = (soma_y[prox_fim] - soma_y[prox_inicio]) / k
+        else:
+            media_x, media_y = x[m - 1], y[m - 1]
+        if fim <= inicio:
+            escolhidos[i + 1] = a = inicio
+            continue
+        area = np.abs((x[a] - media_x) * (y[inicio:fim] - y[a]) - (x[a] - x[inicio:fim]) * (media_y - y[a]))
+        a = inicio + int(np.argmax(area))
+        escolhidos[i + 1] = a
+    return np.unique(escolhidos)
+
+def minmax(y: np.ndarray, n: int) -> np.ndarray:
+    """Índices do mínimo e do máximo de cada faixa, mais o primeiro e o último ponto: no máximo n pontos."""
+    m = len(y)
+    if n >= m:
+        return np.arange(m)
+    faixas = max((n - 2) // 2, 1)
+    tamanho = -(-m // faixas)
+    completo = np.full(faixas * tamanho, np.nan)
+    completo[:m] = y
+    blocos = completo.reshape(faixas, tamanho)
+    validos = ~np.all(np.isnan(blocos), axis=1)
+    deslocamento = np.arange(faixas)[validos] * tamanho
+    blocos = blocos[validos]
+    indices = np.concatenate([[0, m - 1],
+                              deslocamento + np.nanargmin(blocos, axis=1),
+                              deslocamento + np.nanargmax(blocos, axis=1)])
+    return np.unique(indices)
+
+def reduzir_linhas(df: pd.DataFrame, orcamento: int = ORCAMENTO_PONTOS, metodo: str = "lttb") -> pd.DataFrame:
+    """
+    Equivalente reduzido de px.line(df) (uma série por coluna, x = índice),
+    em formato longo: colunas "index", "variable" e "value". O orçamento é
+    dividido entre as colunas; valores nulos são descartados.
+    """
+    indice = df.index
+    if (pd.api.types.is_numeric_dtype(indice) or pd.api.types.is_datetime64_any_dtype(indice)) \
+            and indice.is_monotonic_increasing:
+        x_todos = _valores_float(indice.to_series())
+    else:
+        x_todos = np.arange(len(df), dtype=np.float64)
+    por_coluna = max(orcamento // max(df.shape[1], 1), 3)
+    partes = []
+    for col in df.columns:
+        y = _valores_float(df[col])
+        posicoes = np.flatnonzero(~np.isnan(y))
+        if metodo == "minmax":
+            escolhidos = posicoes[minmax(y[posicoes], por_coluna)]
+        else:
+            escolhidos = posicoes[lttb(x_todos[posicoes], y[posicoes], por_coluna)]
+        partes.append(pd.DataFrame({"index": indice.take(escolhidos), "variable": col,
+                                    "value": df[col].to_numpy()[escolhidos]}))
+    if not partes:
+        return pd.DataFrame(columns=["index", "variable", "value"])
+    return pd.concat(partes, ignore_index=True)
+
+def top_n_com_outros(contagem: pd.Series, n: int = MAX_CATEGORIAS, rotulo: str = ROTULO_OUTROS) -> pd.Series:
+    """As `n` maiores contagens e, se sobrar algo, uma categoria `rotulo` com a soma do restante."""
+    contagem = contagem.sort_values(ascending=False, kind="stable")
+    if len(contagem) <= n:
+        return contagem
+    topo = contagem.iloc[:n]
+    resto = contagem.iloc[n:].sum()
+    return pd.Series(np.append(topo.to_numpy(), resto),
+                     index=pd.Index(list(topo.index) + [rotulo], dtype=object, name=contagem.index.name),
+                     name=contagem.name)
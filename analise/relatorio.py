@@ -0,0 +1,508 @@
+"""
+Relatório policial: modelo único + renderizadores.
+
+montar_modelo faz, uma única vez, todo o trabalho pesado sobre os dados
+(detecção das colunas de tempo/IP, conversão do tempo para o fuso local,
+contagem de IPs, achados, gráficos, tabela completa, hash dos registros e
+hash de conteúdo) e
+devolve um ModeloRelatorio imutável. Os renderizadores HTML, TXT, DOCX e
+PDF só leem o modelo; os de DOCX e PDF ficam em analise.relatorio_docx e
+analise.relatorio_pdf, importados (com python-docx/reportlab) só na
+primeira renderização.
+
+Contagens por dia/IP, distintos e período vêm de um EstadoAgregado
+(analise.agregados). O dashboard guarda o estado por versão dos dados
+(atualizar_agregados) e o passa a montar_modelo, que então responde os
+recortes por IP/intervalo de tempo sem recontar as linhas.
+"""
+import base64
+import json
+import textwrap
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from io import BytesIO
+from types import MappingProxyType
+from xml.sax.saxutils import escape
+
+import numpy as np
+import pandas as pd
+
+from analise import graficos
+from analise.agregados import EstadoAgregado, agregar, combinar
+from analise.dependencias import disponivel
+from analise.esquema import COLUNA_PORTA, ips_com_porta
+from analise.fuso import FUSO_PADRAO, para_fuso
+from analise.hashing import gerar_hash, hash_dataframe
+from analise.visualizacao import formatar_data_hora
+
+# ====== (opcionais) DOCX, PDF e pypdf (junta as partes do PDF renderizadas em paralelo) ======
+# só verifica se estão instalados: os renderizadores ficam em relatorio_docx/relatorio_pdf,
+# importados na primeira renderização
+DOCX_OK = disponivel("docx")
+PDF_OK = disponivel("reportlab")
+PYPDF_OK = disponivel("pypdf")
+
+FUSO_RELATORIO = FUSO_PADRAO
+COLUNAS_TABELA = ["Time (America/Sao_Paulo)", "IP Address"]
+# linhas da tabela completa por bloco nos escritores TXT/HTML
+LINHAS_POR_BLOCO = 20_000
+# páginas de tabela a partir das quais o PDF é renderizado em vários processos
+PAGINAS_PARALELO = 400
+
+@dataclass(frozen=True)
+class ModeloRelatorio:
+    metadados: MappingProxyType
+    wa_doc: MappingProxyType | None
+    col_tempo: str | None
+    col_ip: str | None
+    periodo_txt: str
+    achados: tuple
+    incluir_graficos: bool
+    png_timeline: bytes | None
+    png_top_ips: bytes | None
+    # Time/IP já ordenada e formatada; os renderizadores não devem alterá-la
+    tabela: pd.DataFrame
+    content_hash: str
+    # hash dos registros analisados e, por arquivo de origem, nome/tamanho/SHA-512
+    # (e o hash em árvore, quando pedido)
+    hash_registros: str = ""
+    manifesto: tuple = ()
+
+# ====== Relatório: detecção de colunas e tabelas ======
+def _guess_colunas(df):
+    col_tempo = None
+    for c in df.columns:
+        if str(c).strip().lower() == "time":
+            col_tempo = c; break
+    if col_tempo is None:
+        for c in df.columns:
+            if pd.api.types.is_datetime64_any_dtype(df[c]):
+                col_tempo = c; break
+    if col_tempo is None:
+        candidatos_tempo = [c for c in df.columns if str(c).strip().lower() in
+                            ("timestamp","data","datetime","date","hora","data/hora")]
+        for cand in candidatos_tempo:
+            try:
+                test = pd.to_datetime(df[cand], errors="coerce", utc=True)
+                if test.notna().any():
+                    col_tempo = cand; break
+            except Exception:
+                pass
+
+    col_ip = None
+    for c in df.columns:
+        if str(c).strip().lower() == "ip address":
+            col_ip = c; break
+    if col_ip is None:
+        candidatos_ip = [c for c in df.columns if "ip" in str(c).lower()]
+        if candidatos_ip:
+            col_ip = candidatos_ip[0]
+
+    return col_tempo, col_ip
+
+def _tempos_locais(serie: pd.Series) -> pd.Series:
+    # horários sem fuso são tratados como UTC; tudo sai em America/Sao_Paulo
+    if isinstance(serie.dtype, pd.DatetimeTZDtype):
+        # já é datetime com fuso: to_datetime só percorreria a coluna à toa
+        return para_fuso(serie, FUSO_RELATORIO)
+    try:
+        return pd.to_datetime(serie, errors="coerce", utc=True).dt.tz_convert(FUSO_RELATORIO)
+    except Exception:
+        tempos = pd.to_datetime(serie, errors="coerce")
+        if getattr(tempos.dt, "tz", None) is None:
+            tempos = tempos.dt.tz_localize(FUSO_RELATORIO)
+        return tempos
+
+@lru_cache(maxsize=8)
+def _png_data_uri(png_bytes):
+    b64 = base64.b64encode(png_bytes).decode("ascii")
+    return f"data:image/png;base64,{b64}"
+
+def _tabela_ip_time(tempos: pd.Series, ips: pd.Series, portas: pd.Series | None = None) -> pd.DataFrame:
+    if portas is not None:
+        # a porta separada na leitura volta para junto do IP (atribuição atrás de CGNAT)
+        ips = ips_com_porta(ips, portas)
+    base = pd.DataFrame({"__time": tempos, "IP Address": ips})
+    base = base.dropna(subset=["__time", "IP Address"]).sort_values("__time", ascending=False)
+    base["Time (America/Sao_Paulo)"] = formatar_data_hora(base["__time"])
+    return base[COLUNAS_TABELA].reset_index(drop=True)
+
+def montar_tabela_ip_time_completa(df: pd.DataFrame) -> pd.DataFrame:
+    if df is None or df.empty:
+        return pd.DataFrame(columns=COLUNAS_TABELA)
+    col_tempo, col_ip = _guess_colunas(df)
+    if not col_tempo or not col_ip or col_tempo not in df.columns or col_ip not in df.columns:
+        return pd.DataFrame(columns=COLUNAS_TABELA)
+    return _tabela_ip_time(_tempos_locais(df[col_tempo]), df[col_ip], df.get(COLUNA_PORTA))
+
+# ---------- bloco comum para texto/achados ----------
+def _resumo_achados(df, periodo, contagem_ips):
+    periodo_txt = "Não identificado"
+    if periodo is not None:
+        tmin, tmax = periodo
+        if pd.notna(tmin) and pd.notna(tmax):
+            periodo_txt = f"{tmin.strftime('%d/%m/%Y %H:%M:%S')} a {tmax.strftime('%d/%m/%Y %H:%M:%S')}"
+
+    achados = [
+        f"Total de registros analisados: {len(df)}.",
+        f"Total de colunas: {df.shape[1]} ({', '.join(map(str, df.columns))}).",
+        f"Período coberto (se aplicável): {periodo_txt}."
+    ]
+    if contagem_ips is not None:
+        achados.append(f"Endereços IP distintos identificados: {len(contagem_ips)}.")
+        top_ips = contagem_ips.head(5)
+        if not top_ips.empty:
+            resumo_top = "; ".join([f"{idx} ({val})" for idx, val in top_ips.items()])
+            achados.append(f"Principais IPs por frequência: {resumo_top}.")
+    else:
+        achados.append("Não foi identificada coluna de IP.")
+    return periodo_txt, achados
+
+def _payload_para_hash_conteudo(metadados: dict, wa_doc: dict | None, df: pd.DataFrame, periodo_txt: str,
+                                hash_registros: str = "", manifesto=()) -> bytes:
+    payload = {
+        "metadados": metadados,
+        "wa_doc": wa_doc or {},
+        "hash_registros": hash_registros,
+        "manifesto": [dict(e) for e in manifesto],
+        "periodo": periodo_txt,
+        "colunas": list(map(str, df.columns)),
+        "registros": int(len(df)),
+        "gerado_em": datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "versao_layout": 3,
+    }
+    return json.dumps(payload, ensure_ascii=False, sort_keys=True).encode("utf-8")
+
+def _colunas_e_tempos(df: pd.DataFrame):
+    col_tempo, col_ip = _guess_colunas(df)
+    tempos = None
+    if col_tempo and col_tempo in df.columns:
+        try:
+            tempos = _tempos_locais(df[col_tempo])
+        except Exception:
+            col_tempo = None
+    if col_ip not in df.columns:
+        col_ip = None
+    return col_tempo, col_ip, tempos
+
+def _origem(df: pd.DataFrame, col_tempo, col_ip) -> tuple:
+    return (col_tempo, col_ip, str(df[col_tempo].dtype) if col_tempo else None)
+
+def atualizar_agregados(df: pd.DataFrame, anterior: EstadoAgregado | None = None) -> EstadoAgregado | None:
+    """
+    Estado agregado de df. Se `anterior` foi calculado sobre as primeiras
+    linhas deste mesmo df (arquivos acrescentados ao fim), só as linhas novas
+    são lidas; se as colunas de tempo/IP mudaram, o estado é refeito.
+    """
+    col_tempo, col_ip = _guess_colunas(df)
+    if col_ip not in df.columns:
+        col_ip = None
+    if anterior is not None and anterior.origem == _origem(df, col_tempo, col_ip) and anterior.linhas <= len(df):
+        if anterior.linhas == len(df):
+            return anterior
+        col_tempo, col_ip, tempos = _colunas_e_tempos(df.iloc[anterior.linhas:])
+        if _origem(df, col_tempo, col_ip) == anterior.origem:
+            return combinar([anterior, agregar(tempos, df[col_ip].iloc[anterior.linhas:] if col_ip else None,
+                                               anterior.origem)])
+    col_tempo, col_ip, tempos = _colunas_e_tempos(df)
+    if tempos is None and col_ip is None:
+        return None
+    return agregar(tempos, df[col_ip] if col_ip else None, _origem(df, col_tempo, col_ip))
+
+def _intervalo_ns(valor) -> int:
+    # como em _tempos_locais, horários sem fuso valem como UTC
+    valor = pd.Timestamp(valor)
+    return (valor.tz_localize("UTC") if valor.tz is None else valor).value
+
+def _recorte_agregado(agregados: EstadoAgregado, df_base, filtros, col_tempo, col_ip):
+    """(estado, dias_parciais) para os filtros de IP/intervalo de tempo, ou None se algum filtro não couber no estado."""
+    ips, intervalo = None, None
+    for col, tipo, arg in filtros:
+        if col == col_ip and tipo == "valores" and agregados.ips_canonicos:
+            ips = set(arg) if ips is None else ips & set(arg)
+        elif col == col_tempo and tipo == "intervalo" and pd.api.types.is_datetime64_any_dtype(df_base[col]):
+            inicio, fim = map(_intervalo_ns, arg)
+            if intervalo is not None:
+                inicio, fim = max(inicio, intervalo[0]), min(fim, intervalo[1])
+            intervalo = (inicio, fim)
+        else:
+            return None
+    return agregados.filtrar(ips, intervalo)
+
+def _estado_do_recorte(df_base, df, col_tempo, col_ip, tempos, agregados, filtros):
+    if tempos is None and col_ip is None:
+        return None
+    ips = df[col_ip] if col_ip else None
+    if agregados is not None and agregados.linhas == len(df_base) \
+            and agregados.origem == _origem(df_base, col_tempo, col_ip):
+        if df is df_base:
+            return agregados
+        recorte = _recorte_agregado(agregados, df_base, filtros, col_tempo, col_ip)
+        if recorte is not None:
+            estado, dias_parciais = recorte
+            if len(dias_parciais) and tempos is not None:
+                # só as linhas (já filtradas) dos dias cortados pelo intervalo são recontadas
+                t = pd.DatetimeIndex(tempos).as_unit("ns").asi8
+                mascara = np.zeros(len(t), dtype=bool)
+                for dia in dias_parciais:
+                    mascara |= (t >= dia) & (t < agregados.fim_do_dia(dia))
+                estado = combinar([estado, agregar(tempos[mascara], ips[mascara] if ips is not None else None,
+                                                   agregados.origem)], grupos_disjuntos=True)
+            if estado.linhas == len(df):
+                return estado
+    return agregar(tempos, ips, _origem(df, col_tempo, col_ip))
+
+def montar_modelo(df_base: pd.DataFrame,
+                  df_filtrado: pd.DataFrame | None,
+                  incluir_graficos: bool,
+                  metadados: dict,
+                  wa_doc: dict | None = None,
+                  manifesto=None,
+                  agregados: EstadoAgregado | None = None,
+                  filtros=()) -> ModeloRelatorio:
+    """
+    Única passagem sobre os dados; todos os formatos de saída partem do modelo devolvido.
+    `manifesto`: uma entrada por arquivo de origem, com as chaves arquivo, bytes,
+    sha512 e, opcionalmente, arvore/esquema_arvore.
+    `agregados`: estado de atualizar_agregados(df_base); com os `filtros` que
+    produziram df_filtrado (mesmo formato de MotorFiltros.aplicar), as
+    contagens do recorte saem do estado em vez de uma nova varredura.
+    """
+    df = df_filtrado if df_filtrado is not None and not df_filtrado.empty else df_base
+    col_tempo, col_ip, tempos = _colunas_e_tempos(df)
+    estado = _estado_do_recorte(df_base, df, col_tempo, col_ip, tempos, agregados, filtros)
+    contagem_ips = estado.por_ip() if col_ip else None
+
+    periodo_txt, achados = _resumo_achados(df, estado.periodo() if tempos is not None else None, contagem_ips)
+    # os gráficos saem só dos agregados: do cache, ou desenhados no pool enquanto o resto do modelo é montado
+    pedidos_graficos = [
+        graficos.pedido_timeline(estado.por_dia()) if incluir_graficos and tempos is not None else None,
+        graficos.pedido_top_ips(contagem_ips) if incluir_graficos and contagem_ips is not None else None,
+    ]
+    futuros_graficos = graficos.solicitar(pedidos_graficos)
+    manifesto = tuple(MappingProxyType(dict(e)) for e in (manifesto or ()))
+    hash_registros = hash_dataframe(df)
+    # hash de conteúdo (SHA-512) — mostrado apenas no FINAL
+    content_hash = gerar_hash(_payload_para_hash_conteudo(metadados, wa_doc, df, periodo_txt,
+                                                          hash_registros, manifesto), "sha512")
+
+    if tempos is not None and col_ip and not df.empty:
+        tabela = _tabela_ip_time(tempos, df[col_ip], df.get(COLUNA_PORTA))
+    else:
+        tabela = pd.DataFrame(columns=COLUNAS_TABELA)
+    png_timeline, png_top_ips = graficos.coletar(futuros_graficos, pedidos_graficos)
+
+    return ModeloRelatorio(
+        metadados=MappingProxyType(dict(metadados)),
+        wa_doc=MappingProxyType(dict(wa_doc)) if wa_doc else None,
+        col_tempo=col_tempo, col_ip=col_ip,
+        periodo_txt=periodo_txt, achados=tuple(achados),
+        incluir_graficos=incluir_graficos,
+        png_timeline=png_timeline, png_top_ips=png_top_ips,
+        tabela=tabela, content_hash=content_hash,
+        hash_registros=hash_registros, manifesto=manifesto,
+    )
+
+# =============================
+# Renderizadores
+# =============================
+
+def _linhas_manifesto(modelo: ModeloRelatorio):
+    """(rótulo, hash) do manifesto de evidências, na ordem em que todos os formatos o exibem."""
+    for e in modelo.manifesto:
+        yield f"{e['arquivo']} ({e['bytes']} bytes) — SHA-512", e["sha512"]
+        if e.get("arvore"):
+            yield f"{e['arquivo']} — árvore ({e['esquema_arvore']})", e["arvore"]
+    yield "Registros analisados (após filtros) — SHA-512", modelo.hash_registros
+
+class _Partes(list):
+    # acumula as partes curtas (cabeçalhos, achados) até o próximo bloco da tabela
+    def esvaziar(self):
+        partes = list(self)
+        self.clear()
+        return partes
+
+def _escapar_html(serie: pd.Series) -> pd.Series:
+    # mesmos escapes do DataFrame.to_html
+    return (serie.str.replace("&", "&amp;", regex=False)
+                 .str.replace("<", "&lt;", regex=False)
+                 .str.replace(">", "&gt;", regex=False))
+
+def _blocos_tabela(tabela: pd.DataFrame, linhas_por_bloco: int):
+    for inicio in range(0, len(tabela), linhas_por_bloco):
+        bloco = tabela.iloc[inicio:inicio + linhas_por_bloco]
+        yield bloco[COLUNAS_TABELA[0]].astype(str), bloco[COLUNAS_TABELA[1]].astype(str)
+
+def _tabela_html(tabela: pd.DataFrame, linhas_por_bloco: int):
+    """Mesma marcação de tabela.to_html(index=False), emitida em blocos de linhas."""
+    yield ('<table border="1" class="dataframe">\n  <thead>\n    <tr style="text-align: right;">\n'
+           + "\n".join(f"      <th>{c}</th>" for c in COLUNAS_TABELA) + "\n    </tr>\n  </thead>\n  <tbody>")
+    for tempos, ips in _blocos_tabela(tabela, linhas_por_bloco):
+        linhas = ("    <tr>\n      <td>" + _escapar_html(tempos) + "</td>\n      <td>"
+                  + _escapar_html(ips) + "</td>\n    </tr>")
+        yield "\n".join(linhas.tolist())
+    yield "  </tbody>\n</table>"
+
+def _escrever_partes(partes, destino):
+    # as partes são unidas por "\n", como no "\n".join de antes, mas vão direto para o destino
+    separador = ""
+    for parte in partes:
+        destino.write((separador + parte).encode("utf-8"))
+        separador = "\n"
+
+def _partes_html(modelo: ModeloRelatorio, linhas_por_bloco: int):
+    tabela_completa = modelo.tabela
+    html_parts = _Partes()
+    html_parts.append("<meta charset='utf-8'>")
+    html_parts.append("<style>body{font-family:Arial,Helvetica,sans-serif;margin:24px} h1,h2{margin:0.2em 0} table{border-collapse:collapse;width:100%} th,td{border:1px solid #ddd;padding:6px;font-size:13px} .muted{color:#555} .blk{margin:18px 0}</style>")
+    html_parts.append("<h1>Relatório Policial - Análise de IPs (Análise de Dados)</h1>")
+
+    html_parts.append("<div class='blk'><h2>Metadados</h2><table>")
+    for k,v in modelo.metadados.items():
+        html_parts.append(f"<tr><th style='width:260px;text-align:left'>{k}</th><td>{v}</td></tr>")
+    html_parts.append("</table></div>")
+
+    if modelo.wa_doc:
+        html_parts.append("<div class='blk'><h2>Dados do Documento WhatsApp Business Record</h2><table>")
+        for k, v in modelo.wa_doc.items():
+            html_parts.append(f"<tr><th style='width:260px;text-align:left'>{k}</th><td>{v}</td></tr>")
+        html_parts.append("</table></div>")
+
+    html_parts.append("<div class='blk'><h2>Manifesto de Evidências</h2><table>")
+    for rotulo, valor in _linhas_manifesto(modelo):
+        html_parts.append(f"<tr><th style='width:260px;text-align:left'>{escape(rotulo)}</th>"
+                          f"<td><code style='word-break:break-all'>{valor}</code></td></tr>")
+    html_parts.append("</table></div>")
+
+    html_parts.append("<div class='blk'><h2>Síntese dos Achados</h2><ul>")
+    for a in modelo.achados:
+        html_parts.append(f"<li>{a}</li>")
+    html_parts.append("</ul></div>")
+
+    html_parts.append("<div class='blk'><h2>Metodologia</h2>")
+    html_parts.append("<p class='muted'>Os dados foram importados, higienizados e analisados com apoio de ferramentas computacionais. Procedeu-se à consolidação de múltiplas fontes, conversão de datas para o fuso America/Sao_Paulo e análise descritiva (contagens, modos e médias).</p></div>")
+
+    if modelo.incluir_graficos and (modelo.png_timeline or modelo.png_top_ips):
+        html_parts.append("<div class='blk'><h2>Gráficos</h2>")
+        if modelo.png_timeline:
+            html_parts.append("<h3>Linha do tempo de eventos por dia</h3>")
+            html_parts.append(f"<img src='{_png_data_uri(modelo.png_timeline)}' style='max-width:100%;height:auto'/>")
+        if modelo.png_top_ips:
+            html_parts.append("<h3>Top IPs por frequência</h3>")
+            html_parts.append(f"<img src='{_png_data_uri(modelo.png_top_ips)}' style='max-width:100%;height:auto'/>")
+        html_parts.append("</div>")
+
+    html_parts.append("<div class='blk'><h2>Tabela Completa: IP Address × Time (mais recentes primeiro)</h2>")
+    if tabela_completa.empty:
+        html_parts.append("<p class='muted'>Não há dados suficientes para compor a tabela completa (verifique colunas de IP e horário).</p>")
+    else:
+        yield from html_parts.esvaziar()
+        yield from _tabela_html(tabela_completa, linhas_por_bloco)
+    html_parts.append("</div>")
+
+    # *** HASH APENAS NO FINAL (sem o texto "(SHA-512)") ***
+    html_parts.append("<div class='blk'><h2>Assinatura Criptográfica</h2>")
+    html_parts.append(f"<p><code>{modelo.content_hash}</code></p></div>")
+    yield from html_parts.esvaziar()
+
+def _partes_txt(modelo: ModeloRelatorio, linhas_por_bloco: int):
+    tabela_completa = modelo.tabela
+    linhas = _Partes()
+    linhas.append("RELATÓRIO POLICIAL (ANÁLISE DE DADOS)")
+    linhas.append("=" * 60)
+    for k,v in modelo.metadados.items():
+        linhas.append(f"{k}: {v}")
+
+    if modelo.wa_doc:
+        linhas.append("")
+        linhas.append("DADOS DO DOCUMENTO WHATSApp BUSINESS RECORD")
+        for k, v in modelo.wa_doc.items():
+            linhas.append(f"- {k}: {v}")
+
+    linhas.append("")
+    linhas.append("MANIFESTO DE EVIDÊNCIAS")
+    for rotulo, valor in _linhas_manifesto(modelo):
+        linhas.append(f"- {rotulo}:")
+        linhas.append(f"  {valor}")
+
+    linhas.append("")
+    linhas.append("1. SÍNTESE DOS ACHADOS")
+    for linha in modelo.achados:
+        linhas.append(f"- {linha}")
+
+    linhas.append("")
+    linhas.append("2. METODOLOGIA")
+    linhas.append(textwrap.fill(
+        "Os dados foram importados, higienizados e analisados com apoio de ferramentas "
+        "computacionais. Procedeu-se à consolidação de múltiplas fontes, conversão de datas "
+        "para o fuso America/Sao_Paulo e análise descritiva (contagens, modos e médias).",
+        width=100
+    ))
+
+    linhas.append("")
+    linhas.append("3. TABELA COMPLETA: IP Address × Time (mais recentes primeiro)")
+    if tabela_completa.empty:
+        linhas.append("- Não há dados suficientes para compor a tabela completa.")
+    else:
+        yield from linhas.esvaziar()
+        for tempos, ips in _blocos_tabela(tabela_completa, linhas_por_bloco):
+            yield "\n".join(("- " + tempos + "  |  " + ips).tolist())
+
+    linhas.append("")
+    # *** Sem "(SHA-512)" aqui também ***
+    linhas.append("4. ASSINATURA CRIPTOGRÁFICA")
+    linhas.append(modelo.content_hash)
+    yield from linhas.esvaziar()
+
+def escrever_html(modelo: ModeloRelatorio, destino, linhas_por_bloco: int = LINHAS_POR_BLOCO):
+    """Escreve o relatório HTML (utf-8) num arquivo binário aberto, bloco a bloco."""
+    _escrever_partes(_partes_html(modelo, linhas_por_bloco), destino)
+
+def escrever_txt(modelo: ModeloRelatorio, destino, linhas_por_bloco: int = LINHAS_POR_BLOCO):
+    """Escreve o relatório TXT (utf-8) num arquivo binário aberto, bloco a bloco."""
+    _escrever_partes(_partes_txt(modelo, linhas_por_bloco), destino)
+
+def renderizar_html(modelo: ModeloRelatorio) -> bytes:
+    bio = BytesIO()
+    escrever_html(modelo, bio)
+    return bio.getvalue()
+
+def renderizar_txt(modelo: ModeloRelatorio) -> bytes:
+    bio = BytesIO()
+    escrever_txt(modelo, bio)
+    return bio.getvalue()
+
+def renderizar_docx(modelo: ModeloRelatorio) -> bytes | None:
+    if not DOCX_OK:
+        return None
+    from analise import relatorio_docx
+    return relatorio_docx.renderizar_docx(modelo)
+
+def renderizar_pdf(modelo: ModeloRelatorio,
+                   titulo: str = "Relatório Policial - Análise de IPs",
+                   processos: int | None = None) -> bytes:
+    """
+    A tabela completa é desenhada em sub-tabelas do tamanho de uma página
+    (cabeçalho repetido em cada uma), geradas sob demanda. Com `processos`
+    > 1 (ou None, automático para tabelas a partir de PAGINAS_PARALELO
+    páginas) e pypdf instalado, intervalos de páginas são renderizados em
+    processos separados e unidos no fim.
+    """
+    if not PDF_OK:
+        raise RuntimeError("Pacote 'reportlab' não está disponível. Instale com: pip install reportlab")
+    from analise import relatorio_pdf
+    return relatorio_pdf.renderizar_pdf(modelo, titulo, processos)
+
+# ---------- PDF SÓ DO HASH PARA COMPARAÇÃO ----------
+def gerar_pdf_hash(hash_str: str,
+                   metadados: dict | None = None,
+                   titulo: str = "Assinatura Criptográfica para Verificação") -> bytes:
+    """
+    Gera um PDF minimalista contendo apenas a assinatura criptográfica (hash),
+    opcionalmente com alguns metadados essenciais para facilitar a comparação.
+    """
+    if not PDF_OK:
+        raise RuntimeError("Pacote 'reportlab' não está disponível. Instale com: pip install reportlab")
+    from analise import relatorio_pdf
+    return relatorio_pdf.gerar_pdf_hash(hash_str, metadados, titulo)
@@ -0,0 +1,92 @@
+"""
+Renderizador DOCX do relatório policial (python-docx).
+
+Importado só na primeira renderização (analise.relatorio.renderizar_docx),
+para que o python-docx não pese no início do dashboard.
+"""
+import itertools
+import re
+from io import BytesIO
+from xml.sax.saxutils import escape
+
+from docx import Document
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls, qn
+
+from analise.relatorio import COLUNAS_TABELA, ModeloRelatorio, _linhas_manifesto
+
+# caracteres de controle que o XML não aceita
+_INVALIDOS_XML = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+def renderizar_docx(modelo: ModeloRelatorio) -> bytes:
+    doc = Document()
+    doc.add_heading('Relatório Policial - Análise de IPs (Análise de Dados)', level=1)
+
+    doc.add_heading('Metadados', level=2)
+    for k,v in modelo.metadados.items():
+        doc.add_paragraph(f"{k}: {v}")
+
+    if modelo.wa_doc:
+        doc.add_heading('Dados do Documento WhatsApp Business Record', level=2)
+        for k, v in modelo.wa_doc.items():
+            doc.add_paragraph(f"{k}: {v}")
+
+    doc.add_heading('Manifesto de Evidências', level=2)
+    for rotulo, valor in _linhas_manifesto(modelo):
+        p = doc.add_paragraph(f"{rotulo}: ")
+        p.add_run(valor).font.name = "Courier New"
+
+    doc.add_heading('Síntese dos Achados', level=2)
+    for a in modelo.achados:
+        doc.add_paragraph(a)
+
+    doc.add_heading('Metodologia', level=2)
+    doc.add_paragraph(
+        "Os dados foram importados, higienizados e analisados com apoio de ferramentas computacionais. "
+        "Procedeu-se à consolidação de múltiplas fontes, conversão de datas para o fuso America/Sao_Paulo "
+        "e análise descritiva (contagens, modos e médias)."
+    )
+
+    tabela = modelo.tabela
+    doc.add_heading('Tabela Completa: IP Address × Time (mais recentes primeiro)', level=2)
+    if tabela.empty:
+        doc.add_paragraph("Não há dados suficientes para compor a tabela completa (verifique colunas de IP e horário).")
+    else:
+        _tabela_docx(doc, COLUNAS_TABELA, [tabela[c].astype(str).tolist() for c in COLUNAS_TABELA])
+
+    # *** HASH APENAS NO FINAL (sem "(SHA-512)") ***
+    doc.add_heading('Assinatura Criptográfica', level=2)
+    doc.add_paragraph(modelo.content_hash)
+
+    bio = BytesIO()
+    doc.save(bio); bio.seek(0)
+    return bio.getvalue()
+
+def _texto_xml(valor: str) -> str:
+    return escape(_INVALIDOS_XML.sub("", valor))
+
+def _tabela_docx(doc, colunas, valores_por_coluna, linhas_por_bloco: int = 20_000):
+    """
+    Tabela DOCX montada direto em XML: o cabeçalho sai do python-docx (estilo,
+    grade e larguras) e as linhas de dados são escritas como texto e anexadas
+    em blocos, em vez de um add_row() (deep-copy de XML) por linha.
+    """
+    t = doc.add_table(rows=1, cols=len(colunas))
+    tcprs = []
+    for celula, nome in zip(t.rows[0].cells, colunas):
+        celula.text = nome
+        tcw = celula._tc.tcPr.find(qn("w:tcW"))
+        tcprs.append(f'<w:tcPr><w:tcW w:type="{tcw.get(qn("w:type"))}" w:w="{tcw.get(qn("w:w"))}"/></w:tcPr>')
+    modelos = [f"<w:tc>{tcpr}<w:p><w:r><w:t xml:space=\"preserve\">{{}}</w:t></w:r></w:p></w:tc>" for tcpr in tcprs]
+
+    linhas = zip(*valores_por_coluna)
+    while True:
+        bloco = list(itertools.islice(linhas, linhas_por_bloco))
+        if not bloco:
+            break
+        xml = "".join(
+            "<w:tr>" + "".join(m.format(_texto_xml(v)) for m, v in zip(modelos, linha)) + "</w:tr>"
+            for linha in bloco
+        )
+        t._tbl.extend(parse_xml(f"<w:tbl {nsdecls('w')}>{xml}</w:tbl>").findall(qn("w:tr")))
+    return t
@@ -0,0 +1,321 @@
+"""
+Renderizador PDF do relatório policial (reportlab) e PDF só do hash.
+
+Importado só na primeira renderização (analise.relatorio.renderizar_pdf e
+gerar_pdf_hash), para que o reportlab não pese no início do dashboard; o
+pypdf, usado só para juntar partes renderizadas em paralelo, é importado
+nesse caminho.
+"""
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from io import BytesIO
+from xml.sax.saxutils import escape
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import mm
+from reportlab.lib.utils import ImageReader
+from reportlab.platypus import Image, PageBreak, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from analise.relatorio import COLUNAS_TABELA, PAGINAS_PARALELO, PYPDF_OK, ModeloRelatorio, _linhas_manifesto
+
+# ---- PDF: cabeçalho/rodapé; hash só no final do conteúdo ----
+def _header_footer(canvas, doc, deslocamento=0):
+    largura_pagina, altura_pagina = A4
+    try:
+        logo_path = "brasao.png"
+        if os.path.exists(logo_path):
+            img_w = 40 * mm
+            img_h = 40 * mm
+            x = (largura_pagina - img_w) / 2.0
+            y = altura_pagina - (img_h + 10 * mm)
+            canvas.drawImage(logo_path, x, y, width=img_w, height=img_h,
+                             preserveAspectRatio=True, mask='auto')
+    except Exception:
+        pass
+    # partes renderizadas em outros processos continuam a numeração do documento
+    page_num = canvas.getPageNumber() + deslocamento
+    canvas.setFont("Helvetica", 9)
+    canvas.setFillColor(colors.grey)
+    canvas.drawRightString(largura_pagina - 20 * mm, 12 * mm, f"Página {page_num}")
+
+def _rl_image_from_png_bytes(png_bytes: bytes, max_width_pt: float, max_height_pt: float):
+    try:
+        bio = BytesIO(png_bytes)
+        ir = ImageReader(bio)
+        iw, ih = ir.getSize()
+        scale = min(max_width_pt / float(iw), max_height_pt / float(ih), 1.0)
+        w = iw * scale
+        h = ih * scale
+        bio.seek(0)
+        return Image(bio, width=w, height=h)
+    except Exception:
+        return None
+
+_MARGEM_PDF = 36
+_TOPO_PDF = 70 * mm
+_LARGURAS_TABELA_PDF = [150, 350]
+_TITULO_TABELA_PDF = "4. Tabela Completa: IP Address × Time (mais recentes primeiro)"
+
+class _HistoriaPreguicosa(list):
+    """
+    Lista de flowables alimentada por um gerador: o doc.build do reportlab
+    consome a história pela frente, então só os próximos itens existem em
+    memória (as sub-tabelas já desenhadas são descartadas).
+    """
+
+    def __init__(self, iteravel):
+        super().__init__()
+        self._fonte = iter(iteravel)
+        self._esgotada = False
+
+    def _encher(self, n):
+        while not self._esgotada and super().__len__() < n:
+            try:
+                self.append(next(self._fonte))
+            except StopIteration:
+                self._esgotada = True
+
+    def __len__(self):
+        self._encher(2)
+        return super().__len__()
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            self._encher(float("inf") if i.stop is None or i.stop < 0 else i.stop)
+        else:
+            self._encher(float("inf") if i < 0 else i + 1)
+        return super().__getitem__(i)
+
+def _estilos_pdf():
+    styles = getSampleStyleSheet()
+    return styles["Title"], styles["Heading1"], styles["BodyText"]
+
+def _doc_pdf(bio, titulo):
+    return SimpleDocTemplate(
+        bio, pagesize=A4,
+        leftMargin=_MARGEM_PDF, rightMargin=_MARGEM_PDF,
+        topMargin=_TOPO_PDF, bottomMargin=_MARGEM_PDF,
+        title=titulo
+    )
+
+def _estilo_tabela_pdf(paridade: int) -> TableStyle:
+    # a alternância de cores continua de uma sub-tabela para a seguinte
+    fundos = [colors.whitesmoke, colors.white]
+    return TableStyle([
+        ("BACKGROUND", (0,0), (-1,0), colors.lightgrey),
+        ("TEXTCOLOR", (0,0), (-1,0), colors.black),
+        ("ALIGN", (0,0), (-1,-1), "LEFT"),
+        ("VALIGN", (0,0), (-1,-1), "TOP"),
+        ("FONTNAME", (0,0), (-1,-1), "Helvetica"),
+        ("FONTSIZE", (0,0), (-1,-1), 9),
+        ("GRID", (0,0), (-1,-1), 0.25, colors.grey),
+        ("ROWBACKGROUNDS", (0,1), (-1,-1), fundos[paridade:] + fundos[:paridade]),
+    ])
+
+def _linhas_por_pagina(style_h1) -> tuple[int, int]:
+    """Linhas de dados que cabem na primeira página da tabela (abaixo do título) e nas seguintes."""
+    doc = _doc_pdf(BytesIO(), "")
+    altura = doc.height - 12  # padding do frame
+    amostra = Table([["Time (America/Sao_Paulo)", "IP Address"], ["00/00/0000 00:00:00", "0"]],
+                    colWidths=_LARGURAS_TABELA_PDF)
+    amostra.setStyle(_estilo_tabela_pdf(0))
+    altura_linha = amostra.wrap(doc.width, altura)[1] / 2
+    titulo = Paragraph(_TITULO_TABELA_PDF, style_h1)
+    altura_titulo = titulo.wrap(doc.width, altura)[1] + titulo.getSpaceBefore() + titulo.getSpaceAfter()
+    # folga de uma linha para arredondamentos do layout; -1 pelo cabeçalho repetido
+    seguintes = int(altura // altura_linha) - 2
+    primeira = int((altura - altura_titulo) // altura_linha) - 2
+    return max(primeira, 1), max(seguintes, 1)
+
+def _fatias_tabela(n_linhas: int, primeira: int, seguintes: int):
+    # (início, fim) das linhas de cada página da tabela
+    inicio, fim = 0, min(primeira, n_linhas)
+    while inicio < n_linhas:
+        yield inicio, fim
+        inicio, fim = fim, min(fim + seguintes, n_linhas)
+
+def _sub_tabelas(tempos, ips, fatias, inicio_global: int):
+    cabecalho = list(COLUNAS_TABELA)
+    estilos = [_estilo_tabela_pdf(0), _estilo_tabela_pdf(1)]
+    for i, (inicio, fim) in enumerate(fatias):
+        if i:
+            yield PageBreak()
+        dados = [cabecalho] + [[t, ip] for t, ip in zip(tempos[inicio - inicio_global:fim - inicio_global],
+                                                         ips[inicio - inicio_global:fim - inicio_global])]
+        tbl = Table(dados, colWidths=_LARGURAS_TABELA_PDF, repeatRows=1)
+        tbl.setStyle(estilos[inicio % 2])
+        yield tbl
+
+def _historia_final(content_hash, style_h1, style_body):
+    # *** HASH APENAS NO FINAL (sem "(SHA-512)") ***
+    return [
+        Spacer(1, 12),
+        Paragraph("5. Assinatura Criptográfica", style_h1),
+        Paragraph(f"<font name='Courier'>{content_hash}</font>", style_body),
+    ]
+
+def _historia_preambulo(modelo: ModeloRelatorio, titulo: str, style_title, style_h1, style_body) -> list:
+    frame_width = A4[0] - 2 * _MARGEM_PDF
+    frame_height = A4[1] - (_TOPO_PDF + _MARGEM_PDF)
+
+    story = []
+    story.append(Paragraph(titulo, style_title))
+
+    story.append(Paragraph("<b>Metadados</b>", style_h1))
+    for k, v in modelo.metadados.items():
+        story.append(Paragraph(f"{k}: {v}", style_body))
+    story.append(Spacer(1, 8))
+
+    if modelo.wa_doc:
+        story.append(Paragraph("Dados do Documento WhatsApp Business Record", style_h1))
+        for k, v in modelo.wa_doc.items():
+            story.append(Paragraph(f"{k}: {v}", style_body))
+        story.append(Spacer(1, 8))
+
+    story.append(Paragraph("Manifesto de Evidências", style_h1))
+    for rotulo, valor in _linhas_manifesto(modelo):
+        story.append(Paragraph(f"{escape(rotulo)}:<br/><font name='Courier' size='6'>{valor}</font>", style_body))
+    story.append(Spacer(1, 8))
+
+    story.append(Paragraph("1. Síntese dos Achados", style_h1))
+    for a in modelo.achados:
+        story.append(Paragraph(a, style_body))
+    story.append(Spacer(1, 8))
+
+    story.append(Paragraph("2. Metodologia", style_h1))
+    story.append(Paragraph(
+        "Os dados foram importados, higienizados e analisados com apoio de ferramentas computacionais. "
+        "Procedeu-se à consolidação de múltiplimas fontes, conversão de datas para o fuso America/Sao_Paulo "
+        "e análise descritiva (contagens, modos e médias).", style_body
+    ))
+    story.append(Spacer(1, 8))
+
+    if modelo.incluir_graficos and (modelo.png_timeline or modelo.png_top_ips):
+        story.append(Paragraph("3. Gráficos", style_h1))
+        max_w = frame_width; max_h = frame_height * 0.45
+
+        if modelo.png_timeline:
+            story.append(Paragraph("Linha do tempo de eventos por dia", style_body))
+            img_flow = _rl_image_from_png_bytes(modelo.png_timeline, max_w, max_h)
+            if img_flow:
+                story.append(Spacer(1, 4)); story.append(img_flow); story.append(Spacer(1, 10))
+
+        if modelo.png_top_ips:
+            story.append(Paragraph("Top IPs por frequência", style_body))
+            img_flow = _rl_image_from_png_bytes(modelo.png_top_ips, max_w, max_h)
+            if img_flow:
+                story.append(Spacer(1, 4)); story.append(img_flow); story.append(Spacer(1, 10))
+    return story
+
+def _renderizar_paginas_tabela(tarefa) -> bytes:
+    """
+    Executado nos processos auxiliares: desenha um intervalo de páginas da
+    tabela (e, na última parte, a assinatura), já com a numeração global.
+    """
+    titulo, tempos, ips, fatias, deslocamento, content_hash = tarefa
+    _, style_h1, style_body = _estilos_pdf()
+    story = _sub_tabelas(tempos, ips, fatias, fatias[0][0])
+    if content_hash is not None:
+        story = itertools.chain(story, _historia_final(content_hash, style_h1, style_body))
+    bio = BytesIO()
+    rodape = partial(_header_footer, deslocamento=deslocamento)
+    _doc_pdf(bio, titulo).build(_HistoriaPreguicosa(story), onFirstPage=rodape, onLaterPages=rodape)
+    return bio.getvalue()
+
+def renderizar_pdf(modelo: ModeloRelatorio,
+                   titulo: str = "Relatório Policial - Análise de IPs",
+                   processos: int | None = None) -> bytes:
+    style_title, style_h1, style_body = _estilos_pdf()
+    story = _historia_preambulo(modelo, titulo, style_title, style_h1, style_body)
+
+    tabela_full = modelo.tabela
+    if tabela_full.empty:
+        story.append(Paragraph(_TITULO_TABELA_PDF, style_h1))
+        story.append(Paragraph("Não há dados suficientes para compor a tabela completa (verifique colunas de IP e horário).", style_body))
+        story.extend(_historia_final(modelo.content_hash, style_h1, style_body))
+        bio = BytesIO()
+        _doc_pdf(bio, titulo).build(story, onFirstPage=_header_footer, onLaterPages=_header_footer)
+        return bio.getvalue()
+
+    tempos = tabela_full["Time (America/Sao_Paulo)"].astype(str).tolist()
+    ips = tabela_full["IP Address"].astype(str).tolist()
+    fatias = list(_fatias_tabela(len(tempos), *_linhas_por_pagina(style_h1)))
+    if processos is None:
+        processos = min(os.cpu_count() or 1, 8) if len(fatias) >= PAGINAS_PARALELO else 1
+    if processos > 1 and PYPDF_OK and len(fatias) >= 2 * processos:
+        return _renderizar_pdf_paralelo(story, titulo, tempos, ips, fatias, modelo.content_hash,
+                                        style_h1, processos)
+
+    # a tabela começa numa página nova para que cada sub-tabela ocupe uma página inteira
+    story += [PageBreak(), Paragraph(_TITULO_TABELA_PDF, style_h1)]
+    story = itertools.chain(story, _sub_tabelas(tempos, ips, fatias, 0),
+                            _historia_final(modelo.content_hash, style_h1, style_body))
+    bio = BytesIO()
+    _doc_pdf(bio, titulo).build(_HistoriaPreguicosa(story),
+                                onFirstPage=_header_footer, onLaterPages=_header_footer)
+    return bio.getvalue()
+
+def _renderizar_pdf_paralelo(preambulo, titulo, tempos, ips, fatias, content_hash, style_h1, processos) -> bytes:
+    # preâmbulo + título da tabela + primeira página da tabela aqui; o resto em blocos contíguos
+    inicio = preambulo + [PageBreak(), Paragraph(_TITULO_TABELA_PDF, style_h1)]
+    inicio += list(_sub_tabelas(tempos, ips, fatias[:1], 0))
+    bio = BytesIO()
+    _doc_pdf(bio, titulo).build(inicio, onFirstPage=_header_footer, onLaterPages=_header_footer)
+    partes = [bio.getvalue()]
+    from pypdf import PdfReader, PdfWriter  # só no caminho paralelo
+    paginas_inicio = len(PdfReader(BytesIO(partes[0])).pages)
+
+    restantes = fatias[1:]
+    por_parte = -(-len(restantes) // processos)
+    tarefas = []
+    for k in range(0, len(restantes), por_parte):
+        grupo = restantes[k:k + por_parte]
+        a, b = grupo[0][0], grupo[-1][1]
+        ultima = k + por_parte >= len(restantes)
+        tarefas.append((titulo, tempos[a:b], ips[a:b], grupo, paginas_inicio + k,
+                        content_hash if ultima else None))
+    with ProcessPoolExecutor(max_workers=processos) as ex:
+        partes.extend(ex.map(_renderizar_paginas_tabela, tarefas))
+
+    escritor = PdfWriter()
+    for parte in partes:
+        escritor.append(PdfReader(BytesIO(parte)))
+    escritor.add_metadata({"/Title": titulo})
+    saida = BytesIO()
+    escritor.write(saida)
+    return saida.getvalue()
+
+def gerar_pdf_hash(hash_str: str,
+                   metadados: dict | None = None,
+                   titulo: str = "Assinatura Criptográfica para Verificação") -> bytes:
+    styles = getSampleStyleSheet()
+    style_title = styles["Title"]; style_h1 = styles["Heading1"]; style_body = styles["BodyText"]
+
+    left = right = bottom = 36
+    top = 36
+
+    story = []
+    story.append(Paragraph(titulo, style_title))
+    story.append(Spacer(1, 8))
+    if metadados:
+        story.append(Paragraph("Metadados essenciais", style_h1))
+        for k, v in metadados.items():
+            story.append(Paragraph(f"{k}: {v}", style_body))
+        story.append(Spacer(1, 8))
+
+    story.append(Paragraph("Hash (SHA-512)", style_h1))
+    story.append(Paragraph(f"<font name='Courier'>{hash_str}</font>", style_body))
+
+    bio = BytesIO()
+    doc = SimpleDocTemplate(
+        bio, pagesize=A4,
+        leftMargin=left, rightMargin=right,
+        topMargin=top, bottomMargin=bottom,
+        title="Assinatura Criptográfica"
+    )
+    doc.build(story)
+    return bio.getvalue()
@@ -0,0 +1,192 @@
+"""
+Inferência de colunas de data/hora.
+
+Em vez de tentar pd.to_datetime na coluna inteira (e falhar só no fim nas
+colunas de texto livre), cada coluna textual é sondada por uma amostra
+pequena: o formato é deduzido do primeiro valor e validado na amostra. Só
+as colunas aprovadas são convertidas inteiras, com o formato explícito:
+formatos numéricos de largura fixa são lidos direto em numpy e os demais
+vão para o pd.to_datetime com format=. O formato deduzido de cada amostra
+fica memorizado (pela amostra inteira) e vale para os próximos reruns; a
+recusa de uma coluna por um valor fora do formato não é memorizada, pois
+depende da coluna inteira e não só da amostra.
+"""
+import hashlib
+import re
+import warnings
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype, is_object_dtype, is_string_dtype
+
+from analise.fuso import FUSO_PADRAO, para_fuso
+
+try:
+    from pandas.tseries.api import guess_datetime_format
+except ImportError:  # pandas < 2.2
+    from pandas._libs.tslibs.parsing import guess_datetime_format
+
+# valores do início da coluna + valores espalhados ao longo dela
+TAMANHO_AMOSTRA = 100
+_LIMITE_MEMO = 4096
+_VAZIOS = {"", "nat", "nan", "none", "null"}
+
+# campos numéricos de largura fixa aceitos pelo parse direto em numpy
+_LARGURAS = {"%Y": 4, "%m": 2, "%d": 2, "%H": 2, "%M": 2, "%S": 2}
+_FUSOS_LITERAIS = ("UTC", "GMT", "Z")
+
+# (coluna, resumo da amostra) -> formato (str) ou None quando a amostra não é de datas
+_decisoes = OrderedDict()
+
+def _amostra(serie: pd.Series) -> pd.Series:
+    inicio = serie.iloc[:50 * TAMANHO_AMOSTRA].dropna().head(TAMANHO_AMOSTRA)
+    passo = max(len(serie) // TAMANHO_AMOSTRA, 1)
+    espalhada = serie.iloc[::passo].dropna()
+    amostra = pd.concat([inicio, espalhada])
+    return amostra[~amostra.astype(str).str.strip().str.lower().isin(_VAZIOS)]
+
+def _converter(serie: pd.Series, formato: str, errors: str = "coerce") -> pd.Series:
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return pd.to_datetime(serie, format=formato, errors=errors, utc=True)
+
+def _layout_largura_fixa(formato: str, exemplo: str):
+    # posições de cada campo num formato como "%d/%m/%Y %H:%M:%S" ou "%Y-%m-%d %H:%M:%S %Z"
+    pos, campos, literais = 0, {}, []
+    for tok in re.findall(r"%.|[^%]+", formato):
+        if tok in _LARGURAS and tok not in campos:
+            campos[tok] = pos
+            pos += _LARGURAS[tok]
+        elif tok == "%Z":
+            fuso = next((f for f in _FUSOS_LITERAIS if exemplo.startswith(f, pos)), None)
+            if fuso is None:
+                return None
+            literais.append((pos, fuso))
+            pos += len(fuso)
+        elif tok.startswith("%"):
+            return None
+        else:
+            literais.append((pos, tok))
+            pos += len(tok)
+    if not {"%Y", "%m", "%d"} <= campos.keys():
+        return None
+    return campos, literais, pos
+
+def _parse_largura_fixa(texto: pd.Series, formato: str) -> pd.Series | None:
+    """
+    Parse vetorizado em numpy para formatos numéricos de largura fixa: os
+    dígitos são lidos direto dos bytes. Devolve None quando algum valor foge
+    do layout, deixando o caso para o pd.to_datetime.
+    """
+    presentes = texto.notna()
+    valores = texto[presentes]
+    if valores.empty:
+        return None
+    layout = _layout_largura_fixa(formato, str(valores.iloc[0]))
+    if layout is None:
+        return None
+    campos, literais, largura = layout
+    if not (valores.str.len() == largura).all():
+        return None
+    try:
+        matriz = np.asarray(valores.to_numpy(dtype=object), dtype=f"S{largura}")
+    except UnicodeEncodeError:
+        return None
+    matriz = matriz.view(np.uint8).reshape(-1, largura)
+    for pos, literal in literais:
+        esperado = np.frombuffer(literal.encode("ascii"), dtype=np.uint8)
+        if not (matriz[:, pos:pos + len(esperado)] == esperado).all():
+            return None
+
+    partes = {}
+    for tok, pos in campos.items():
+        digitos = matriz[:, pos:pos + _LARGURAS[tok]].astype(np.int64) - 48
+        if ((digitos < 0) | (digitos > 9)).any():
+            return None
+        pesos = 10 ** np.arange(_LARGURAS[tok] - 1, -1, -1)
+        partes[tok] = digitos @ pesos
+    zeros = np.zeros(len(matriz), dtype=np.int64)
+    ano, mes, dia = partes["%Y"], partes["%m"], partes["%d"]
+    hora, minuto, seg = (partes.get(t, zeros) for t in ("%H", "%M", "%S"))
+    if ((mes < 1) | (mes > 12) | (dia < 1) | (hora > 23) | (minuto > 59) | (seg > 59)).any():
+        return None
+    meses = ((ano - 1970) * 12 + mes - 1).astype("M8[M]")
+    dias = meses.astype("M8[D]") + (dia - 1).astype("m8[D]")
+    if (dias.astype("M8[M]") != meses).any():  # ex.: 31/02
+        return None
+    ns = dias.astype("M8[ns]").view(np.int64) + ((hora * 60 + minuto) * 60 + seg) * 1_000_000_000
+
+    resultado = np.full(len(texto), np.iinfo(np.int64).min, dtype=np.int64)
+    resultado[presentes.to_numpy()] = ns
+    indice = pd.DatetimeIndex(resultado.view("M8[ns]")).tz_localize("UTC")
+    return pd.Series(indice, index=texto.index, name=texto.name)
+
+def inferir_formato(amostra: pd.Series) -> str | None:
+    """Deduz um formato a partir do primeiro valor e exige que toda a amostra o respeite."""
+    if amostra.empty:
+        return None
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        formato = guess_datetime_format(str(amostra.iloc[0]).strip())
+    # sem formato reconhecível: mesma regra do pandas, parse valor a valor
+    formato = formato or "mixed"
+    try:
+        convertida = _converter(amostra.astype(str).str.strip(), formato)
+    except (ValueError, TypeError):
+        return None
+    return formato if convertida.notna().all() else None
+
+def _chave(col, amostra: pd.Series):
+    resumo = hashlib.blake2b("\x1f".join(map(str, amostra)).encode("utf-8", "surrogatepass"), digest_size=16)
+    return (str(col), len(amostra), resumo.digest())
+
+def _lembrar(chave, formato):
+    _decisoes[chave] = formato
+    if len(_decisoes) > _LIMITE_MEMO:
+        _decisoes.popitem(last=False)
+
+def converter_coluna_datetime(serie: pd.Series, col=None) -> pd.Series | None:
+    """
+    Converte uma coluna textual em datetime (UTC) se ela for de datas;
+    devolve None caso contrário. Um valor não vazio que não respeite o
+    formato invalida a coluna inteira, como o errors='raise' de antes.
+    """
+    amostra = _amostra(serie)
+    if amostra.empty:
+        return None
+    chave = _chave(serie.name if col is None else col, amostra)
+    if chave in _decisoes:
+        _decisoes.move_to_end(chave)
+        formato = _decisoes[chave]
+    else:
+        formato = inferir_formato(amostra)
+        _lembrar(chave, formato)
+    if formato is None:
+        return None
+
+    texto = serie.where(serie.isna(), serie.astype(str)).str.strip()
+    convertida = _parse_largura_fixa(texto, formato)
+    if convertida is None:
+        convertida = _converter(texto, formato)
+    falhas = convertida.isna() & serie.notna()
+    if falhas.any() and not texto[falhas].str.lower().isin(_VAZIOS).all():
+        return None
+    return convertida
+
+def detectar_colunas_datetime(df, fuso=FUSO_PADRAO):
+    df = df.copy()
+    for col in df.columns:
+        if is_datetime64_any_dtype(df[col]):
+            try:
+                df[col] = para_fuso(df[col], fuso)
+            except Exception:
+                pass
+        elif is_object_dtype(df[col]) or is_string_dtype(df[col]):
+            try:
+                temp = converter_coluna_datetime(df[col], col)
+                if temp is not None:
+                    df[col] = para_fuso(temp, fuso)
+            except Exception:
+                pass
+    return df
@@ -0,0 +1,61 @@
+"""
+Paginação da tabela de dados exibida no dashboard.
+
+Ordenação e paginação acontecem sobre as colunas tipadas (datas ordenam
+como datas, números como números); só a janela visível é formatada para
+texto antes de ir para o st.dataframe.
+"""
+import numpy as np
+import pandas as pd
+
+# "YYYY-MM-DDTHH:MM:SS" (np.datetime_as_string) -> "DD/MM/YYYY HH:MM:SS"
+_ORDEM_DATA_BR = [8, 9, 4, 5, 6, 7, 0, 1, 2, 3, 10, 11, 12, 13, 14, 15, 16, 17, 18]
+
+def formatar_data_hora(serie: pd.Series) -> pd.Series:
+    """
+    Mesmo resultado de serie.dt.strftime("%d/%m/%Y %H:%M:%S") (horário de
+    parede do fuso da coluna), montado em numpy a partir dos inteiros em vez
+    de formatar valor a valor.
+    """
+    locais = serie.dt.tz_localize(None) if getattr(serie.dt, "tz", None) is not None else serie
+    try:
+        ns = pd.DatetimeIndex(locais).as_unit("ns").asi8
+    except (OverflowError, ValueError):
+        return serie.dt.strftime("%d/%m/%Y %H:%M:%S")
+    nulos = ns == np.iinfo(np.int64).min
+    segundos = np.where(nulos, 0, ns // 1_000_000_000).astype("M8[s]")
+    iso = np.datetime_as_string(segundos, unit="s").astype("U19")
+    caracteres = iso.view("U1").reshape(-1, 19)[:, _ORDEM_DATA_BR]
+    caracteres[:, [2, 5]] = "/"
+    caracteres[:, 10] = " "
+    texto = np.ascontiguousarray(caracteres).view("U19").ravel().astype(object)
+    texto[nulos] = np.nan
+    return pd.Series(texto, index=serie.index, name=serie.name)
+
+def formatar_datas_para_exibicao(df):
+    df_exibir = df.copy()
+    for col in df_exibir.columns:
+        if pd.api.types.is_datetime64_any_dtype(df_exibir[col]):
+            df_exibir[col] = formatar_data_hora(df_exibir[col])
+    return df_exibir
+
+def ordenar_posicoes(serie: pd.Series, descendente: bool = False) -> np.ndarray:
+    """Posições (0..n-1) que ordenam a coluna; nulos sempre no fim, ordem estável."""
+    serie = serie.reset_index(drop=True)
+    try:
+        ordenada = serie.sort_values(ascending=not descendente, na_position="last", kind="stable")
+    except TypeError:
+        # coluna com tipos misturados: ordena pela representação textual
+        ordenada = serie.where(serie.isna(), serie.astype(str)).sort_values(
+            ascending=not descendente, na_position="last", kind="stable")
+    return ordenada.index.to_numpy()
+
+def total_paginas(n_linhas: int, tamanho_pagina: int) -> int:
+    return max(-(-n_linhas // tamanho_pagina), 1)
+
+def janela(df: pd.DataFrame, pagina: int, tamanho_pagina: int, ordem: np.ndarray | None = None) -> pd.DataFrame:
+    """Linhas da página pedida (1-based), já formatadas para exibição."""
+    inicio = (pagina - 1) * tamanho_pagina
+    posicoes = ordem[inicio:inicio + tamanho_pagina] if ordem is not None else \
+        np.arange(inicio, min(inicio + tamanho_pagina, len(df)))
+    return formatar_datas_para_exibicao(df.iloc[posicoes])
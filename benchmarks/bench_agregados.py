@@ -0,0 +1,87 @@
+"""
+Benchmark dos agregados Time/IP (analise.agregados).
+
+Antes, cada relatório refazia sobre as linhas do recorte a contagem por dia
+(dt.normalize + value_counts), a contagem por IP (contar_ips) e o período
+(min/max). Aqui isso é comparado com o estado agregado: construção inicial,
+atualização incremental ao acrescentar um "arquivo" (só as linhas novas) e
+respostas para recortes por IP e por intervalo de tempo a partir do estado.
+
+Uso (na raiz do repositório):
+    python -m benchmarks.bench_agregados [--linhas 1000000] [--ips 2000] [--repeticoes 5]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from analise import relatorio
+from analise.esquema import contar_ips, normalizar_ips
+from analise.filtros import MotorFiltros
+
+def gerar_frame(linhas: int, ips_distintos: int, semente: int = 11) -> pd.DataFrame:
+    rnd = np.random.default_rng(semente)
+    inicio = pd.Timestamp("2024-01-01", tz="UTC").value
+    tempos = pd.to_datetime(inicio + rnd.integers(0, 120 * 86400, linhas) * 10**9, utc=True)
+    ips = np.array([f"{a}.{b}.{c}.{d}" for a, b, c, d in rnd.integers(1, 255, (ips_distintos, 4))], dtype=object)
+    return pd.DataFrame({
+        "Time": tempos.tz_convert("America/Sao_Paulo"),
+        "IP Address": normalizar_ips(pd.Series(ips[np.minimum(rnd.zipf(1.4, linhas) - 1, ips_distintos - 1)])),
+    })
+
+def _contagens_antigas(df):
+    tempos = relatorio._tempos_locais(df["Time"])
+    tempos.dropna().dt.normalize().value_counts().sort_index()
+    contar_ips(df["IP Address"])
+    return tempos.min(), tempos.max()
+
+def _contagens_estado(df_base, df, filtros, estado):
+    col_tempo, col_ip, tempos = relatorio._colunas_e_tempos(df)
+    e = relatorio._estado_do_recorte(df_base, df, col_tempo, col_ip, tempos, estado, filtros)
+    e.por_dia(); e.por_ip()
+    return e.periodo()
+
+def _medir(func, repeticoes):
+    t0 = time.perf_counter()
+    for _ in range(repeticoes):
+        resultado = func()
+    return (time.perf_counter() - t0) / repeticoes, resultado
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--linhas", type=int, default=1_000_000)
+    ap.add_argument("--ips", type=int, default=2_000)
+    ap.add_argument("--repeticoes", type=int, default=5)
+    args = ap.parse_args()
+
+    df = gerar_frame(args.linhas, args.ips)
+    novo = len(df) * 9 // 10
+    dt_base, anterior = _medir(lambda: relatorio.atualizar_agregados(df.iloc[:novo]), 1)
+    dt_inc, estado = _medir(lambda: relatorio.atualizar_agregados(df, anterior), args.repeticoes)
+    dt_tudo, _ = _medir(lambda: relatorio.atualizar_agregados(df), args.repeticoes)
+    print(f"{len(df)} linhas, {len(estado.grupos)} grupos (dia, IP)")
+    print(f"  estado de {novo} linhas              : {dt_base:7.3f} s")
+    print(f"  + {len(df) - novo} linhas (incremental)      : {dt_inc:7.3f} s   (refazer tudo: {dt_tudo:.3f} s)")
+
+    motor = MotorFiltros(df)
+    tmin = df["Time"].min()
+    top = tuple(contar_ips(df["IP Address"]).index[:20])
+    recortes = [
+        ("sem filtros", []),
+        ("20 IPs", [("IP Address", "valores", top)]),
+        ("intervalo de 30 dias", [("Time", "intervalo", (tmin + pd.Timedelta(days=10, hours=5),
+                                                        tmin + pd.Timedelta(days=40, hours=13)))]),
+        ("20 IPs + intervalo", [("IP Address", "valores", top),
+                                ("Time", "intervalo", (tmin + pd.Timedelta(days=3.3), tmin + pd.Timedelta(days=90.7)))]),
+    ]
+    for rotulo, filtros in recortes:
+        recorte = motor.aplicar(filtros)
+        dt_antigo, periodo_antigo = _medir(lambda: _contagens_antigas(recorte), args.repeticoes)
+        dt_novo, periodo_novo = _medir(lambda: _contagens_estado(df, recorte, filtros, estado), args.repeticoes)
+        assert periodo_antigo == periodo_novo, (periodo_antigo, periodo_novo)
+        print(f"  {rotulo:22} {len(recorte):>9} linhas  varredura {dt_antigo:7.3f} s  "
+              f"estado {dt_novo:7.3f} s  ({dt_antigo / dt_novo:5.1f}x)")
+
+if __name__ == "__main__":
+    main()
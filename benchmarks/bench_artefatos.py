@@ -0,0 +1,134 @@
+"""
+Benchmark do extrator de artefatos (analise.artefatos) em MB/s.
+
+Compara o extrator antigo de teste_2.py (três re.findall sobre o texto
+inteiro: telefones, IPv4 + horário e IPv6 + horário, cada par com
+`.{0,40}?`) com extrair_artefatos (uma expressão, uma passagem), sobre o
+mesmo texto: inteiro e em pedaços de --pedaco caracteres. O corpus imita
+um registro de provedor: blocos "IP Address ... Time ..." (IPv4, IPv6
+completo e comprimido) e linhas com telefones, e-mails e IMEIs no meio de
+texto comum.
+
+Confere que os pares IPv4 e os pares IPv6 na forma completa são os mesmos
+do extrator antigo, e que o resultado em pedaços é igual ao do texto
+inteiro. Com --html, mede também o caminho do script a partir do HTML
+(BeautifulSoup.get_text + findall contra extrair_artefatos_html).
+
+Uso (na raiz do repositório):
+    python -m benchmarks.bench_artefatos [--mb 20] [--pedaco 1048576] [--html]
+"""
+import argparse
+import re
+import time
+
+import numpy as np
+
+from analise.artefatos import extrair_artefatos, extrair_artefatos_html
+
+# ---------- caminho antigo (cópia de teste_2.extract_data, sem a conversão de fuso) ----------
+def extrair_antigo(text: str):
+    phones = re.findall(r'\+?\d{1,3}[\s\-]?\(?\d{2,3}\)?[\s\-]?\d{4,5}[\s\-]?\d{4}', text)
+    ipv4 = re.findall(r'((?:\d{1,3}\.){3}\d{1,3}).{0,40}?(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z)', text)
+    ipv6 = re.findall(r'((?:[A-F0-9]{1,4}:){7}[A-F0-9]{1,4}).{0,40}?(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z)', text, re.IGNORECASE)
+    return phones, ipv4, ipv6
+
+def _html_antigo(html: str):
+    from bs4 import BeautifulSoup
+    return extrair_antigo(BeautifulSoup(html, "html.parser").get_text(" "))
+
+# ---------- corpus ----------
+_PROSA = ("Os registros abaixo foram fornecidos pelo provedor em resposta ao ofício, "
+          "contendo os acessos da conta no período solicitado.")
+
+def _imei(rnd) -> str:
+    corpo = "".join(str(d) for d in rnd.integers(0, 10, 14))
+    soma = 0
+    for i, d in enumerate(reversed(corpo)):
+        n = int(d) * (1 if i % 2 else 2)
+        soma += n - 9 if n > 9 else n
+    return corpo + str((10 - soma % 10) % 10)
+
+def gerar_registros(mb: float, semente: int = 11) -> list[tuple[str, str]]:
+    """Lista de (rótulo, valor) ~ `mb` MB de texto, na ordem do documento."""
+    rnd = np.random.default_rng(semente)
+    registros, tamanho, n = [], 0, 0
+    inicio = np.datetime64("2024-01-01T00:00:00")
+    while tamanho < mb * 2**20:
+        ts = str(inicio + np.timedelta64(int(rnd.integers(0, 90 * 86400)), "s")) + "Z"
+        sorteio = rnd.random()
+        if sorteio < 0.6:
+            ip = ".".join(str(x) for x in rnd.integers(1, 255, 4))
+        elif sorteio < 0.8:
+            ip = ":".join(f"{x:04x}" for x in rnd.integers(0, 65536, 8))
+        else:
+            ip = "2804:" + ":".join(f"{x:x}" for x in rnd.integers(1, 65536, 2)) + "::" + f"{rnd.integers(1, 65536):x}"
+        bloco = [("IP Address", ip), ("Time", ts)]
+        if n % 10 == 0:
+            bloco += [("Observação", _PROSA),
+                      ("Telefone", f"+55 ({rnd.integers(11, 99)}) 9{rnd.integers(1000, 9999)}-{rnd.integers(1000, 9999)}"),
+                      ("E-mail", f"usuario{n}@exemplo.com.br"),
+                      ("IMEI", _imei(rnd))]
+        registros += bloco
+        tamanho += sum(len(r) + len(v) + 2 for r, v in bloco)
+        n += 1
+    return registros
+
+def _texto(registros) -> str:
+    return " ".join(f"{r} {v}" for r, v in registros)
+
+def _html(registros) -> str:
+    linhas = "".join(f"<tr><th>{r}</th><td>{v}</td></tr>" for r, v in registros)
+    return f"<html><body><table>{linhas}</table></body></html>"
+
+def _medir(func):
+    t0 = time.perf_counter()
+    resultado = func()
+    return time.perf_counter() - t0, resultado
+
+def _conferir(antigo, novo):
+    _, ipv4, ipv6 = antigo
+    assert novo["ipv4"] == ipv4, "pares IPv4 diferentes"
+    completos = [(ip, ts) for ip, ts in novo["ipv6"] if ip.count(":") == 7 and "::" not in ip]
+    assert completos == ipv6, "pares IPv6 (forma completa) diferentes"
+
+def _linha(rotulo, dt, mb, novo=None, antigo=None):
+    if novo is not None:
+        achados = (f"IPv4 {len(novo['ipv4'])}  IPv6 {len(novo['ipv6'])}  tel {len(novo['telefones'])}  "
+                   f"e-mail {len(novo['emails'])}  IMEI {len(novo['imeis'])}")
+    else:
+        achados = f"IPv4 {len(antigo[1])}  IPv6 {len(antigo[2])}  tel {len(antigo[0])}"
+    print(f"  {rotulo:34}: {dt:7.2f} s  {mb / dt:7.1f} MB/s  {achados}")
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--mb", type=float, default=20.0, help="tamanho do texto")
+    ap.add_argument("--pedaco", type=int, default=1 << 20, help="caracteres por pedaço no modo em pedaços")
+    ap.add_argument("--html", action="store_true", help="mede também a partir do HTML")
+    args = ap.parse_args()
+
+    registros = gerar_registros(args.mb)
+    texto = _texto(registros)
+    mb = len(texto.encode()) / 2**20
+    print(f"texto: {mb:.1f} MB, {len(registros)} campos")
+    dt_antigo, antigo = _medir(lambda: extrair_antigo(texto))
+    _linha("3 x re.findall (antigo)", dt_antigo, mb, antigo=antigo)
+    dt_novo, novo = _medir(lambda: extrair_artefatos(texto))
+    _linha("extrair_artefatos (texto inteiro)", dt_novo, mb, novo=novo)
+    pedacos = [texto[i:i + args.pedaco] for i in range(0, len(texto), args.pedaco)]
+    dt_pedacos, em_pedacos = _medir(lambda: extrair_artefatos(iter(pedacos)))
+    _linha(f"extrair_artefatos ({len(pedacos)} pedaços)", dt_pedacos, mb, novo=em_pedacos)
+    _conferir(antigo, novo)
+    assert em_pedacos == novo, "resultado em pedaços diferente do texto inteiro"
+
+    if args.html:
+        html = _html(registros)
+        mb_html = len(html.encode()) / 2**20
+        print(f"HTML: {mb_html:.1f} MB")
+        dt, antigo_html = _medir(lambda: _html_antigo(html))
+        _linha("BeautifulSoup + 3 x findall", dt, mb_html, antigo=antigo_html)
+        dt, novo_html = _medir(lambda: extrair_artefatos_html(html))
+        _linha("extrair_artefatos_html", dt, mb_html, novo=novo_html)
+        _conferir(antigo_html, novo_html)
+
+if __name__ == "__main__":
+    main()
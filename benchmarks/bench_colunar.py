@@ -0,0 +1,64 @@
+"""
+Benchmark de reabertura de um caso em formato colunar (analise.colunar).
+
+Um caso já normalizado (Time com fuso, IP categórico canônico) é gravado
+em CSV, Parquet e Feather; cada arquivo é reaberto por ler_arquivo, como
+no upload (Parquet/Feather direto do buffer, sem cópia) e, para os
+colunares, também de um arquivo em disco (memory map). Confere que fuso e
+categorias do IP voltam iguais.
+
+Uso (na raiz do repositório):
+    python -m benchmarks.bench_colunar [--linhas 5000000] [--sem-csv]
+"""
+import argparse
+import os
+import tempfile
+import time
+from io import BytesIO
+
+import pandas as pd
+
+from analise import exportacao
+from analise.ingestao import ler_arquivo
+from benchmarks.bench_agregados import gerar_frame
+
+def _medir(func):
+    t0 = time.perf_counter()
+    resultado = func()
+    return time.perf_counter() - t0, resultado
+
+def _conferir(original: pd.DataFrame, lido: pd.DataFrame):
+    assert str(lido["Time"].dt.tz) == str(original["Time"].dt.tz), lido["Time"].dtype
+    assert (lido["Time"].dt.as_unit("ns") == original["Time"]).all()
+    assert isinstance(lido["IP Address"].dtype, pd.CategoricalDtype)
+    assert list(lido["IP Address"].cat.categories) == list(original["IP Address"].cat.categories)
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--linhas", type=int, default=5_000_000)
+    ap.add_argument("--ips", type=int, default=50_000)
+    ap.add_argument("--sem-csv", action="store_true", help="pula o CSV (lento em casos grandes)")
+    args = ap.parse_args()
+
+    df = gerar_frame(args.linhas, args.ips)
+    print(f"{len(df)} linhas, {df['IP Address'].nunique()} IPs distintos")
+    formatos = ["parquet", "feather"] if args.sem_csv else ["csv", "parquet", "feather"]
+    with tempfile.TemporaryDirectory() as pasta:
+        for formato in formatos:
+            dt_escrita, conteudo = _medir(lambda: exportacao.exportar(df, formato))
+            caminho = os.path.join(pasta, f"caso.{formato}")
+            with open(caminho, "wb") as fh:
+                fh.write(conteudo)
+            dt_upload, resultado = _medir(lambda: ler_arquivo(caminho, BytesIO(conteudo)))
+            linha = (f"  {formato:8} {len(conteudo) / 2**20:8.1f} MiB  escrita {dt_escrita:7.2f} s  "
+                     f"upload {dt_upload:7.2f} s")
+            if formato != "csv":
+                _conferir(df, resultado["df"])
+                with open(caminho, "rb") as fh:
+                    dt_mmap, resultado = _medir(lambda: ler_arquivo(caminho, fh))
+                _conferir(df, resultado["df"])
+                linha += f"  disco (mmap) {dt_mmap:7.2f} s"
+            print(linha)
+
+if __name__ == "__main__":
+    main()
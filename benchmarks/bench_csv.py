@@ -0,0 +1,86 @@
+"""
+Benchmark de vazão (linhas/s) da leitura de CSV.
+
+Compara o caminho antigo (pd.read_csv com sep=None e engine python) com
+analise.leitura_csv.ler_csv (dialeto por amostra + engine pyarrow/C com
+dtypes explícitos) e com a leitura em blocos de ler_csv_em_blocos (iter_csv
+com as colunas repetitivas compactadas em categóricas), informando também a
+memória do frame resultante.
+
+Uso (na raiz do repositório):
+    python -m benchmarks.bench_csv [--linhas 1000000] [arquivo.csv ...]
+"""
+import argparse
+import time
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from analise import leitura_csv
+from analise.codificacao import detectar_encoding
+
+def gerar_cdr_csv(linhas: int, semente: int = 7) -> bytes:
+    # CDR sintético no formato típico de operadora: ';' e Latin-1
+    rnd = np.random.default_rng(semente)
+    inicio = pd.Timestamp("2024-01-01").value // 10**9
+    df = pd.DataFrame({
+        "Data/Hora": pd.to_datetime(inicio + rnd.integers(0, 90 * 86400, linhas), unit="s").strftime("%d/%m/%Y %H:%M:%S"),
+        "Origem": rnd.integers(11_900_000_000, 11_999_999_999, linhas).astype(str),
+        "Destino": rnd.integers(11_900_000_000, 11_999_999_999, linhas).astype(str),
+        "Duração (s)": rnd.integers(0, 3600, linhas),
+        "ERB": rnd.choice(["São Paulo - Sé", "Guarulhos - Centro", "Osasco - Km 18"], linhas),
+        "IMEI": rnd.integers(10**14, 10**15 - 1, linhas).astype(str),
+    })
+    return df.to_csv(index=False, sep=";").encode("latin-1")
+
+def _antigo(raw: bytes, enc: str):
+    return pd.read_csv(BytesIO(raw), sep=None, engine="python", encoding=enc)
+
+def _novo(raw: bytes, enc: str):
+    return leitura_csv.ler_csv(BytesIO(raw), enc)
+
+def _novo_c(raw: bytes, enc: str):
+    arrow = leitura_csv.ARROW_OK
+    leitura_csv.ARROW_OK = False
+    try:
+        return leitura_csv.ler_csv(BytesIO(raw), enc)
+    finally:
+        leitura_csv.ARROW_OK = arrow
+
+def _blocos(raw: bytes, enc: str):
+    return leitura_csv.ler_csv_em_blocos(BytesIO(raw), enc)
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("arquivos", nargs="*")
+    ap.add_argument("--linhas", type=int, default=500_000)
+    ap.add_argument("--sem-antigo", action="store_true", help="pula o caminho antigo (lento em arquivos grandes)")
+    args = ap.parse_args()
+
+    if args.arquivos:
+        corpus = [(p, open(p, "rb").read()) for p in args.arquivos]
+    else:
+        corpus = [(f"CDR sintético ({args.linhas} linhas)", gerar_cdr_csv(args.linhas))]
+
+    for nome, raw in corpus:
+        enc = detectar_encoding(BytesIO(raw))
+        print(f"\n{nome}: {len(raw) / 2**20:.1f} MiB, encoding {enc}")
+        casos = [("ler_csv (pyarrow)" if leitura_csv.ARROW_OK else "ler_csv (C)", _novo),
+                 ("ler_csv (C)", _novo_c),
+                 ("ler_csv_em_blocos (C)", _blocos)]
+        if not args.sem_antigo:
+            casos.insert(0, ("antigo (sep=None, python)", _antigo))
+        referencia = None
+        for rotulo, func in casos:
+            t0 = time.perf_counter()
+            resultado = func(raw, enc)
+            dt = time.perf_counter() - t0
+            linhas = len(resultado)
+            if referencia is None:
+                referencia = dt
+            mib = resultado.memory_usage(deep=True).sum() / 2**20
+            print(f"  {rotulo:28} {dt:8.2f} s  {linhas / dt:12,.0f} linhas/s  ({referencia / dt:5.1f}x)  {mib:8.1f} MiB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark da tabela IP × Time no relatório DOCX.
+
+Compara o caminho antigo (iterrows + add_row().cells por linha, um
+deep-copy de XML a cada linha) com analise.relatorio_docx._tabela_docx (linhas
+escritas em XML e anexadas em blocos). Ao final, o DOCX gerado é reaberto
+com python-docx e conferido (número de linhas e células de amostra).
+
+Uso (na raiz do repositório):
+    python -m benchmarks.bench_docx [--linhas 200000] [--linhas-antigo 5000]
+"""
+import argparse
+import time
+from io import BytesIO
+
+from docx import Document
+
+from analise import relatorio, relatorio_docx
+from benchmarks.bench_relatorio import gerar_frame
+
+def _antigo(tabela) -> bytes:
+    doc = Document()
+    cols = relatorio.COLUNAS_TABELA
+    t = doc.add_table(rows=1, cols=len(cols))
+    hdr = t.rows[0].cells
+    for i, c in enumerate(cols):
+        hdr[i].text = c
+    for _, row in tabela.iterrows():
+        cells = t.add_row().cells
+        cells[0].text = str(row["Time (America/Sao_Paulo)"])
+        cells[1].text = str(row["IP Address"])
+    bio = BytesIO()
+    doc.save(bio)
+    return bio.getvalue()
+
+def _novo(tabela) -> bytes:
+    doc = Document()
+    relatorio_docx._tabela_docx(doc, relatorio.COLUNAS_TABELA,
+                                [tabela[c].astype(str).tolist() for c in relatorio.COLUNAS_TABELA])
+    bio = BytesIO()
+    doc.save(bio)
+    return bio.getvalue()
+
+def _conferir(docx_bytes: bytes, tabela):
+    # ida e volta: o python-docx precisa abrir o arquivo e enxergar as mesmas células
+    t = Document(BytesIO(docx_bytes)).tables[0]
+    assert len(t.rows) == len(tabela) + 1, (len(t.rows), len(tabela))
+    assert [c.text for c in t.rows[0].cells] == relatorio.COLUNAS_TABELA
+    for i in (0, len(tabela) // 2, len(tabela) - 1):
+        esperado = [str(tabela.iloc[i][c]) for c in relatorio.COLUNAS_TABELA]
+        assert [c.text for c in t.rows[i + 1].cells] == esperado, (i, esperado)
+
+def _medir(func, tabela):
+    t0 = time.perf_counter()
+    saida = func(tabela)
+    return time.perf_counter() - t0, saida
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--linhas", type=int, default=200_000)
+    ap.add_argument("--linhas-antigo", type=int, default=5_000, help="0 para pular o caminho antigo")
+    args = ap.parse_args()
+
+    modelo = relatorio.montar_modelo(gerar_frame(args.linhas), None, False, {})
+    tabela = modelo.tabela
+    casos = [("_tabela_docx (XML em blocos)", _novo, tabela)]
+    if args.linhas_antigo:
+        casos.insert(0, ("antigo (add_row por linha)", _antigo, tabela.head(args.linhas_antigo)))
+
+    for rotulo, func, dados in casos:
+        dt, saida = _medir(func, dados)
+        _conferir(saida, dados)
+        print(f"  {rotulo:30} {len(dados):>9} linhas  {dt:8.2f} s  {len(dados) / dt:10,.0f} linhas/s  "
+              f"{len(saida) / 2**20:6.1f} MiB  (reaberto e conferido)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark da detecção de encoding.
+
+Compara chardet.detect sobre o arquivo inteiro (comportamento antigo de
+_decode_file e do ramo CSV) com analise.codificacao.detectar_encoding
+(BOM -> UTF-8 estrito -> chardet incremental sobre amostra limitada), com e
+sem o resultado memorizado por hash.
+
+Uso (na raiz do repositório):
+    python -m benchmarks.bench_encoding [arquivo_ou_diretório ...]
+
+Sem argumentos usa um corpus sintético (HTML UTF-8, CSV Latin-1, CSV UTF-16).
+Diretórios são percorridos recursivamente atrás de .html/.htm/.txt/.csv.
+"""
+import argparse
+import os
+import time
+from io import BytesIO
+
+import chardet
+
+from analise import codificacao
+from analise.hashing import gerar_hash
+
+EXTENSOES = (".html", ".htm", ".txt", ".csv")
+
+def _corpus_sintetico():
+    from benchmarks.bench_ingestao import gerar_wa_html
+
+    html = gerar_wa_html(20_000).encode("utf-8")
+    linhas = ["Nome;Cidade;Observação"] + [f"José {i};São Paulo;ação nº {i}" for i in range(60_000)]
+    csv_texto = "\n".join(linhas)
+    return [
+        ("wa_record.html (utf-8)", html),
+        ("cdr.csv (latin-1)", csv_texto.encode("latin-1")),
+        ("cdr.csv (utf-16)", csv_texto.encode("utf-16")),
+    ]
+
+def _corpus_real(caminhos):
+    for caminho in caminhos:
+        if os.path.isdir(caminho):
+            for raiz, _, nomes in os.walk(caminho):
+                for nome in sorted(nomes):
+                    if nome.lower().endswith(EXTENSOES):
+                        p = os.path.join(raiz, nome)
+                        yield p, open(p, "rb").read()
+        else:
+            yield caminho, open(caminho, "rb").read()
+
+def _tempo(func, repeticoes=3):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        resultado = func()
+        melhor = min(melhor, time.perf_counter() - t0)
+    return resultado, melhor
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("caminhos", nargs="*")
+    args = ap.parse_args()
+
+    corpus = list(_corpus_real(args.caminhos)) if args.caminhos else _corpus_sintetico()
+    total_antigo = total_novo = 0.0
+    print(f"{'arquivo':40} {'MiB':>7} {'antigo':>23} {'novo':>23} {'memo':>9}")
+    for nome, raw in corpus:
+        enc_a, t_a = _tempo(lambda: chardet.detect(raw)["encoding"], repeticoes=1)
+        enc_n, t_n = _tempo(lambda: codificacao.detectar_encoding(BytesIO(raw)))
+        digest = gerar_hash(raw)
+        codificacao.detectar_encoding(BytesIO(raw), digest)
+        _, t_m = _tempo(lambda: codificacao.detectar_encoding(BytesIO(raw), digest))
+        total_antigo += t_a
+        total_novo += t_n
+        print(f"{nome[-40:]:40} {len(raw) / 2**20:7.2f} {t_a * 1e3:9.1f} ms {str(enc_a):>12} "
+              f"{t_n * 1e3:9.2f} ms {enc_n:>12} {t_m * 1e6:6.1f} µs")
+    print(f"\nTotal: antigo {total_antigo:.2f} s, novo {total_novo:.3f} s "
+          f"({total_antigo / max(total_novo, 1e-9):.0f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark dos escritores TXT/HTML do relatório policial.
+
+Compara a serialização antiga da tabela completa (iterrows + f-string por
+linha no TXT; to_html inteiro dentro de uma lista unida com "\\n".join no
+HTML, e o resultado codificado de uma vez) com analise.relatorio.escrever_txt
+/ escrever_html, que montam blocos de linhas por concatenação vetorizada e
+escrevem direto no arquivo. Mede tempo e pico de memória alocada
+(tracemalloc) durante a escrita.
+
+Uso (na raiz do repositório):
+    python -m benchmarks.bench_escritores [--linhas 1000000]
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import matplotlib
+matplotlib.use("Agg")
+
+from analise import relatorio
+from benchmarks.bench_relatorio import gerar_frame
+
+def _txt_antigo(modelo, destino):
+    linhas = ["4. ASSINATURA CRIPTOGRÁFICA"]
+    for _, r in modelo.tabela.iterrows():
+        linhas.append(f"- {r['Time (America/Sao_Paulo)']}  |  {r['IP Address']}")
+    linhas.append(modelo.content_hash)
+    destino.write("\n".join(linhas).encode("utf-8"))
+
+def _html_antigo(modelo, destino):
+    html_parts = ["<div class='blk'><h2>Tabela Completa</h2>", modelo.tabela.to_html(index=False), "</div>"]
+    destino.write("\n".join(html_parts).encode("utf-8"))
+
+def _medir(func, modelo):
+    with tempfile.TemporaryFile() as destino:
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        func(modelo, destino)
+        dt = time.perf_counter() - t0
+        pico = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        tamanho = destino.seek(0, os.SEEK_END)
+    return dt, pico, tamanho
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--linhas", type=int, default=1_000_000)
+    ap.add_argument("--sem-antigo", action="store_true")
+    args = ap.parse_args()
+
+    modelo = relatorio.montar_modelo(gerar_frame(args.linhas), None, False, {})
+    print(f"{len(modelo.tabela)} linhas na tabela completa")
+    casos = [("escrever_txt", relatorio.escrever_txt), ("escrever_html", relatorio.escrever_html)]
+    if not args.sem_antigo:
+        casos = [("TXT antigo (iterrows)", _txt_antigo), casos[0],
+                 ("HTML antigo (to_html + join)", _html_antigo), casos[1]]
+    for rotulo, func in casos:
+        dt, pico, tamanho = _medir(func, modelo)
+        print(f"  {rotulo:30} {dt:8.2f} s  saída {tamanho / 2**20:7.1f} MiB  pico alocado {pico / 2**20:7.1f} MiB")
+
+if __name__ == "__main__":
+    main()
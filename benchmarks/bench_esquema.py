@@ -0,0 +1,74 @@
+"""
+Benchmark de memória e vazão da coluna de IP normalizada.
+
+Compara o frame antigo (IP e arquivo de origem como str em colunas object,
+Time como texto) com a categórica de IPs canônicos de analise.esquema
+(normalizar_ips, usada pelo extrator Time/IP): memória (deep) e tempo de
+value_counts/nunique.
+
+Uso (na raiz do repositório):
+    python -m benchmarks.bench_esquema [--linhas 5000000] [--distintos 200000]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from analise import esquema
+
+def gerar_frame(linhas: int, distintos: int, semente: int = 11) -> pd.DataFrame:
+    rnd = np.random.default_rng(semente)
+    n6 = distintos // 5
+    v4 = [f"{a}.{b}.{c}.{d}" for a, b, c, d in rnd.integers(1, 255, (distintos - n6, 4))]
+    v6 = [f"2804:{a:x}:{b:x}:{c:x}::{d:x}" for a, b, c, d in rnd.integers(0, 0xffff, (n6, 4))]
+    ips = np.array(v4 + v6, dtype=object)
+    # popularidade desigual, como nos registros reais
+    escolhidos = ips[np.minimum(rnd.zipf(1.3, linhas) - 1, len(ips) - 1)]
+    inicio = pd.Timestamp("2024-01-01").value // 10**9
+    tempos = pd.to_datetime(inicio + rnd.integers(0, 180 * 86400, linhas), unit="s")
+    return pd.DataFrame({
+        "Time": tempos.strftime("%Y-%m-%d %H:%M:%S UTC"),
+        "IP Address": escolhidos,
+        "Arquivo": rnd.choice(["records_1.html", "records_2.html", "records_3.html"], linhas),
+    }).astype(object)
+
+def _mib(df: pd.DataFrame) -> float:
+    return df.memory_usage(deep=True, index=False).sum() / 2**20
+
+def _medir(func):
+    t0 = time.perf_counter()
+    resultado = func()
+    return time.perf_counter() - t0, resultado
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--linhas", type=int, default=5_000_000)
+    ap.add_argument("--distintos", type=int, default=200_000)
+    args = ap.parse_args()
+
+    df = gerar_frame(args.linhas, args.distintos)
+    print(f"{args.linhas} linhas, até {args.distintos} IPs distintos")
+
+    t_cat, ips_cat = _medir(lambda: esquema.normalizar_ips(df["IP Address"]))
+    print(f"\n  memória object (3 colunas)      : {_mib(df):9.1f} MiB")
+    print(f"  memória IP categórico           : {_mib(ips_cat.to_frame()):9.1f} MiB"
+          f"  (vs {_mib(df[['IP Address']]):.1f} MiB; conversão {t_cat:.2f} s)")
+
+    print()
+    casos = [
+        ("value_counts astype(str) (antigo)", lambda: df["IP Address"].astype(str).value_counts()),
+        ("nunique astype(str) (antigo)", lambda: df["IP Address"].astype(str).nunique()),
+        ("contar_ips (object)", lambda: esquema.contar_ips(df["IP Address"])),
+        ("contar_ips (categórico)", lambda: esquema.contar_ips(ips_cat)),
+    ]
+    referencia = None
+    for rotulo, func in casos:
+        dt, resultado = _medir(func)
+        referencia = referencia or dt
+        distintos = resultado if isinstance(resultado, int) else len(resultado)
+        print(f"  {rotulo:34} {dt:7.3f} s  {args.linhas / dt:14,.0f} linhas/s  "
+              f"({referencia / dt:5.1f}x)  distintos: {distintos}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark das exportações da aba Exportações (analise.exportacao).
+
+Antes, cada rerun do script gerava os três arquivos em memória (to_excel
+com openpyxl sobre uma cópia do DataFrame, to_csv e to_json inteiros),
+mesmo sem nenhum clique. Aqui cada formato antigo é comparado com o
+escritor em blocos para arquivo temporário, em tempo e pico de memória
+alocada (tracemalloc).
+
+Uso (na raiz do repositório):
+    python -m benchmarks.bench_exportacao [--linhas 200000]
+"""
+import argparse
+import time
+import tracemalloc
+from io import BytesIO
+
+import pandas as pd
+
+from analise import exportacao
+from benchmarks.bench_relatorio import gerar_frame
+
+def _excel_antigo(df):
+    df_copy = df.copy()
+    for col in df_copy.columns:
+        if pd.api.types.is_datetime64_any_dtype(df_copy[col]):
+            if getattr(df_copy[col].dt, "tz", None) is not None:
+                df_copy[col] = df_copy[col].dt.tz_localize(None)
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine="openpyxl") as writer:
+        df_copy.to_excel(writer, index=False)
+    return output.getvalue()
+
+_ANTIGOS = {
+    "xlsx": _excel_antigo,
+    "csv": lambda df: df.to_csv(index=False).encode("utf-8"),
+    "json": lambda df: df.to_json(orient="records", force_ascii=False, date_format="epoch").encode("utf-8"),
+}
+
+def _medir(func):
+    # tempo sem o tracemalloc (que deixa tudo várias vezes mais lento); o pico numa segunda execução
+    t0 = time.perf_counter()
+    func()
+    dt = time.perf_counter() - t0
+    tracemalloc.start()
+    func()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return dt, pico / 2**20
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--linhas", type=int, default=200_000)
+    args = ap.parse_args()
+
+    df = gerar_frame(args.linhas)
+    print(f"{len(df)} linhas x {df.shape[1]} colunas")
+    for formato in ("xlsx", "csv", "json", "ndjson"):
+        antigo = _ANTIGOS.get(formato)
+        linha = f"  {formato:7}"
+        if antigo is not None:
+            dt, pico = _medir(lambda: antigo(df))
+            linha += f" antigo {dt:7.2f} s {pico:8.1f} MiB  "
+        else:
+            linha += " " * 33
+        dt, pico = _medir(lambda: exportacao.exportar(df, formato))
+        print(linha + f"em blocos {dt:7.2f} s {pico:8.1f} MiB")
+
+if __name__ == "__main__":
+    main()
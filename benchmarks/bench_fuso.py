@@ -0,0 +1,80 @@
+"""
+Benchmark da conversão UTC -> America/Sao_Paulo (analise.fuso).
+
+Compara o caminho antigo de teste_2.py (convert_utc_to_brt: fromisoformat
+e -3 h fixas, uma chamada por linha) com iso_utc_para_local (uma leitura,
+conversão e formatação por horário distinto) e com utc_para_local sobre o
+array int64 inteiro. Os horários são sorteados entre --unicos instantes
+de 2016 a 2020 (anos com horário de verão) e repetidos até --linhas.
+
+O resultado novo é conferido contra o pandas (tz_convert + strftime) numa
+amostra; as linhas em que o caminho antigo erra (horário de verão) são
+contadas.
+
+Uso (na raiz do repositório):
+    python -m benchmarks.bench_fuso [--linhas 10000000] [--unicos 100000] [--linhas-antigo 1000000]
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from analise.fuso import FUSO_PADRAO, formatar_iso, iso_utc_para_local, utc_para_local
+
+# ---------- caminho antigo (cópia de teste_2.py) ----------
+def convert_utc_to_brt(utc_str):
+    try:
+        dt = datetime.fromisoformat(utc_str.replace("Z", "+00:00"))
+        return (dt - timedelta(hours=3)).strftime("%Y-%m-%d %H:%M:%S")
+    except:
+        return None
+
+def gerar(linhas: int, unicos: int, semente: int = 5):
+    """(instantes UTC int64 ns, os mesmos em texto ISO "Z"), com `unicos` valores distintos."""
+    rnd = np.random.default_rng(semente)
+    inicio, fim = pd.Timestamp("2016-01-01").value // 10**9, pd.Timestamp("2021-01-01").value // 10**9
+    distintos = rnd.integers(inicio, fim, unicos) * 10**9
+    texto = np.asarray(pd.DatetimeIndex(distintos.view("M8[ns]")).strftime("%Y-%m-%dT%H:%M:%SZ"), dtype=object)
+    escolha = rnd.integers(0, unicos, linhas)
+    return distintos[escolha], texto[escolha]
+
+def _medir(func):
+    t0 = time.perf_counter()
+    resultado = func()
+    return time.perf_counter() - t0, resultado
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--linhas", type=int, default=10_000_000)
+    ap.add_argument("--unicos", type=int, default=100_000, help="horários distintos")
+    ap.add_argument("--linhas-antigo", type=int, default=1_000_000,
+                    help="linhas para o caminho antigo (extrapolado para --linhas; 0 para pular)")
+    args = ap.parse_args()
+
+    ns, texto = gerar(args.linhas, args.unicos)
+    print(f"{args.linhas} horários, {args.unicos} distintos, fuso {FUSO_PADRAO}")
+    if args.linhas_antigo:
+        n = min(args.linhas_antigo, args.linhas)
+        dt, antigo = _medir(lambda: [convert_utc_to_brt(s) for s in texto[:n]])
+        print(f"  {'convert_utc_to_brt por linha':34}: {dt:7.2f} s ({n} linhas)  "
+              f"~{dt * args.linhas / n:7.2f} s para {args.linhas}  {n / dt / 1e6:6.2f} M linhas/s")
+    dt, novo = _medir(lambda: iso_utc_para_local(texto))
+    print(f"  {'iso_utc_para_local (texto)':34}: {dt:7.2f} s  {args.linhas / dt / 1e6:6.2f} M linhas/s")
+    dt, locais = _medir(lambda: utc_para_local(ns))
+    print(f"  {'utc_para_local (int64)':34}: {dt:7.2f} s  {args.linhas / dt / 1e6:6.2f} M linhas/s")
+    dt, _ = _medir(lambda: formatar_iso(locais))
+    print(f"  {'formatar_iso (int64 -> texto)':34}: {dt:7.2f} s  {args.linhas / dt / 1e6:6.2f} M linhas/s")
+
+    amostra = slice(0, min(200_000, args.linhas))
+    esperado = (pd.to_datetime(pd.Series(texto[amostra]), utc=True).dt.tz_convert(FUSO_PADRAO)
+                .dt.strftime("%Y-%m-%d %H:%M:%S").to_numpy(dtype=object))
+    assert (novo[amostra] == esperado).all(), "iso_utc_para_local difere do pandas"
+    assert (formatar_iso(locais[amostra]) == esperado).all(), "utc_para_local difere do pandas"
+    if args.linhas_antigo:
+        erradas = int((np.asarray(antigo, dtype=object) != novo[:len(antigo)]).sum())
+        print(f"  caminho antigo: {erradas} de {len(antigo)} linhas com 1 h a menos (horário de verão)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark dos gráficos do relatório (analise.graficos).
+
+Compara o desenho antigo (pyplot na thread do script, uma vez para o ramo
+HTML/TXT/DOCX e outra para o PDF) com o pedido ao pool (frio) e com o
+relatório regerado sobre os mesmos dados (cache quente: nenhum desenho).
+Confere que os PNG são os mesmos bytes.
+
+Uso (na raiz do repositório):
+    python -m benchmarks.bench_graficos [--linhas 1000000] [--processos 2]
+"""
+import argparse
+import time
+from io import BytesIO
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from analise import graficos, relatorio
+from benchmarks.bench_relatorio import gerar_frame
+
+def _png_antigo(fig):
+    buf = BytesIO()
+    fig.savefig(buf, format="png", bbox_inches="tight", dpi=180)
+    plt.close(fig)
+    return buf.getvalue()
+
+def _graficos_antigos(por_dia, contagem_ips):
+    fig, ax = plt.subplots()
+    ax.plot(por_dia.index.date, por_dia.values, marker="o")
+    ax.set_title("Linha do tempo de eventos por dia")
+    ax.set_xlabel("Data")
+    ax.set_ylabel("Quantidade de eventos")
+    ax.grid(True, linewidth=0.3)
+    timeline = _png_antigo(fig)
+    cont = contagem_ips.head(10)
+    fig, ax = plt.subplots()
+    cont.plot(kind="barh", ax=ax)
+    ax.invert_yaxis()
+    ax.set_title(f"Top {min(10, len(cont))} IPs por frequência")
+    ax.set_xlabel("Ocorrências")
+    return timeline, _png_antigo(fig)
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--linhas", type=int, default=1_000_000)
+    ap.add_argument("--processos", type=int, default=2)
+    args = ap.parse_args()
+
+    estado = relatorio.atualizar_agregados(gerar_frame(args.linhas))
+    por_dia, contagem_ips = estado.por_dia(), estado.por_ip()
+    pedidos = [graficos.pedido_timeline(por_dia), graficos.pedido_top_ips(contagem_ips)]
+
+    t0 = time.perf_counter()
+    for _ in ("html/txt/docx", "pdf"):
+        antigos = _graficos_antigos(por_dia, contagem_ips)
+    t_antigo = time.perf_counter() - t0
+
+    graficos._executor(args.processos).submit(int).result()  # pool já de pé, como no servidor
+    cache = graficos.CacheGraficos()
+    t0 = time.perf_counter()
+    frios = graficos.coletar(graficos.solicitar(pedidos, cache), pedidos)
+    t_frio = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    quentes = graficos.coletar(graficos.solicitar(pedidos, cache), pedidos)
+    t_quente = time.perf_counter() - t0
+    assert list(antigos) == frios == quentes, "PNG diferentes"
+
+    print(f"{args.linhas} linhas, {len(por_dia)} dias")
+    print(f"  pyplot, 2x por relatório (antigo) : {t_antigo:7.3f} s")
+    print(f"  pool, cache frio                  : {t_frio:7.3f} s")
+    print(f"  mesmos dados, cache quente        : {t_quente * 1000:7.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark dos hashes de evidência.
+
+Compara o SHA-512 antigo do upload (f.getvalue() inteiro em memória e um
+único update) com analise.hashing.hash_arquivo (leitura em blocos), mede o
+hash em árvore (hash_arvore, folhas em paralelo; digest DIFERENTE do SHA-512
+do arquivo) com 1 e N threads, e o hash dos registros normalizados
+(hash_dataframe) em linhas/s. Pico de memória alocada via tracemalloc.
+
+Uso (na raiz do repositório):
+    python -m benchmarks.bench_hash [--mib 512] [--linhas 1000000] [--threads 4]
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from analise.hashing import gerar_hash, hash_arquivo, hash_arvore, hash_dataframe
+from benchmarks.bench_relatorio import gerar_frame
+
+def _hash_antigo(caminho):
+    with open(caminho, "rb") as f:
+        return gerar_hash(f.read(), "sha512")
+
+def _medir(func):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    resultado = func()
+    dt = time.perf_counter() - t0
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return dt, pico, resultado
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--mib", type=int, default=512, help="tamanho do arquivo sintético")
+    ap.add_argument("--linhas", type=int, default=1_000_000)
+    ap.add_argument("--threads", type=int, default=os.cpu_count() or 1)
+    args = ap.parse_args()
+
+    with tempfile.NamedTemporaryFile(delete=False) as tmp:
+        for _ in range(args.mib):
+            tmp.write(os.urandom(1 << 20))
+    try:
+        casos = [
+            ("SHA-512 antigo (read inteiro)", lambda: _hash_antigo(tmp.name)),
+            ("hash_arquivo (blocos)", lambda: hash_arquivo(tmp.name)),
+            ("hash_arvore, 1 thread", lambda: hash_arvore(tmp.name, max_workers=1)),
+            (f"hash_arvore, {args.threads} threads", lambda: hash_arvore(tmp.name, max_workers=args.threads)),
+        ]
+        print(f"arquivo de {args.mib} MiB")
+        digests = {}
+        for rotulo, func in casos:
+            dt, pico, digest = _medir(func)
+            digests[rotulo] = digest
+            print(f"  {rotulo:32} {dt:7.2f} s  {args.mib / dt:8.1f} MiB/s  pico alocado {pico / 2**20:7.1f} MiB")
+        assert digests[casos[0][0]] == digests[casos[1][0]], "hash_arquivo difere do SHA-512 do arquivo"
+        assert digests[casos[2][0]] == digests[casos[3][0]], "hash_arvore depende do número de threads"
+    finally:
+        os.unlink(tmp.name)
+
+    df = gerar_frame(args.linhas)
+    dt, pico, _ = _medir(lambda: hash_dataframe(df))
+    print(f"  {'hash_dataframe':32} {dt:7.2f} s  {args.linhas / dt:10.0f} linhas/s  pico alocado {pico / 2**20:7.1f} MiB")
+
+if __name__ == "__main__":
+    main()
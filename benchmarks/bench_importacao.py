@@ -0,0 +1,99 @@
+"""
+Benchmark e orçamento do tempo de importação (início a frio do dashboard).
+
+Cada cenário roda num processo novo com `python -X importtime`. As
+importações de base (streamlit e pandas, inevitáveis) são feitas antes e
+ficam de fora: o tempo de um cenário é a soma dos tempos cumulativos dos
+módulos que ele importa depois delas. Cenários:
+
+- atual: as importações do topo de teste_novo5.py, tiradas do próprio
+  script (uma importação pesada adicionada lá aparece aqui);
+- antigo: as mesmas + os pacotes que o dashboard importava no topo antes
+  do carregamento adiado (matplotlib.pyplot, plotly.express, reportlab,
+  python-docx, pypdf, pyarrow, xlsxwriter, lxml, chardet).
+
+Sai com código 1 se a mediana do cenário atual passar do orçamento
+(--orcamento, em ms) ou se algum pacote pesado for importado nele: serve
+como teste de regressão.
+
+Uso (na raiz do repositório):
+    python -m benchmarks.bench_importacao [--repeticoes 5] [--orcamento 150]
+"""
+import argparse
+import ast
+import os
+import statistics
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(RAIZ, "teste_novo5.py")
+BASE = "import streamlit, pandas"
+PESADOS = ("matplotlib", "plotly", "reportlab", "docx", "pypdf", "pyarrow", "xlsxwriter", "lxml", "chardet",
+           "python_calamine")
+IMPORTACOES_ANTIGAS = ("import matplotlib.pyplot, plotly.express, reportlab.platypus, docx, pypdf, "
+                       "pyarrow.parquet, xlsxwriter, lxml.etree, chardet")
+_MARCA = "#bench_importacao"
+
+def importacoes_do_script(caminho: str = SCRIPT) -> str:
+    """As instruções import/from do nível de módulo do script, na ordem."""
+    with open(caminho, encoding="utf-8") as fh:
+        fonte = fh.read()
+    return "\n".join(ast.get_source_segment(fonte, no) for no in ast.parse(fonte).body
+                     if isinstance(no, (ast.Import, ast.ImportFrom)))
+
+def medir(importacoes: str) -> tuple[float, list[str]]:
+    """(ms das importações depois da base, pacotes de PESADOS importados por elas)."""
+    codigo = "\n".join([
+        BASE,
+        "import sys",
+        "_antes = set(sys.modules)",
+        f"print({_MARCA!r}, file=sys.stderr)",
+        importacoes,
+        "print(' '.join(sorted({n.split('.')[0] for n in set(sys.modules) - _antes})))",
+    ])
+    r = subprocess.run([sys.executable, "-X", "importtime", "-c", codigo],
+                       capture_output=True, text=True, cwd=RAIZ, check=True)
+    erro = r.stderr.splitlines()
+    total_us = 0
+    for linha in erro[erro.index(_MARCA) + 1:]:
+        if not linha.startswith("import time:") or "cumulative" in linha:
+            continue
+        _, cumulativo, nome = linha[len("import time:"):].split("|")
+        if not nome[1:].startswith(" "):  # só os do primeiro nível (os aninhados já estão no cumulativo)
+            total_us += int(cumulativo)
+    novos = r.stdout.split()
+    return total_us / 1000, [p for p in PESADOS if p in novos]
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--repeticoes", type=int, default=5)
+    ap.add_argument("--orcamento", type=float, default=150.0, help="ms do cenário atual (mediana)")
+    args = ap.parse_args()
+
+    atual = importacoes_do_script()
+    cenarios = {"antigo (importações no topo)": atual + "\n" + IMPORTACOES_ANTIGAS,
+                "atual (carregamento adiado)": atual}
+    medianas, pesados = {}, {}
+    for rotulo, importacoes in cenarios.items():
+        tempos = []
+        for _ in range(args.repeticoes):
+            ms, pesados[rotulo] = medir(importacoes)
+            tempos.append(ms)
+        medianas[rotulo] = statistics.median(tempos)
+        print(f"  {rotulo:30}: mediana {medianas[rotulo]:7.1f} ms  (mín {min(tempos):7.1f})  "
+              f"pesados: {', '.join(pesados[rotulo]) or '-'}")
+
+    rotulo = "atual (carregamento adiado)"
+    falhas = []
+    if medianas[rotulo] > args.orcamento:
+        falhas.append(f"{medianas[rotulo]:.1f} ms acima do orçamento de {args.orcamento:.0f} ms")
+    if pesados[rotulo]:
+        falhas.append(f"importados no início: {', '.join(pesados[rotulo])}")
+    if falhas:
+        print("FALHOU: " + "; ".join(falhas))
+        sys.exit(1)
+    print(f"OK: dentro do orçamento de {args.orcamento:.0f} ms")
+
+if __name__ == "__main__":
+    main()
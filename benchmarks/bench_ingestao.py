@@ -0,0 +1,153 @@
+"""
+Benchmark da ingestão de HTML (WhatsApp Business Record).
+
+Compara o caminho antigo do ler_arquivo (BeautifulSoup + pd.read_html, com o
+documento analisado três ou quatro vezes) com a passagem única de
+analise.ingestao.analisar_html, lendo o arquivo em blocos. Mede tempo de
+parede e pico de memória (tracemalloc). Com --escala, mostra como o pico do
+extrator Time/IP cresce com o tamanho da entrada.
+
+Uso (na raiz do repositório):
+    python -m benchmarks.bench_ingestao [--registros 200000] [arquivo.html ...]
+    python -m benchmarks.bench_ingestao --escala 50000 100000 200000
+"""
+import argparse
+import random
+import time
+import tracemalloc
+from io import BytesIO, StringIO
+
+import pandas as pd
+from bs4 import BeautifulSoup
+
+from analise import ingestao
+
+# ---------- corpus sintético ----------
+def gerar_wa_html(registros: int, semente: int = 42) -> str:
+    rnd = random.Random(semente)
+    partes = [
+        "<html><head><meta charset='utf-8'><title>WhatsApp Business Record</title></head><body>",
+        "<div><div>Service</div><div>WhatsApp</div></div>",
+        "<div><div>Account Identifier</div><div>+55 11 99999-0000</div></div>",
+        "<div><div>Account Type</div><div>WhatsApp</div></div>",
+        "<div><div>Generated</div><div>2024-01-10 12:00:00 UTC</div></div>",
+        "<div><div>Date Range</div><div>2023-01-01 00:00:00 UTC to 2024-01-01 00:00:00 UTC</div></div>",
+        "<div><div>Ip Addresses Definition</div><div>IP addresses used by the account</div></div>",
+        "<div><div>IP Addresses</div>",
+    ]
+    base = pd.Timestamp("2023-01-01", tz="UTC").value // 10**9
+    for i in range(registros):
+        if i and i % 500 == 0:
+            partes.append(f"<div class='pg'>WhatsApp Business Record Page {i // 500}</div>")
+        ts = pd.Timestamp(base + rnd.randrange(365 * 86400), unit="s", tz="UTC")
+        ip = f"{rnd.randrange(1, 255)}.{rnd.randrange(256)}.{rnd.randrange(256)}.{rnd.randrange(256)}"
+        partes.append(
+            f"<div><div>Time</div><div>{ts.strftime('%Y-%m-%d %H:%M:%S')} UTC</div>"
+            f"<div>IP Address</div><div>{ip}</div></div>"
+        )
+    partes.append("</div></body></html>")
+    return "\n".join(partes)
+
+# ---------- caminho antigo (referência) ----------
+def _parse_text_time_ip_antigo(text: str):
+    soup = BeautifulSoup(text, "html.parser")
+    plain = soup.get_text(separator="\n")
+    lines = [ln.strip() for ln in plain.splitlines()]
+    skip_prefixes = ("WhatsApp Business Record Page",)
+    clean = [ln for ln in lines if ln and not any(ln.startswith(p) for p in skip_prefixes)]
+
+    records = []
+    current = {"Time": None, "IP Address": None}
+    i, n = 0, len(clean)
+    while i < n:
+        token = clean[i]
+        if token.lower() == "time":
+            if i + 1 < n:
+                current["Time"] = clean[i + 1]; i += 1
+        elif token.lower() in ("ip address", "ip addresses", "ipaddress", "ip"):
+            if i + 1 < n:
+                current["IP Address"] = clean[i + 1]; i += 1
+        if current["Time"] and current["IP Address"]:
+            records.append({"Time": current["Time"], "IP Address": current["IP Address"]})
+            current = {"Time": None, "IP Address": None}
+        i += 1
+
+    if not records:
+        return None
+    df = pd.DataFrame(records, columns=["Time", "IP Address"])
+    df["Time"] = pd.to_datetime(df["Time"], errors="coerce", utc=True)
+    return df
+
+def _caminho_antigo(text: str):
+    soup = BeautifulSoup(text, "html.parser")
+    plain = soup.get_text(separator="\n")
+    lines = [ln.strip() for ln in plain.splitlines() if ln.strip()]
+    wa_doc = ingestao._parse_whatsapp_business_record(lines)
+
+    soup = BeautifulSoup(text, "html.parser")
+    if soup.find("table"):
+        tables = pd.read_html(StringIO(text), flavor="bs4")
+        if tables:
+            return wa_doc, tables[0]
+
+    return wa_doc, _parse_text_time_ip_antigo(text)
+
+def _caminho_novo(raw: bytes):
+    doc = ingestao.analisar_html(BytesIO(raw), "utf-8")
+    return doc["wa_doc"], (doc["tabelas"][0] if doc["tabelas"] else doc["time_ip"])
+
+def _mesmo_resultado(a, b) -> bool:
+    if a is None or b is None:
+        return a is None and b is None
+    if "Time" in a.columns and "Time" in b.columns:
+        a = a.assign(Time=a["Time"].astype("datetime64[ns, UTC]"))
+        b = b.assign(Time=b["Time"].astype("datetime64[ns, UTC]"))
+    return a.equals(b)
+
+def medir(func, *args):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    resultado = func(*args)
+    dt = time.perf_counter() - t0
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return resultado, dt, pico
+
+def escala(tamanhos):
+    print("Pico de memória do caminho novo por tamanho de entrada (arquivo lido em blocos):")
+    for registros in tamanhos:
+        raw = gerar_wa_html(registros).encode("utf-8")
+        _, dt, pico = medir(_caminho_novo, raw)
+        print(f"  {registros:>9} registros  {len(raw) / 2**20:8.1f} MiB  {dt:7.2f} s  "
+              f"pico {pico / 2**20:7.1f} MiB  ({pico / registros:5.1f} B/registro)")
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("arquivos", nargs="*", help="HTMLs reais; sem argumentos usa corpus sintético")
+    ap.add_argument("--registros", type=int, default=50_000)
+    ap.add_argument("--escala", type=int, nargs="+", metavar="N",
+                    help="mede apenas o caminho novo para cada quantidade de registros")
+    args = ap.parse_args()
+
+    if args.escala:
+        escala(args.escala)
+        return
+
+    if args.arquivos:
+        corpus = [(p, open(p, "rb").read()) for p in args.arquivos]
+    else:
+        corpus = [(f"sintético ({args.registros} registros)", gerar_wa_html(args.registros).encode("utf-8"))]
+
+    print(f"lxml disponível: {ingestao.LXML_OK}")
+    for nome, raw in corpus:
+        text = raw.decode("utf-8", errors="replace")
+        print(f"\n{nome}: {len(raw) / 2**20:.1f} MiB")
+        (wa_a, df_a), t_a, m_a = medir(_caminho_antigo, text)
+        (wa_n, df_n), t_n, m_n = medir(_caminho_novo, raw)
+        iguais = wa_a == wa_n and _mesmo_resultado(df_a, df_n)
+        print(f"  antigo : {t_a:8.2f} s  pico {m_a / 2**20:8.1f} MiB")
+        print(f"  novo   : {t_n:8.2f} s  pico {m_n / 2**20:8.1f} MiB")
+        print(f"  ganho  : {t_a / t_n:8.1f}x tempo, {m_a / max(m_n, 1):.1f}x memória; resultados iguais: {iguais}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark de páginas/s e memória do PDF do relatório policial.
+
+Compara o caminho antigo (uma única Table do reportlab com todas as linhas
+e ROWBACKGROUNDS sobre a tabela inteira) com analise.relatorio.renderizar_pdf
+(sub-tabelas do tamanho de uma página geradas sob demanda), em um processo
+e em vários processos com junção via pypdf. Cada caso roda num processo
+novo, para que o pico de memória (ru_maxrss) seja só dele.
+
+Uso (na raiz do repositório):
+    python -m benchmarks.bench_pdf [--linhas 200000] [--linhas-antigo 20000] [--processos 4]
+"""
+import argparse
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+import matplotlib
+matplotlib.use("Agg")
+
+from analise import relatorio, relatorio_pdf
+from benchmarks.bench_relatorio import gerar_frame
+
+def _pdf_antigo(modelo) -> bytes:
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle
+
+    tabela_full = modelo.tabela
+    data = [list(tabela_full.columns)] + tabela_full.astype(str).values.tolist()
+    tbl = Table(data, colWidths=[150, 350])
+    tbl.setStyle(TableStyle([
+        ("BACKGROUND", (0,0), (-1,0), colors.lightgrey),
+        ("FONTNAME", (0,0), (-1,-1), "Helvetica"),
+        ("FONTSIZE", (0,0), (-1,-1), 9),
+        ("GRID", (0,0), (-1,-1), 0.25, colors.grey),
+        ("ROWBACKGROUNDS", (0,1), (-1,-1), [colors.whitesmoke, colors.white]),
+    ]))
+    bio = BytesIO()
+    doc = SimpleDocTemplate(bio, pagesize=A4, leftMargin=36, rightMargin=36,
+                            topMargin=relatorio_pdf._TOPO_PDF, bottomMargin=36)
+    doc.build([tbl], onFirstPage=relatorio_pdf._header_footer, onLaterPages=relatorio_pdf._header_footer)
+    return bio.getvalue()
+
+def _caso(args):
+    rotulo, linhas, processos = args
+    modelo = relatorio.montar_modelo(gerar_frame(linhas), None, False, {"Nº do Procedimento/BO": "0"})
+    t0 = time.perf_counter()
+    if rotulo == "antigo":
+        pdf = _pdf_antigo(modelo)
+    else:
+        pdf = relatorio.renderizar_pdf(modelo, processos=processos)
+    dt = time.perf_counter() - t0
+    paginas = pdf.count(b"/Type /Page") - pdf.count(b"/Type /Pages")
+    return paginas, dt, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--linhas", type=int, default=200_000)
+    ap.add_argument("--linhas-antigo", type=int, default=20_000,
+                    help="linhas para o caminho antigo (0 para pular; cresce de forma superlinear)")
+    ap.add_argument("--processos", type=int, default=4)
+    args = ap.parse_args()
+
+    casos = []
+    if args.linhas_antigo:
+        casos.append(("antigo", args.linhas_antigo, 1))
+    casos.append(("sub-tabelas, 1 processo", args.linhas, 1))
+    if relatorio.PYPDF_OK and args.processos > 1:
+        casos.append((f"sub-tabelas, {args.processos} processos", args.linhas, args.processos))
+
+    for caso in casos:
+        with ProcessPoolExecutor(max_workers=1) as ex:
+            paginas, dt, pico = ex.submit(_caso, caso).result()
+        print(f"  {caso[0]:28} {caso[1]:>9} linhas  {paginas:6} páginas  {dt:8.2f} s  "
+              f"{paginas / dt:7.1f} páginas/s  pico {pico:7.0f} MiB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark da redução dos gráficos Plotly (analise.reducao).
+
+Compara o tamanho do JSON enviado ao navegador (fig.to_json) e o tempo de
+montar a figura entre o gráfico com todas as linhas (como era antes) e o
+gráfico com os dados reduzidos no servidor: histograma pré-agrupado, linhas
+por LTTB e por mín./máx. e barras com Top-N + "Outros".
+
+Uso (na raiz do repositório):
+    python -m benchmarks.bench_reducao [--linhas 1000000] [--orcamento 5000]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+from analise import reducao
+
+def _medir(func):
+    t0 = time.perf_counter()
+    fig = func()
+    payload = len(fig.to_json())
+    return time.perf_counter() - t0, payload
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--linhas", type=int, default=1_000_000)
+    ap.add_argument("--orcamento", type=int, default=reducao.ORCAMENTO_PONTOS)
+    args = ap.parse_args()
+
+    rnd = np.random.default_rng(7)
+    df = pd.DataFrame({
+        "valor": np.cumsum(rnd.normal(size=args.linhas)),
+        "ruido": rnd.normal(size=args.linhas),
+        "categoria": pd.Series(rnd.zipf(1.3, args.linhas).astype(str), dtype=object),
+    })
+
+    def _hist():
+        faixas = reducao.histograma(df["valor"], 10, args.orcamento)
+        return px.bar(faixas, x="centro", y="contagem")
+
+    def _linhas(metodo):
+        return px.line(reducao.reduzir_linhas(df[["valor", "ruido"]], args.orcamento, metodo),
+                       x="index", y="value", color="variable")
+
+    def _barras():
+        contagem = reducao.top_n_com_outros(df["categoria"].value_counts()).reset_index()
+        contagem.columns = ["categoria", "Contagem"]
+        return px.bar(contagem, x="categoria", y="Contagem")
+
+    def _barras_antigas():
+        contagem = df["categoria"].value_counts().reset_index()
+        contagem.columns = ["categoria", "Contagem"]
+        return px.bar(contagem, x="categoria", y="Contagem")
+
+    casos = [
+        ("histograma", lambda: px.histogram(df, x="valor", nbins=10), _hist),
+        ("linha (LTTB)", lambda: px.line(df[["valor", "ruido"]]), lambda: _linhas("lttb")),
+        ("linha (mín./máx.)", lambda: px.line(df[["valor", "ruido"]]), lambda: _linhas("minmax")),
+        ("barras", _barras_antigas, _barras),
+    ]
+    print(f"{args.linhas} linhas, orçamento {args.orcamento} pontos")
+    for rotulo, antigo, novo in casos:
+        dt_antigo, kb_antigo = _medir(antigo)
+        dt_novo, kb_novo = _medir(novo)
+        print(f"  {rotulo:18} completo {kb_antigo / 1024:10.0f} KiB {dt_antigo:7.3f} s   "
+              f"reduzido {kb_novo / 1024:7.0f} KiB {dt_novo:7.3f} s")
+
+if __name__ == "__main__":
+    main()
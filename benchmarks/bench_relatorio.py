@@ -0,0 +1,132 @@
+"""
+Benchmark da geração do relatório policial.
+
+Antes, gerar_relatorio_html_txt_docx e gerar_relatorio_pdf refaziam cada
+um a detecção de colunas, o resumo dos achados (dois pd.to_datetime +
+value_counts), o hash, os dois gráficos e a tabela completa — esta última
+ainda uma vez a mais no ramo DOCX. Aqui a sequência antiga de análise é
+comparada com analise.relatorio.montar_modelo (uma passagem só); os
+renderizadores, que são os mesmos nos dois casos, são medidos à parte.
+
+Uso (na raiz do repositório):
+    python -m benchmarks.bench_relatorio [--linhas 1000000] [--formatos html,txt]
+"""
+import argparse
+import json
+import time
+from datetime import datetime
+from io import BytesIO
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from analise import relatorio
+from analise.hashing import gerar_hash
+
+# ---------- análise antiga (cópia da versão anterior do script) ----------
+
+def _fig_to_png_bytes(fig):
+    buf = BytesIO()
+    fig.savefig(buf, format="png", bbox_inches="tight", dpi=180)
+    plt.close(fig)
+    return buf.getvalue()
+
+def _grafico_timeline_antigo(df, col_tempo):
+    serie = pd.to_datetime(df[col_tempo], errors="coerce").dropna()
+    if serie.empty:
+        return None
+    por_dia = serie.dt.date.value_counts().sort_index()
+    fig, ax = plt.subplots()
+    ax.plot(por_dia.index, por_dia.values, marker="o")
+    return _fig_to_png_bytes(fig)
+
+def _grafico_top_ips_antigo(df, col_ip, top_n=10):
+    cont = df[col_ip].astype(str).value_counts().head(top_n)
+    if cont.empty:
+        return None
+    fig, ax = plt.subplots()
+    cont.plot(kind="barh", ax=ax)
+    ax.invert_yaxis()
+    return _fig_to_png_bytes(fig)
+
+def _tabela_antiga(df):
+    col_tempo, col_ip = relatorio._guess_colunas(df)
+    base = df[[col_tempo, col_ip]].copy()
+    serie = pd.to_datetime(base[col_tempo], errors="coerce", utc=True).dt.tz_convert("America/Sao_Paulo")
+    base["__time"] = serie
+    base = base.dropna(subset=["__time", col_ip]).sort_values("__time", ascending=False)
+    base["Time (America/Sao_Paulo)"] = base["__time"].dt.strftime("%d/%m/%Y %H:%M:%S")
+    base = base[["Time (America/Sao_Paulo)", col_ip]].rename(columns={col_ip: "IP Address"})
+    return base.reset_index(drop=True)
+
+def _resumo_antigo(df, col_tempo, col_ip):
+    serie = pd.to_datetime(df[col_tempo], errors="coerce", utc=True).dt.tz_convert("America/Sao_Paulo")
+    tmin, tmax = serie.min(), serie.max()
+    periodo_txt = f"{tmin.strftime('%d/%m/%Y %H:%M:%S')} a {tmax.strftime('%d/%m/%Y %H:%M:%S')}"
+    achados = [f"Endereços IP distintos identificados: {df[col_ip].astype(str).nunique(dropna=True)}."]
+    top_ips = df[col_ip].astype(str).value_counts().head(5)
+    achados.append("; ".join(f"{idx} ({val})" for idx, val in top_ips.items()))
+    return periodo_txt, achados
+
+def _analise_antiga(df, metadados, renderizar_docx: bool):
+    # uma rodada por gerar_relatorio_html_txt_docx e outra por gerar_relatorio_pdf
+    for rodada in ("html/txt/docx", "pdf"):
+        df_rel = df.copy()
+        col_tempo, col_ip = relatorio._guess_colunas(df_rel)
+        periodo_txt, _ = _resumo_antigo(df_rel, col_tempo, col_ip)
+        payload = json.dumps({"metadados": metadados, "periodo": periodo_txt, "registros": len(df_rel),
+                              "gerado_em": datetime.utcnow().isoformat()}).encode("utf-8")
+        gerar_hash(payload, "sha512")
+        _grafico_timeline_antigo(df_rel, col_tempo)
+        _grafico_top_ips_antigo(df_rel, col_ip)
+        _tabela_antiga(df_rel)
+        if rodada == "html/txt/docx" and renderizar_docx:
+            _tabela_antiga(df_rel)
+
+def gerar_frame(linhas: int, semente: int = 5) -> pd.DataFrame:
+    rnd = np.random.default_rng(semente)
+    inicio = pd.Timestamp("2024-01-01", tz="UTC").value
+    tempos = pd.to_datetime(inicio + rnd.integers(0, 120 * 86400, linhas) * 10**9, utc=True)
+    ips = np.array([f"{a}.{b}.{c}.{d}" for a, b, c, d in rnd.integers(1, 255, (50_000, 4))], dtype=object)
+    return pd.DataFrame({
+        "Time": tempos.tz_convert("America/Sao_Paulo"),
+        "IP Address": ips[np.minimum(rnd.zipf(1.4, linhas) - 1, len(ips) - 1)],
+    })
+
+def _medir(func):
+    t0 = time.perf_counter()
+    resultado = func()
+    return time.perf_counter() - t0, resultado
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--linhas", type=int, default=1_000_000)
+    ap.add_argument("--formatos", default="html,txt",
+                    help="renderizadores medidos (html,txt,docx,pdf); docx/pdf são lentos em tabelas grandes")
+    args = ap.parse_args()
+    formatos = [f for f in args.formatos.split(",") if f]
+
+    df = gerar_frame(args.linhas)
+    metadados = {"Nº do Procedimento/BO": "0000000-00.0000.0.00.0000"}
+    print(f"{args.linhas} linhas")
+
+    t_antigo, _ = _medir(lambda: _analise_antiga(df, metadados, relatorio.DOCX_OK))
+    t_novo, modelo = _medir(lambda: relatorio.montar_modelo(df, None, True, metadados))
+    print(f"  análise antiga (por formato) : {t_antigo:7.2f} s")
+    print(f"  montar_modelo (uma vez)      : {t_novo:7.2f} s  ({t_antigo / t_novo:4.1f}x)")
+
+    renderizadores = {"html": relatorio.renderizar_html, "txt": relatorio.renderizar_txt,
+                      "docx": relatorio.renderizar_docx, "pdf": relatorio.renderizar_pdf}
+    t_render = 0.0
+    for formato in formatos:
+        dt, saida = _medir(lambda: renderizadores[formato](modelo))
+        t_render += dt
+        print(f"  renderizar {formato:5}             : {dt:7.2f} s  ({len(saida or b'') / 2**20:.1f} MiB)")
+    if formatos:
+        print(f"  total antes / depois         : {t_antigo + t_render:7.2f} s / {t_novo + t_render:.2f} s")
+
+if __name__ == "__main__":
+    main()
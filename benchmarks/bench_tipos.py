@@ -0,0 +1,68 @@
+"""
+Benchmark da detecção de colunas de data/hora.
+
+Compara a versão antiga de detectar_colunas_datetime (pd.to_datetime com
+errors='raise' sobre a coluna inteira de cada coluna textual) com
+analise.tipos.detectar_colunas_datetime (sondagem por amostra + formato
+explícito), na primeira chamada e com as decisões já memorizadas.
+
+Uso (na raiz do repositório):
+    python -m benchmarks.bench_tipos [--linhas 1000000]
+"""
+import argparse
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytz
+
+from analise import tipos
+
+def _detectar_antigo(df):
+    fuso = pytz.timezone("America/Sao_Paulo")
+    df = df.copy()
+    for col in df.columns:
+        if df[col].dtype == object or pd.api.types.is_string_dtype(df[col]):
+            try:
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore")
+                    temp = pd.to_datetime(df[col], errors='raise', utc=True)
+                df[col] = temp.dt.tz_convert(fuso)
+            except Exception:
+                pass
+    return df
+
+def gerar_frame(linhas: int, semente: int = 3) -> pd.DataFrame:
+    rnd = np.random.default_rng(semente)
+    inicio = pd.Timestamp("2023-01-01").value // 10**9
+    tempos = pd.to_datetime(inicio + rnd.integers(0, 365 * 86400, linhas), unit="s")
+    ips = np.array([f"{a}.{b}.{c}.{d}" for a, b, c, d in rnd.integers(1, 255, (5000, 4))])
+    return pd.DataFrame({
+        "Time": tempos.strftime("%Y-%m-%d %H:%M:%S UTC"),
+        "IP Address": ips[rnd.integers(0, len(ips), linhas)],
+        "Porta": rnd.integers(1024, 65535, linhas).astype(str),
+        "Observação": rnd.choice(["login", "envio de mensagem", "chamada de voz", "backup"], linhas),
+        "Data BR": tempos.strftime("%d/%m/%Y %H:%M:%S"),
+    }).astype(object)
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--linhas", type=int, default=1_000_000)
+    args = ap.parse_args()
+
+    df = gerar_frame(args.linhas)
+    print(f"{args.linhas} linhas, {df.shape[1]} colunas textuais")
+
+    t0 = time.perf_counter(); antigo = _detectar_antigo(df); t_a = time.perf_counter() - t0
+    tipos._decisoes.clear()
+    t0 = time.perf_counter(); novo = tipos.detectar_colunas_datetime(df); t_n = time.perf_counter() - t0
+    t0 = time.perf_counter(); tipos.detectar_colunas_datetime(df); t_m = time.perf_counter() - t0
+
+    print(f"  antigo             : {t_a:7.2f} s  datas: {[c for c in antigo if hasattr(antigo[c], 'dt')]}")
+    print(f"  novo (1ª chamada)  : {t_n:7.2f} s  datas: {[c for c in novo if hasattr(novo[c], 'dt')]}")
+    print(f"  novo (memorizado)  : {t_m:7.2f} s")
+    print(f"  ganho              : {t_a / t_n:5.1f}x / {t_a / t_m:5.1f}x")
+
+if __name__ == "__main__":
+    main()
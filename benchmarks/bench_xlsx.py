@@ -0,0 +1,68 @@
+"""
+Benchmark da leitura de XLSX com várias abas (analise.leitura_xlsx).
+
+Compara o caminho antigo (pd.read_excel, que monta cada aba inteira como
+lista de listas antes do DataFrame; aqui com sheet_name=None para ler todas
+as abas) com iter_planilhas (openpyxl read-only, ou calamine se
+instalado, convertido em blocos de linhas). Mede tempo e pico de memória
+alocada (tracemalloc, numa segunda execução) e confere que os frames são
+iguais.
+
+Uso (na raiz do repositório):
+    python -m benchmarks.bench_xlsx [--linhas 100000] [--abas 3]
+"""
+import argparse
+import time
+import tracemalloc
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from analise import leitura_xlsx
+
+def gerar_xlsx(linhas: int, abas: int, semente: int = 3) -> bytes:
+    rnd = np.random.default_rng(semente)
+    bio = BytesIO()
+    with pd.ExcelWriter(bio, engine="xlsxwriter") as writer:
+        for n in range(abas):
+            inicio = pd.Timestamp("2024-01-01").value // 10**9
+            pd.DataFrame({
+                "Data/Hora": pd.to_datetime(inicio + rnd.integers(0, 90 * 86400, linhas), unit="s"),
+                "IP": [f"10.{a}.{b}.{c}" for a, b, c in rnd.integers(0, 255, (linhas, 3))],
+                "Porta": rnd.integers(1024, 65535, linhas),
+                "Bytes": rnd.random(linhas) * 1e6,
+                "Operadora": rnd.choice(["Vivo", "Claro", "TIM"], linhas),
+            }).to_excel(writer, sheet_name=f"Pagina {n + 1}", index=False)
+    return bio.getvalue()
+
+def _medir(func):
+    t0 = time.perf_counter()
+    resultado = func()
+    dt = time.perf_counter() - t0
+    tracemalloc.start()
+    func()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return dt, pico / 2**20, resultado
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--linhas", type=int, default=100_000, help="linhas por aba")
+    ap.add_argument("--abas", type=int, default=3)
+    args = ap.parse_args()
+
+    raw = gerar_xlsx(args.linhas, args.abas)
+    print(f"{args.abas} abas x {args.linhas} linhas ({len(raw) / 2**20:.1f} MiB)")
+    dt_antigo, pico_antigo, antigo = _medir(lambda: pd.read_excel(BytesIO(raw), sheet_name=None))
+    dt_novo, pico_novo, novo = _medir(lambda: dict(leitura_xlsx.iter_planilhas(BytesIO(raw))))
+    assert list(antigo) == list(novo)
+    for aba in antigo:
+        pd.testing.assert_frame_equal(antigo[aba], novo[aba])
+    motor = "calamine" if leitura_xlsx.CALAMINE_OK else "openpyxl read-only"
+    for rotulo, dt, pico in (("pd.read_excel (todas as abas)", dt_antigo, pico_antigo),
+                             (f"iter_planilhas ({motor})", dt_novo, pico_novo)):
+        print(f"  {rotulo:38}: {dt:7.2f} s  pico {pico:8.1f} MiB")
+
+if __name__ == "__main__":
+    main()
@@ -1,43 +1,47 @@
 import streamlit as st
-from bs4 import BeautifulSoup
 import pandas as pd
-import re
-from datetime import datetime, timedelta
-
-def convert_utc_to_brt(utc_str):
-    try:
-        dt = datetime.fromisoformat(utc_str.replace("Z", "+00:00"))
-        return (dt - timedelta(hours=3)).strftime("%Y-%m-%d %H:%M:%S")
-    except:
-        return None
-
-def extract_data(html_content):
-    soup = BeautifulSoup(html_content, "html.parser")
-    text = soup.get_text(" ")
-    phones = re.findall(r'\+?\d{1,3}[\s\-]?\(?\d{2,3}\)?[\s\-]?\d{4,5}[\s\-]?\d{4}', text)
-    ipv4_matches = re.findall(r'((?:\d{1,3}\.){3}\d{1,3}).{0,40}?(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z)', text)
-    ipv6_matches = re.findall(r'((?:[A-F0-9]{1,4}:){7}[A-F0-9]{1,4}).{0,40}?(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z)', text, re.IGNORECASE)
-    ipv4 = [(ip, ts, convert_utc_to_brt(ts)) for ip, ts in ipv4_matches]
-    ipv6 = [(ip, ts, convert_utc_to_brt(ts)) for ip, ts in ipv6_matches]
-    return phones, ipv4, ipv6
+
+from analise.artefatos import extrair_artefatos_html
+from analise.codificacao import detectar_encoding
+from analise.fuso import FUSO_PADRAO, iso_utc_para_local
+
+COLUNA_LOCAL = f"Data/Hora ({FUSO_PADRAO})"
+
+def extract_data(html_file):
+    # texto do HTML lido em blocos e varrido numa passagem só (telefones, e-mails, IMEIs, IPs + horário)
+    artefatos = extrair_artefatos_html(html_file, detectar_encoding(html_file))
+    return artefatos["telefones"], artefatos["ipv4"], artefatos["ipv6"], artefatos["emails"], artefatos["imeis"]
+
+def tabela_ips(pares, coluna_ip):
+    df = pd.DataFrame(pares, columns=[coluna_ip, "Data/Hora UTC"])
+    # fuso pelas regras do tz database (com o horário de verão antigo), uma conversão por horário distinto
+    df[COLUNA_LOCAL] = iso_utc_para_local(df["Data/Hora UTC"])
+    return df
 
 st.title("Relatório Policial Automático")
 files = st.file_uploader("Carregar arquivos HTML", type="html", accept_multiple_files=True)
 
 if files:
-    all_phones, all_ipv4, all_ipv6 = [], [], []
+    all_phones, all_ipv4, all_ipv6, all_emails, all_imeis = [], [], [], [], []
     for f in files:
-        content = f.read().decode("utf-8")
-        phones, ipv4, ipv6 = extract_data(content)
+        phones, ipv4, ipv6, emails, imeis = extract_data(f)
         all_phones.extend(phones)
         all_ipv4.extend(ipv4)
         all_ipv6.extend(ipv6)
+        all_emails.extend(emails)
+        all_imeis.extend(imeis)
 
     st.subheader("Telefones")
     st.dataframe(pd.DataFrame(list(set(all_phones)), columns=["Telefone"]))
 
+    st.subheader("E-mails")
+    st.dataframe(pd.DataFrame(list(dict.fromkeys(all_emails)), columns=["E-mail"]))
+
+    st.subheader("IMEIs")
+    st.dataframe(pd.DataFrame(list(dict.fromkeys(all_imeis)), columns=["IMEI"]))
+
     st.subheader("IPv4 e horários")
-    st.dataframe(pd.DataFrame(all_ipv4, columns=["IPv4", "Data/Hora UTC", "Data/Hora UTC-3"]))
+    st.dataframe(tabela_ips(all_ipv4, "IPv4"))
 
     st.subheader("IPv6 e horários")
-    st.dataframe(pd.DataFrame(all_ipv6, columns=["IPv6", "Data/Hora UTC", "Data/Hora UTC-3"]))
+    st.dataframe(tabela_ips(all_ipv6, "IPv6"))
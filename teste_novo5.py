@@ -1,38 +1,26 @@
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-import plotly.express as px
-from io import BytesIO
-import chardet
-import pytz
-from bs4 import BeautifulSoup
-import base64
-import textwrap
-from datetime import datetime
-import os
-import re
-import hashlib
-import json
-
-# ====== (opcional) DOCX ======
-try:
-    from docx import Document
-    from docx.shared import Inches
-    DOCX_OK = True
-except Exception:
-    DOCX_OK = False
-
-# ====== (opcional) PDF ======
-try:
-    from reportlab.lib.pagesizes import A4
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
-    from reportlab.lib import colors
-    from reportlab.lib.styles import getSampleStyleSheet
-    from reportlab.lib.units import mm
-    from reportlab.lib.utils import ImageReader
-    PDF_OK = True
-except Exception:
-    PDF_OK = False
+from datetime import timedelta
+from functools import partial
+from itertools import repeat
+
+from analise.cache import CacheLeitura
+from analise.dependencias import ModuloAdiado
+from analise.esquema import concatenar
+from analise.exportacao import ESCRITORES, LIMITE_LINHAS_EXCEL, exportar
+from analise.filtros import MotorFiltros, filtro_por_intervalo, intervalo_de_parede
+from analise.fuso import FUSO_PADRAO
+from analise.hashing import ESQUEMA_ARVORE, TAMANHO_FOLHA, hash_arquivo, hash_arvore
+from analise.ingestao import iter_ler_arquivos
+from analise.relatorio import (PDF_OK, atualizar_agregados, gerar_pdf_hash, montar_modelo, renderizar_docx,
+                               renderizar_html, renderizar_pdf, renderizar_txt)
+from analise.reducao import MAX_CATEGORIAS, ORCAMENTO_PONTOS, histograma, reduzir_linhas, top_n_com_outros
+from analise.tipos import detectar_colunas_datetime
+from analise.visualizacao import janela, ordenar_posicoes, total_paginas
+
+# gráficos: importados só quando uma aba desenha o primeiro gráfico
+plt = ModuloAdiado("matplotlib.pyplot")
+px = ModuloAdiado("plotly.express")
 
 st.set_page_config(page_title="Dashboard Inteligente", layout="wide")
 st.title("Dashboard Inteligente - HTML, XLSX e CSV")
@@ -41,225 +29,171 @@ st.title("Dashboard Inteligente - HTML, XLSX e CSV")
 # Funções auxiliares
 # =============================
 
-def _decode_file(uploaded_file) -> str:
-    raw = uploaded_file.read()
-    enc = (chardet.detect(raw)["encoding"] or "utf-8")
-    try:
-        text = raw.decode(enc, errors="replace")
-    except Exception:
-        text = raw.decode("utf-8", errors="replace")
-    finally:
-        uploaded_file.seek(0)
-    return text
-
-# ---------- HASH (SHA-512) ----------
-def gerar_hash(conteudo_bytes: bytes, algoritmo: str = "sha512") -> str:
-    h = hashlib.new(algoritmo)
-    h.update(conteudo_bytes)
-    return h.hexdigest()
-
-# ---------- Sanitizador para WhatsApp Business Record ----------
-def _sanitize_wa_value(value: str, key_en: str) -> str:
-    v = value or ""
-    v = re.sub(r"(WhatsApp\s+Business\s+Record\s+Page\s*\d+|Página\s*\d+)", "", v, flags=re.I)
-    v = re.sub(r"\s{2,}", " ", v).strip()
-    if key_en == "ip addresses definition":
-        cut_tokens = ["IP Addresses:", "Ip Addresses", "IP Address", "Time 20", "Time 19"]
-        for tok in cut_tokens:
-            idx = v.find(tok)
-            if idx != -1:
-                v = v[:idx].strip()
-                break
-    m = re.search(r"\b20\d{2}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}\s+UTC\b", v)
-    if m:
-        v = v[:m.start()].strip()
-    return v
-
-def _parse_whatsapp_business_record(text: str) -> dict | None:
-    soup = BeautifulSoup(text, "html.parser")
-    plain = soup.get_text(separator="\n")
-    lines = [ln.strip() for ln in plain.splitlines() if ln.strip()]
-    lower_lines = [ln.lower() for ln in lines]
-
-    keys_en = [
-        "service",
-        "account identifier",
-        "account type",
-        "generated",
-        "date range",
-        "ncmec reports definition",
-        "ncmec cybertips",
-        "emails definition",
-        "registered email addresses",
-        "ip addresses definition",
-    ]
-    map_pt = {
-        "service": "Serviço",
-        "account identifier": "Identificador da Conta",
-        "account type": "Tipo de Conta",
-        "generated": "Gerado em",
-        "date range": "Intervalo de Datas",
-        "ncmec reports definition": "Definição – Relatórios NCMEC",
-        "ncmec cybertips": "NCMEC CyberTips",
-        "emails definition": "Definição – E-mails",
-        "registered email addresses": "E-mails Cadastrados",
-        "ip addresses definition": "Definição – Endereços IP",
-    }
-
-    idxs = {}
-    for i, ll in enumerate(lower_lines):
-        for k in keys_en:
-            if ll == k and k not in idxs:
-                idxs[k] = i
-
-    if "service" not in idxs:
-        return None
-
-    result = {}
-    for pos, k in enumerate(keys_en):
-        if k not in idxs:
-            continue
-        start = idxs[k] + 1
-        next_idx = None
-        for j in range(pos + 1, len(keys_en)):
-            if keys_en[j] in idxs:
-                next_idx = idxs[keys_en[j]]
-                break
-        end = next_idx if next_idx is not None else len(lines)
-
-        chunk = lines[start:end]
-        chunk = [c for c in chunk if c.lower() not in keys_en]
-        value = " ".join(chunk).strip()
-        value = _sanitize_wa_value(value, k)
-        if value:
-            result[map_pt[k]] = value
-
-    return result or None
-
-def _parse_text_time_ip(text: str) -> pd.DataFrame | None:
-    soup = BeautifulSoup(text, "html.parser")
-    plain = soup.get_text(separator="\n")
-    lines = [ln.strip() for ln in plain.splitlines()]
-    skip_prefixes = ("WhatsApp Business Record Page",)
-    clean = [ln for ln in lines if ln and not any(ln.startswith(p) for p in skip_prefixes)]
-
-    records = []
-    current = {"Time": None, "IP Address": None}
-
-    i, n = 0, len(clean)
-    while i < n:
-        token = clean[i]
-        if token.lower() == "time":
-            j = i + 1
-            while j < n and not clean[j]:
-                j += 1
-            if j < n:
-                current["Time"] = clean[j]; i = j
-        elif token.lower() in ("ip address", "ip addresses"):
-            j = i + 1
-            while j < n and not clean[j]:
-                j += 1
-            if j < n:
-                current["IP Address"] = clean[j]; i = j
-        else:
-            if token.lower() in ("ip addresses", "ipaddress", "ip"):
-                j = i + 1
-                while j < n and not clean[j]:
-                    j += 1
-                if j < n:
-                    current["IP Address"] = clean[j]; i = j
-
-        if current["Time"] and current["IP Address"]:
-            records.append({"Time": current["Time"], "IP Address": current["IP Address"]})
-            current = {"Time": None, "IP Address": None}
-        i += 1
+def _exibir_avisos(resultado: dict):
+    for nivel, mensagem in resultado["avisos"]:
+        getattr(st, nivel)(mensagem)
 
-    if not records:
-        return None
-
-    df = pd.DataFrame(records, columns=["Time", "IP Address"])
+@st.cache_resource
+def _cache_leitura():
     try:
-        df["Time"] = pd.to_datetime(df["Time"], errors="coerce", utc=True)
+        return CacheLeitura()
     except Exception:
-        pass
-    return df
-
-def ler_arquivo(uploaded_file):
-    ext = uploaded_file.name.split('.')[-1].lower()
-
-    if ext == "xlsx":
-        try:
-            uploaded_file.seek(0)
-            return pd.read_excel(uploaded_file)
-        finally:
-            uploaded_file.seek(0)
-
-    elif ext == "csv":
-        try:
-            raw = uploaded_file.read()
-            enc = (chardet.detect(raw)["encoding"] or "utf-8")
-            st.info(f"Arquivo CSV detectado com encoding: **{enc}**")
-            uploaded_file.seek(0)
-            return pd.read_csv(uploaded_file, sep=None, engine="python", encoding=enc)
-        except Exception as e:
-            st.error(f"Erro ao ler CSV: {e}")
-            return None
-        finally:
-            uploaded_file.seek(0)
-
-    elif ext in ("html", "htm", "txt"):
-        try:
-            text = _decode_file(uploaded_file)
-
-            # Detecta e guarda o resumo do WhatsApp Business Record (para o relatório)
-            try:
-                wa_doc = _parse_whatsapp_business_record(text)
-                if wa_doc:
-                    st.session_state["wa_doc"] = wa_doc
-            except Exception:
-                pass
-
-            soup = BeautifulSoup(text, "html.parser")
-            if soup.find("table"):
-                try:
-                    tables = pd.read_html(text, flavor="bs4")
-                    if tables:
-                        return tables[0]
-                except Exception:
-                    pass
-
-            df_text = _parse_text_time_ip(text)
-            if df_text is not None and not df_text.empty:
-                return df_text
-
-            st.error("Não foi possível extrair dados: sem <table> e formato não corresponde a Time/IP.")
+        return None  # diretório de cache indisponível: segue sem cache
+
+def _digests_upload(uploaded_files) -> list[str]:
+    # SHA-512 de cada upload, calculado uma vez por arquivo (file_id) e reaproveitado nos reruns
+    memo = st.session_state.setdefault("_digests_upload", {})
+    digests = []
+    for f in uploaded_files:
+        chave = (getattr(f, "file_id", None) or f.name, f.size)
+        if chave not in memo:
+            memo[chave] = hash_arquivo(f)  # lido em blocos, sem cópia do conteúdo
+        digests.append(memo[chave])
+    return digests
+
+def _manifesto_upload(uploaded_files, digests: list[str], arvore: bool = False) -> list[dict]:
+    """Manifesto de evidências do relatório: uma entrada por arquivo de origem."""
+    memo = st.session_state.setdefault("_arvores_upload", {})
+    manifesto = []
+    for f, digest in zip(uploaded_files, digests):
+        entrada = {"arquivo": f.name, "bytes": f.size, "sha512": digest}
+        if arvore:
+            if digest not in memo:
+                memo[digest] = hash_arvore(f)
+            entrada["arvore"] = memo[digest]
+            entrada["esquema_arvore"] = f"{ESQUEMA_ARVORE}, folha de {TAMANHO_FOLHA} bytes"
+        manifesto.append(entrada)
+    return manifesto
+
+def ler_arquivos(uploaded_files, digests: list[str], paralelo: bool = False,
+                 todas_tabelas: bool = False) -> list[dict]:
+    """Lê os arquivos enviados (opcionalmente em paralelo) e devolve os resultados na ordem do upload."""
+    arquivos = [(f.name, f.getvalue()) for f in uploaded_files]
+    resultados = [None] * len(arquivos)
+    progresso = st.progress(0.0, text="Lendo arquivos...")
+    for concluidos, (i, resultado) in enumerate(
+            iter_ler_arquivos(arquivos, max_workers=None if paralelo else 1, cache=_cache_leitura(),
+                              digests=digests, todas_tabelas=todas_tabelas), start=1):
+        resultados[i] = resultado
+        progresso.progress(concluidos / len(arquivos),
+                           text=f"{resultado['nome']} lido ({concluidos}/{len(arquivos)})")
+    progresso.empty()
+    return resultados
+
+def exibir_tabela_paginada(df: pd.DataFrame, chave: str, versao):
+    """
+    Mostra o DataFrame página a página: ordenação e paginação no servidor,
+    formatação de datas só para as linhas visíveis. `versao` identifica o
+    conteúdo de `df` para reaproveitar a ordenação entre reruns.
+    """
+    c1, c2, c3, c4 = st.columns([3, 1, 1, 1])
+    opcoes = ["(ordem original)"] + list(df.columns)
+    ordenar_por = c1.selectbox("Ordenar por", opcoes, key=f"{chave}_ordenar")
+    descendente = c2.checkbox("Decrescente", key=f"{chave}_desc")
+    tamanho = c3.selectbox("Linhas por página", [50, 100, 500, 1000], index=1, key=f"{chave}_tamanho")
+    paginas = total_paginas(len(df), tamanho)
+    pagina = c4.number_input(f"Página (de {paginas})", min_value=1, max_value=paginas, value=1, key=f"{chave}_pagina")
+
+    ordem = None
+    if ordenar_por != opcoes[0]:
+        ordens = st.session_state.setdefault("_ordens_tabela", {})
+        chave_ordem = (chave, versao, ordenar_por, descendente)
+        if chave_ordem not in ordens:
+            # só guarda as ordenações da versão atual dos dados
+            for k in [k for k in ordens if k[0] == chave and k[1] != versao]:
+                del ordens[k]
+            ordens[chave_ordem] = ordenar_posicoes(df[ordenar_por], descendente)
+        ordem = ordens[chave_ordem]
+
+    st.dataframe(janela(df, pagina, tamanho, ordem))
+    inicio = (pagina - 1) * tamanho
+    st.caption(f"Linhas {min(inicio + 1, len(df))}–{min(inicio + tamanho, len(df))} de {len(df)}")
+
+def _motor_filtros(df: pd.DataFrame, versao) -> MotorFiltros:
+    # índices e bitmaps valem enquanto os dados carregados forem os mesmos
+    if st.session_state.get("_motor_filtros_versao") != versao:
+        st.session_state["_motor_filtros"] = MotorFiltros(df)
+        st.session_state["_motor_filtros_versao"] = versao
+    return st.session_state["_motor_filtros"]
+
+def _agregados(df: pd.DataFrame, versao):
+    # contagens por dia/IP da versão atual; arquivos acrescentados ao fim só somam as linhas novas
+    anterior = st.session_state.get("_agregados")
+    if anterior is None or anterior[0] != versao:
+        base = anterior[1] if anterior and versao[:len(anterior[0])] == anterior[0] else None
+        st.session_state["_agregados"] = (versao, atualizar_agregados(df, base))
+    return st.session_state["_agregados"][1]
+
+def widget_filtro(motor: MotorFiltros, col, por_pagina: int = 200):
+    """Desenha o filtro de uma coluna e devolve a especificação para MotorFiltros.aplicar (ou None)."""
+    serie = motor.df[col]
+    if filtro_por_intervalo(serie):
+        minimo, maximo = serie.min(), serie.max()
+        if pd.isna(minimo) or minimo == maximo:
             return None
-        except Exception as e:
-            st.error(f"Erro ao ler arquivo de texto/HTML: {e}")
+        if pd.api.types.is_datetime64_any_dtype(serie):
+            tz = getattr(serie.dt, "tz", None)
+            # passo de 1 minuto (o padrão do Streamlit para datas é 1 dia); o início fica no minuto cheio
+            inicio_slider = minimo.tz_localize(None).floor("min").to_pydatetime()
+            fim_slider = maximo.tz_localize(None).to_pydatetime()
+            ini, fim = st.slider(
+                f"Intervalo para {col}",
+                min_value=inicio_slider,
+                max_value=fim_slider,
+                value=(inicio_slider, fim_slider),
+                step=timedelta(minutes=1),
+                format="DD/MM/YYYY HH:mm", key=f"filtro_intervalo_{col}",
+            )
+            ini, fim = intervalo_de_parede(ini, fim, tz)
+        else:
+            minimo, maximo = minimo.item(), maximo.item()
+            ini, fim = st.slider(f"Intervalo para {col}", min_value=minimo, max_value=maximo,
+                                 value=(minimo, maximo), key=f"filtro_intervalo_{col}")
+        if ini <= minimo and fim >= maximo:
             return None
-        finally:
-            uploaded_file.seek(0)
-
-    else:
-        st.warning("Extensão não suportada. Use HTML/HTM/TXT, XLSX ou CSV.")
-        return None
-
-def to_excel(df):
-    df_copy = df.copy()
-    for col in df_copy.columns:
-        if pd.api.types.is_datetime64_any_dtype(df_copy[col]):
-            if getattr(df_copy[col].dt, "tz", None) is not None:
-                df_copy[col] = df_copy[col].dt.tz_localize(None)
-    output = BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df_copy.to_excel(writer, index=False)
-    return output.getvalue()
-
-def to_csv(df):
-    return df.to_csv(index=False).encode('utf-8')
-
-def to_json(df):
-    return df.to_json(orient="records", force_ascii=False).encode('utf-8')
+        return (col, "intervalo", (ini, fim))
+
+    indice = motor.indice(col)
+    chave = f"filtro_valores_{col}"
+    selecionados = st.session_state.get(chave, [])
+    c1, c2 = st.columns([3, 1])
+    termo = c1.text_input(f"Buscar valores em {col}", key=f"filtro_busca_{col}")
+    _, _, total = indice.buscar(termo, 0, 0)
+    paginas = total_paginas(total, por_pagina)
+    pagina = c2.number_input(f"Página de valores (de {paginas})", 1, paginas, 1, key=f"filtro_pagina_{col}")
+    valores, contagens, _ = indice.buscar(termo, (pagina - 1) * por_pagina, por_pagina)
+    rotulos = {v: f"{v} ({n})" for v, n in zip(valores, contagens)}
+    # os já selecionados continuam entre as opções mesmo fora da página/busca atual
+    opcoes = list(selecionados) + [v for v in valores if v not in set(selecionados)]
+    selecao = st.multiselect(f"Valores para {col} ({total} distintos)", opcoes, key=chave,
+                             format_func=lambda v: rotulos.get(v, str(v)))
+    return (col, "valores", tuple(selecao)) if selecao else None
+
+def _contagem_valores(serie: pd.Series) -> pd.Series:
+    # colunas categóricas (ex.: IP) listariam também as categorias ausentes do recorte
+    contagem = serie.value_counts()
+    return contagem[contagem > 0]
+
+# ---------- Plotly com dados reduzidos no servidor (payload limitado) ----------
+def _histograma_plotly(serie: pd.Series, orcamento: int, nbins: int | None = None, **kwargs):
+    faixas = histograma(serie, nbins, orcamento)
+    fig = px.bar(faixas, x="centro", y="contagem", labels={"centro": serie.name, "contagem": "count"},
+                 hover_data={"inicio": True, "fim": True, "largura": False}, **kwargs)
+    fig.update_traces(width=faixas["largura"].to_numpy())
+    fig.update_layout(bargap=0)
+    return fig
+
+def _linhas_plotly(df: pd.DataFrame, orcamento: int, metodo: str = "lttb"):
+    reduzido = reduzir_linhas(df, orcamento, metodo)
+    if len(reduzido) < df.notna().sum().sum():
+        st.caption(f"{len(reduzido)} de {int(df.notna().sum().sum())} pontos exibidos "
+                   f"({'LTTB' if metodo == 'lttb' else 'mín./máx. por faixa'}).")
+    return px.line(reduzido, x="index", y="value", color="variable")
+
+def _contagem_plotly(serie: pd.Series, col, max_categorias: int) -> pd.DataFrame:
+    contagem = top_n_com_outros(_contagem_valores(serie), max_categorias).reset_index()
+    contagem.columns = [col, "Contagem"]
+    return contagem
 
 def gerar_insights(df):
     insights = []
@@ -295,523 +229,54 @@ def converter_datas_para_timestamp(df):
             df_convertido[col] = df_convertido[col].view('int64') / 1e9
     return df_convertido
 
-def detectar_colunas_datetime(df):
-    fuso = pytz.timezone("America/Sao_Paulo")
-    df = df.copy()
-    for col in df.columns:
-        if df[col].dtype == object:
-            try:
-                temp = pd.to_datetime(df[col], errors='raise', utc=True)
-                temp = temp.dt.tz_convert(fuso)
-                df[col] = temp
-            except Exception:
-                pass
-        elif pd.api.types.is_datetime64_any_dtype(df[col]):
-            try:
-                if getattr(df[col].dt, "tz", None) is not None:
-                    df[col] = df[col].dt.tz_convert(fuso)
-                else:
-                    df[col] = df[col].dt.tz_localize("UTC").dt.tz_convert(fuso)
-            except Exception:
-                pass
-    return df
-
-def formatar_datas_para_exibicao(df):
-    df_exibir = df.copy()
-    for col in df_exibir.columns:
-        if pd.api.types.is_datetime64_any_dtype(df_exibir[col]):
-            df_exibir[col] = df_exibir[col].dt.strftime("%d/%m/%Y %H:%M:%S")
-    return df_exibir
-
-# ====== Relatório: detecção de colunas e tabelas ======
-def _guess_colunas(df):
-    col_tempo = None
-    for c in df.columns:
-        if str(c).strip().lower() == "time":
-            col_tempo = c; break
-    if col_tempo is None:
-        for c in df.columns:
-            if pd.api.types.is_datetime64_any_dtype(df[c]):
-                col_tempo = c; break
-    if col_tempo is None:
-        candidatos_tempo = [c for c in df.columns if str(c).strip().lower() in
-                            ("timestamp","data","datetime","date","hora","data/hora")]
-        for cand in candidatos_tempo:
-            try:
-                test = pd.to_datetime(df[cand], errors="coerce", utc=True)
-                if test.notna().any():
-                    col_tempo = cand; break
-            except Exception:
-                pass
-
-    col_ip = None
-    for c in df.columns:
-        if str(c).strip().lower() == "ip address":
-            col_ip = c; break
-    if col_ip is None:
-        candidatos_ip = [c for c in df.columns if "ip" in str(c).lower()]
-        if candidatos_ip:
-            col_ip = candidatos_ip[0]
-
-    return col_tempo, col_ip
-
-def _fig_to_png_bytes(fig):
-    buf = BytesIO()
-    fig.savefig(buf, format="png", bbox_inches="tight", dpi=180)
-    plt.close(fig)
-    buf.seek(0)
-    return buf.getvalue()
-
-def _grafico_timeline(df, col_tempo):
-    serie = pd.to_datetime(df[col_tempo], errors="coerce").dropna()
-    if serie.empty:
-        return None
-    por_dia = serie.dt.date.value_counts().sort_index()
-    fig, ax = plt.subplots()
-    ax.plot(por_dia.index, por_dia.values, marker="o")
-    ax.set_title("Linha do tempo de eventos por dia")
-    ax.set_xlabel("Data")
-    ax.set_ylabel("Quantidade de eventos")
-    ax.grid(True, linewidth=0.3)
-    return _fig_to_png_bytes(fig)
-
-def _grafico_top_ips(df, col_ip, top_n=10):
-    if col_ip is None or col_ip not in df.columns:
-        return None
-    cont = df[col_ip].astype(str).value_counts().head(top_n)
-    if cont.empty:
-        return None
-    fig, ax = plt.subplots()
-    cont.plot(kind="barh", ax=ax)
-    ax.invert_yaxis()
-    ax.set_title(f"Top {min(top_n, len(cont))} IPs por frequência")
-    ax.set_xlabel("Ocorrências")
-    return _fig_to_png_bytes(fig)
-
-def _png_data_uri(png_bytes):
-    b64 = base64.b64encode(png_bytes).decode("ascii")
-    return f"data:image/png;base64,{b64}"
-
-def montar_tabela_ip_time_completa(df: pd.DataFrame) -> pd.DataFrame:
-    if df is None or df.empty:
-        return pd.DataFrame(columns=["Time (America/Sao_Paulo)", "IP Address"])
-
-    col_tempo, col_ip = _guess_colunas(df)
-    if not col_tempo or not col_ip or col_tempo not in df.columns or col_ip not in df.columns:
-        return pd.DataFrame(columns=["Time (America/Sao_Paulo)", "IP Address"])
-
-    base = df[[col_tempo, col_ip]].copy()
-
-    try:
-        serie = pd.to_datetime(base[col_tempo], errors="coerce", utc=True).dt.tz_convert("America/Sao_Paulo")
-    except Exception:
-        serie = pd.to_datetime(base[col_tempo], errors="coerce")
-        if getattr(serie.dt, "tz", None) is None:
-            serie = serie.dt.tz_localize("America/Sao_Paulo")
-
-    base["__time"] = serie
-    base = base.dropna(subset=["__time", col_ip]).sort_values("__time", ascending=False)
-    base["Time (America/Sao_Paulo)"] = base["__time"].dt.strftime("%d/%m/%Y %H:%M:%S")
-    base = base[["Time (America/Sao_Paulo)", col_ip]].rename(columns={col_ip: "IP Address"})
-    return base.reset_index(drop=True)
-
-# ---------- bloco comum para texto/achados ----------
-def _resumo_achados(df, col_tempo, col_ip):
-    periodo_txt = "Não identificado"
-    if col_tempo and col_tempo in df.columns:
-        try:
-            serie = pd.to_datetime(df[col_tempo], errors="coerce", utc=True)
-            if getattr(serie.dt, "tz", None) is not None:
-                serie = serie.dt.tz_convert("America/Sao_Paulo")
-            else:
-                serie = serie.dt.tz_localize("UTC").dt.tz_convert("America/Sao_Paulo")
-            tmin, tmax = serie.min(), serie.max()
-            if pd.notna(tmin) and pd.notna(tmax):
-                periodo_txt = f"{tmin.strftime('%d/%m/%Y %H:%M:%S')} a {tmax.strftime('%d/%m/%Y %H:%M:%S')}"
-        except Exception:
-            pass
-
-    achados = [
-        f"Total de registros analisados: {len(df)}.",
-        f"Total de colunas: {df.shape[1]} ({', '.join(map(str, df.columns))}).",
-        f"Período coberto (se aplicável): {periodo_txt}."
-    ]
-    if col_ip and col_ip in df.columns:
-        ips_unicos = df[col_ip].astype(str).nunique(dropna=True)
-        achados.append(f"Endereços IP distintos identificados: {ips_unicos}.")
-        top_ips = df[col_ip].astype(str).value_counts().head(5)
-        if not top_ips.empty:
-            resumo_top = "; ".join([f"{idx} ({val})" for idx, val in top_ips.items()])
-            achados.append(f"Principais IPs por frequência: {resumo_top}.")
-    else:
-        achados.append("Não foi identificada coluna de IP.")
-    return periodo_txt, achados
-
-def _payload_para_hash_conteudo(metadados: dict, wa_doc: dict | None, df: pd.DataFrame, periodo_txt: str) -> bytes:
-    payload = {
-        "metadados": metadados,
-        "wa_doc": wa_doc or {},
-        "periodo": periodo_txt,
-        "colunas": list(map(str, df.columns)),
-        "registros": int(len(df)),
-        "gerado_em": datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
-        "versao_layout": 2,
-    }
-    return json.dumps(payload, ensure_ascii=False, sort_keys=True).encode("utf-8")
-
-def gerar_relatorio_html_txt_docx(df_base: pd.DataFrame,
-                                  df_filtrado: pd.DataFrame,
-                                  incluir_graficos: bool,
-                                  metadados: dict,
-                                  wa_doc: dict | None = None):
-    df = df_filtrado if df_filtrado is not None and not df_filtrado.empty else df_base.copy()
-    col_tempo, col_ip = _guess_colunas(df)
-    periodo_txt, achados = _resumo_achados(df, col_tempo, col_ip)
-
-    # hash de conteúdo (SHA-512) — mostrado apenas no FINAL
-    content_payload = _payload_para_hash_conteudo(metadados, wa_doc, df, periodo_txt)
-    content_hash = gerar_hash(content_payload, "sha512")
-
-    png_timeline = _grafico_timeline(df, col_tempo) if incluir_graficos and col_tempo else None
-    png_top_ips = _grafico_top_ips(df, col_ip) if incluir_graficos and col_ip else None
-    tabela_completa = montar_tabela_ip_time_completa(df)
-
-    # -------- HTML --------
-    html_parts = []
-    html_parts.append("<meta charset='utf-8'>")
-    html_parts.append("<style>body{font-family:Arial,Helvetica,sans-serif;margin:24px} h1,h2{margin:0.2em 0} table{border-collapse:collapse;width:100%} th,td{border:1px solid #ddd;padding:6px;font-size:13px} .muted{color:#555} .blk{margin:18px 0}</style>")
-    html_parts.append("<h1>Relatório Policial - Análise de IPs (Análise de Dados)</h1>")
-
-    html_parts.append("<div class='blk'><h2>Metadados</h2><table>")
-    for k,v in metadados.items():
-        html_parts.append(f"<tr><th style='width:260px;text-align:left'>{k}</th><td>{v}</td></tr>")
-    html_parts.append("</table></div>")
-
-    if wa_doc:
-        html_parts.append("<div class='blk'><h2>Dados do Documento WhatsApp Business Record</h2><table>")
-        for k, v in wa_doc.items():
-            html_parts.append(f"<tr><th style='width:260px;text-align:left'>{k}</th><td>{v}</td></tr>")
-        html_parts.append("</table></div>")
-
-    html_parts.append("<div class='blk'><h2>Síntese dos Achados</h2><ul>")
-    for a in achados:
-        html_parts.append(f"<li>{a}</li>")
-    html_parts.append("</ul></div>")
-
-    html_parts.append("<div class='blk'><h2>Metodologia</h2>")
-    html_parts.append("<p class='muted'>Os dados foram importados, higienizados e analisados com apoio de ferramentas computacionais. Procedeu-se à consolidação de múltiplas fontes, conversão de datas para o fuso America/Sao_Paulo e análise descritiva (contagens, modos e médias).</p></div>")
-
-    if incluir_graficos and (png_timeline or png_top_ips):
-        html_parts.append("<div class='blk'><h2>Gráficos</h2>")
-        if png_timeline:
-            html_parts.append("<h3>Linha do tempo de eventos por dia</h3>")
-            html_parts.append(f"<img src='{_png_data_uri(png_timeline)}' style='max-width:100%;height:auto'/>")
-        if png_top_ips:
-            html_parts.append("<h3>Top IPs por frequência</h3>")
-            html_parts.append(f"<img src='{_png_data_uri(png_top_ips)}' style='max-width:100%;height:auto'/>")
-        html_parts.append("</div>")
-
-    html_parts.append("<div class='blk'><h2>Tabela Completa: IP Address × Time (mais recentes primeiro)</h2>")
-    if tabela_completa.empty:
-        html_parts.append("<p class='muted'>Não há dados suficientes para compor a tabela completa (verifique colunas de IP e horário).</p>")
-    else:
-        html_parts.append(tabela_completa.to_html(index=False))
-    html_parts.append("</div>")
-
-    # *** HASH APENAS NO FINAL (sem o texto "(SHA-512)") ***
-    html_parts.append("<div class='blk'><h2>Assinatura Criptográfica</h2>")
-    html_parts.append(f"<p><code>{content_hash}</code></p></div>")
-
-    html_bytes = "\n".join(html_parts).encode("utf-8")
-
-    # -------- TXT --------
-    linhas = []
-    linhas.append("RELATÓRIO POLICIAL (ANÁLISE DE DADOS)")
-    linhas.append("=" * 60)
-    for k,v in metadados.items():
-        linhas.append(f"{k}: {v}")
-
-    if wa_doc:
-        linhas.append("")
-        linhas.append("DADOS DO DOCUMENTO WHATSApp BUSINESS RECORD")
-        for k, v in wa_doc.items():
-            linhas.append(f"- {k}: {v}")
-
-    linhas.append("")
-    linhas.append("1. SÍNTESE DOS ACHADOS")
-    for linha in achados:
-        linhas.append(f"- {linha}")
-
-    linhas.append("")
-    linhas.append("2. METODOLOGIA")
-    linhas.append(textwrap.fill(
-        "Os dados foram importados, higienizados e analisados com apoio de ferramentas "
-        "computacionais. Procedeu-se à consolidação de múltiplas fontes, conversão de datas "
-        "para o fuso America/Sao_Paulo e análise descritiva (contagens, modos e médias).",
-        width=100
-    ))
-
-    linhas.append("")
-    linhas.append("3. TABELA COMPLETA: IP Address × Time (mais recentes primeiro)")
-    if tabela_completa.empty:
-        linhas.append("- Não há dados suficientes para compor a tabela completa.")
-    else:
-        for _, r in tabela_completa.iterrows():
-            linhas.append(f"- {r['Time (America/Sao_Paulo)']}  |  {r['IP Address']}")
-
-    linhas.append("")
-    # *** Sem "(SHA-512)" aqui também ***
-    linhas.append("4. ASSINATURA CRIPTOGRÁFICA")
-    linhas.append(content_hash)
-
-    txt_bytes = "\n".join(linhas).encode("utf-8")
-
-    # -------- DOCX --------
-    docx_bytes = None
-    if DOCX_OK:
-        doc = Document()
-        doc.add_heading('Relatório Policial - Análise de IPs (Análise de Dados)', level=1)
-
-        doc.add_heading('Metadados', level=2)
-        for k,v in metadados.items():
-            doc.add_paragraph(f"{k}: {v}")
-
-        if wa_doc:
-            doc.add_heading('Dados do Documento WhatsApp Business Record', level=2)
-            for k, v in wa_doc.items():
-                doc.add_paragraph(f"{k}: {v}")
-
-        doc.add_heading('Síntese dos Achados', level=2)
-        for a in achados:
-            doc.add_paragraph(a)
-
-        doc.add_heading('Metodologia', level=2)
-        doc.add_paragraph(
-            "Os dados foram importados, higienizados e analisados com apoio de ferramentas computacionais. "
-            "Procedeu-se à consolidação de múltiplas fontes, conversão de datas para o fuso America/Sao_Paulo "
-            "e análise descritiva (contagens, modos e médias)."
-        )
-
-        tabela = montar_tabela_ip_time_completa(df)
-        doc.add_heading('Tabela Completa: IP Address × Time (mais recentes primeiro)', level=2)
-        if tabela.empty:
-            doc.add_paragraph("Não há dados suficientes para compor a tabela completa (verifique colunas de IP e horário).")
-        else:
-            cols = ["Time (America/Sao_Paulo)", "IP Address"]
-            t = doc.add_table(rows=1, cols=len(cols))
-            hdr = t.rows[0].cells
-            for i, c in enumerate(cols):
-                hdr[i].text = c
-            for _, row in tabela.iterrows():
-                cells = t.add_row().cells
-                cells[0].text = str(row["Time (America/Sao_Paulo)"])
-                cells[1].text = str(row["IP Address"])
-
-        # *** HASH APENAS NO FINAL (sem "(SHA-512)") ***
-        doc.add_heading('Assinatura Criptográfica', level=2)
-        doc.add_paragraph(content_hash)
-
-        bio = BytesIO()
-        doc.save(bio); bio.seek(0)
-        docx_bytes = bio.getvalue()
-
-    return {"html": html_bytes, "txt": txt_bytes, "docx": docx_bytes, "content_hash": content_hash}
-
-# ---- PDF: cabeçalho/rodapé; hash só no final do conteúdo ----
-def _header_footer(canvas, doc):
-    largura_pagina, altura_pagina = A4
-    try:
-        logo_path = "brasao.png"
-        if os.path.exists(logo_path):
-            img_w = 40 * mm
-            img_h = 40 * mm
-            x = (largura_pagina - img_w) / 2.0
-            y = altura_pagina - (img_h + 10 * mm)
-            canvas.drawImage(logo_path, x, y, width=img_w, height=img_h,
-                             preserveAspectRatio=True, mask='auto')
-    except Exception:
-        pass
-    page_num = canvas.getPageNumber()
-    canvas.setFont("Helvetica", 9)
-    canvas.setFillColor(colors.grey)
-    canvas.drawRightString(largura_pagina - 20 * mm, 12 * mm, f"Página {page_num}")
-
-def _rl_image_from_png_bytes(png_bytes: bytes, max_width_pt: float, max_height_pt: float):
-    try:
-        bio = BytesIO(png_bytes)
-        ir = ImageReader(bio)
-        iw, ih = ir.getSize()
-        scale = min(max_width_pt / float(iw), max_height_pt / float(ih), 1.0)
-        w = iw * scale
-        h = ih * scale
-        bio.seek(0)
-        return Image(bio, width=w, height=h)
-    except Exception:
-        return None
-
-def gerar_relatorio_pdf(df_base: pd.DataFrame,
-                        df_filtrado: pd.DataFrame,
-                        incluir_graficos: bool,
-                        metadados: dict,
-                        titulo: str = "Relatório Policial - Análise de IPs",
-                        wa_doc: dict | None = None) -> bytes:
-    if not PDF_OK:
-        raise RuntimeError("Pacote 'reportlab' não está disponível. Instale com: pip install reportlab")
-
-    df = df_filtrado if df_filtrado is not None and not df_filtrado.empty else df_base.copy()
-    col_tempo, col_ip = _guess_colunas(df)
-    periodo_txt, achados = _resumo_achados(df, col_tempo, col_ip)
-
-    # Hash do conteúdo (SHA-512) — será adicionado apenas ao final do PDF
-    content_payload = _payload_para_hash_conteudo(metadados, wa_doc, df, periodo_txt)
-    content_hash = gerar_hash(content_payload, "sha512")
-
-    styles = getSampleStyleSheet()
-    style_title = styles["Title"]; style_h1 = styles["Heading1"]; style_body = styles["BodyText"]
-
-    left = right = bottom = 36
-    top = 70 * mm
-    frame_width = A4[0] - (left + right)
-    frame_height = A4[1] - (top + bottom)
-
-    story = []
-    story.append(Paragraph(titulo, style_title))
-
-    story.append(Paragraph("<b>Metadados</b>", style_h1))
-    for k, v in metadados.items():
-        story.append(Paragraph(f"{k}: {v}", style_body))
-    story.append(Spacer(1, 8))
-
-    if wa_doc:
-        story.append(Paragraph("Dados do Documento WhatsApp Business Record", style_h1))
-        for k, v in wa_doc.items():
-            story.append(Paragraph(f"{k}: {v}", style_body))
-        story.append(Spacer(1, 8))
-
-    story.append(Paragraph("1. Síntese dos Achados", style_h1))
-    for a in achados:
-        story.append(Paragraph(a, style_body))
-    story.append(Spacer(1, 8))
-
-    story.append(Paragraph("2. Metodologia", style_h1))
-    story.append(Paragraph(
-        "Os dados foram importados, higienizados e analisados com apoio de ferramentas computacionais. "
-        "Procedeu-se à consolidação de múltiplimas fontes, conversão de datas para o fuso America/Sao_Paulo "
-        "e análise descritiva (contagens, modos e médias).", style_body
-    ))
-    story.append(Spacer(1, 8))
-
-    if incluir_graficos:
-        png_timeline = _grafico_timeline(df, col_tempo) if col_tempo else None
-        png_top_ips = _grafico_top_ips(df, col_ip) if col_ip else None
-
-        if png_timeline or png_top_ips:
-            story.append(Paragraph("3. Gráficos", style_h1))
-            max_w = frame_width; max_h = frame_height * 0.45
-
-            if png_timeline:
-                story.append(Paragraph("Linha do tempo de eventos por dia", style_body))
-                img_flow = _rl_image_from_png_bytes(png_timeline, max_w, max_h)
-                if img_flow:
-                    story.append(Spacer(1, 4)); story.append(img_flow); story.append(Spacer(1, 10))
-
-            if png_top_ips:
-                story.append(Paragraph("Top IPs por frequência", style_body))
-                img_flow = _rl_image_from_png_bytes(png_top_ips, max_w, max_h)
-                if img_flow:
-                    story.append(Spacer(1, 4)); story.append(img_flow); story.append(Spacer(1, 10))
-
-    story.append(Paragraph("4. Tabela Completa: IP Address × Time (mais recentes primeiro)", style_h1))
-    tabela_full = montar_tabela_ip_time_completa(df)
-    if tabela_full.empty:
-        story.append(Paragraph("Não há dados suficientes para compor a tabela completa (verifique colunas de IP e horário).", style_body))
-    else:
-        data = [list(tabela_full.columns)] + tabela_full.astype(str).values.tolist()
-        tbl = Table(data, colWidths=[150, 350])
-        tbl.setStyle(TableStyle([
-            ("BACKGROUND", (0,0), (-1,0), colors.lightgrey),
-            ("TEXTCOLOR", (0,0), (-1,0), colors.black),
-            ("ALIGN", (0,0), (-1,-1), "LEFT"),
-            ("VALIGN", (0,0), (-1,-1), "TOP"),
-            ("FONTNAME", (0,0), (-1,-1), "Helvetica"),
-            ("FONTSIZE", (0,0), (-1,-1), 9),
-            ("GRID", (0,0), (-1,-1), 0.25, colors.grey),
-            ("ROWBACKGROUNDS", (0,1), (-1,-1), [colors.whitesmoke, colors.white]),
-        ]))
-        story.append(tbl)
-
-    # *** HASH APENAS NO FINAL (sem "(SHA-512)") ***
-    story.append(Spacer(1, 12))
-    story.append(Paragraph("5. Assinatura Criptográfica", style_h1))
-    story.append(Paragraph(f"<font name='Courier'>{content_hash}</font>", style_body))
-
-    bio = BytesIO()
-    doc = SimpleDocTemplate(
-        bio, pagesize=A4,
-        leftMargin=left, rightMargin=right,
-        topMargin=top, bottomMargin=bottom,
-        title=titulo
-    )
-    doc.build(story, onFirstPage=_header_footer, onLaterPages=_header_footer)
-    return bio.getvalue()
-
-# ---------- NOVO: PDF SÓ DO HASH PARA COMPARAÇÃO ----------
-def gerar_pdf_hash(hash_str: str,
-                   metadados: dict | None = None,
-                   titulo: str = "Assinatura Criptográfica para Verificação") -> bytes:
-    """
-    Gera um PDF minimalista contendo apenas a assinatura criptográfica (hash),
-    opcionalmente com alguns metadados essenciais para facilitar a comparação.
-    """
-    if not PDF_OK:
-        raise RuntimeError("Pacote 'reportlab' não está disponível. Instale com: pip install reportlab")
-
-    styles = getSampleStyleSheet()
-    style_title = styles["Title"]; style_h1 = styles["Heading1"]; style_body = styles["BodyText"]
-
-    left = right = bottom = 36
-    top = 36
-
-    story = []
-    story.append(Paragraph(titulo, style_title))
-    story.append(Spacer(1, 8))
-    if metadados:
-        story.append(Paragraph("Metadados essenciais", style_h1))
-        for k, v in metadados.items():
-            story.append(Paragraph(f"{k}: {v}", style_body))
-        story.append(Spacer(1, 8))
-
-    story.append(Paragraph("Hash (SHA-512)", style_h1))
-    story.append(Paragraph(f"<font name='Courier'>{hash_str}</font>", style_body))
-
-    bio = BytesIO()
-    doc = SimpleDocTemplate(
-        bio, pagesize=A4,
-        leftMargin=left, rightMargin=right,
-        topMargin=top, bottomMargin=bottom,
-        title="Assinatura Criptográfica"
-    )
-    doc.build(story)
-    return bio.getvalue()
-
 # =============================
 # Upload múltiplo
 # =============================
 uploaded_files = st.file_uploader(
-    "Selecione arquivos HTML/HTM/TXT, XLSX ou CSV (múltiplos arquivos permitidos)",
-    type=["html", "htm", "txt", "xlsx", "csv"],
+    "Selecione arquivos HTML/HTM/TXT, XLSX, CSV, Parquet ou Feather (múltiplos arquivos permitidos)",
+    type=["html", "htm", "txt", "xlsx", "csv", "parquet", "feather", "arrow"],
     accept_multiple_files=True
 )
 
 if uploaded_files:
-    dfs = []
-    for file in uploaded_files:
-        df_temp = ler_arquivo(file)
-        if df_temp is not None:
-            dfs.append(df_temp)
-
-    if dfs:
-        df = pd.concat(dfs, ignore_index=True)
+    leitura_paralela = st.sidebar.checkbox(
+        "Leitura paralela (um processo por arquivo)", value=len(uploaded_files) > 1
+    )
+    todas_tabelas = st.sidebar.checkbox(
+        "Ler todas as abas (XLSX) e tabelas (HTML)", value=False,
+        help="Tabelas com as mesmas colunas são concatenadas; as linhas de cada uma aparecem nos avisos."
+    )
+    orcamento_pontos = st.sidebar.number_input(
+        "Orçamento de pontos por gráfico interativo", 500, 200_000, ORCAMENTO_PONTOS, step=500,
+        help="Histogramas e linhas do Plotly são reduzidos no servidor a no máximo este número de pontos."
+    )
+    max_categorias = st.sidebar.number_input(
+        "Máximo de categorias em barras/pizza", 3, 500, MAX_CATEGORIAS,
+        help="As demais categorias são somadas em \"Outros\"."
+    )
+    digests = _digests_upload(uploaded_files)
+    versao_dados = tuple(zip((f.name for f in uploaded_files), digests, repeat(todas_tabelas)))
+
+    # Reruns com os mesmos arquivos reaproveitam a leitura (e a detecção de datas) já feita
+    if st.session_state.get("_versao_dados") != versao_dados:
+        resultados = ler_arquivos(uploaded_files, digests, paralelo=leitura_paralela, todas_tabelas=todas_tabelas)
+        lidos = [r for r in resultados if r["df"] is not None]
+        # cada linha leva o arquivo de origem (coluna categórica)
+        df_lido = (detectar_colunas_datetime(concatenar([r["df"] for r in lidos], [r["nome"] for r in lidos]))
+                   if lidos else None)
+        st.session_state["_versao_dados"] = versao_dados
+        st.session_state["_resultados_leitura"] = resultados
+        st.session_state["_df_lido"] = df_lido
+    resultados = st.session_state["_resultados_leitura"]
+    df = st.session_state["_df_lido"]
+
+    for resultado in resultados:
+        _exibir_avisos(resultado)
+        # Guarda o resumo do WhatsApp Business Record (para o relatório)
+        if resultado["wa_doc"]:
+            st.session_state["wa_doc"] = resultado["wa_doc"]
+
+    if df is not None:
 
         aba1, aba2, aba3, aba4, aba5, aba6, aba7, aba8 = st.tabs([
             "📄 Dados",
@@ -826,21 +291,18 @@ if uploaded_files:
 
         with aba1:
             st.subheader("Visualização dos Dados Combinados")
-            df = detectar_colunas_datetime(df)
-            st.dataframe(formatar_datas_para_exibicao(df))
+            exibir_tabela_paginada(df, "dados", versao_dados)
             if st.session_state.get("wa_doc"):
                 st.success("WhatsApp Business Record detectado. Ele será incluído no relatório (texto saneado).")
 
         with aba2:
             st.subheader("Filtrar Dados")
             colunas = st.multiselect("Selecione colunas para filtrar", df.columns)
-            df_filtrado = df.copy()
-            for col in colunas:
-                valores = df[col].dropna().unique().tolist()
-                selecao = st.multiselect(f"Valores para {col}", valores)
-                if selecao:
-                    df_filtrado = df_filtrado[df_filtrado[col].isin(selecao)]
-            st.dataframe(formatar_datas_para_exibicao(df_filtrado))
+            motor = _motor_filtros(df, versao_dados)
+            filtros = [filtro for filtro in (widget_filtro(motor, col) for col in colunas) if filtro]
+            df_filtrado = motor.aplicar(filtros)
+            st.caption(f"{len(df_filtrado)} de {len(df)} linhas após os filtros.")
+            exibir_tabela_paginada(df_filtrado, "filtrados", (versao_dados, tuple(filtros)))
 
         with aba3:
             st.subheader("Visualização de Gráficos")
@@ -861,26 +323,30 @@ if uploaded_files:
                     colunas_escolhidas = st.multiselect("Selecione colunas categóricas", colunas_cat)
                 else:
                     colunas_escolhidas = []
+                metodo_linha = "lttb"
+                if tipo_grafico == "Linha" and modo_grafico == "Plotly (Interativo)":
+                    metodo_linha = st.radio("Redução das linhas", ["lttb", "minmax"], horizontal=True,
+                                            format_func={"lttb": "LTTB (forma da série)",
+                                                         "minmax": "Mín./máx. por faixa (picos)"}.get)
                 if colunas_escolhidas:
                     if modo_grafico == "Plotly (Interativo)":
                         if tipo_grafico == "Histograma":
                             for col in colunas_escolhidas:
-                                fig = px.histogram(df_filtrado, x=col, nbins=10, title=f"Histograma - {col}")
+                                fig = _histograma_plotly(df_filtrado[col], orcamento_pontos, nbins=10,
+                                                         title=f"Histograma - {col}")
                                 st.plotly_chart(fig, use_container_width=True)
                         elif tipo_grafico == "Barras":
                             for col in colunas_escolhidas:
-                                contagem = df_filtrado[col].value_counts().reset_index()
-                                contagem.columns = [col, "Contagem"]
+                                contagem = _contagem_plotly(df_filtrado[col], col, max_categorias)
                                 fig = px.bar(contagem, x=col, y="Contagem", title=f"Barras - {col}")
                                 st.plotly_chart(fig, use_container_width=True)
                         elif tipo_grafico == "Linha":
-                            fig = px.line(df_filtrado[colunas_escolhidas])
+                            fig = _linhas_plotly(df_filtrado[colunas_escolhidas], orcamento_pontos, metodo_linha)
                             fig.update_layout(title="Gráfico de Linha (múltiplas colunas)")
                             st.plotly_chart(fig, use_container_width=True)
                         elif tipo_grafico == "Pizza":
                             for col in colunas_escolhidas:
-                                contagem = df_filtrado[col].value_counts().reset_index()
-                                contagem.columns = [col, "Contagem"]
+                                contagem = _contagem_plotly(df_filtrado[col], col, max_categorias)
                                 fig = px.pie(contagem, names=col, values="Contagem", title=f"Pizza - {col}")
                                 st.plotly_chart(fig, use_container_width=True)
                     else:
@@ -890,13 +356,13 @@ if uploaded_files:
                                 df_filtrado[col].plot(kind="hist", bins=10, rwidth=0.8, ax=ax)
                                 ax.set_title(f"Histograma - {col}")
                             elif tipo_grafico == "Barras":
-                                df_filtrado[col].value_counts().plot(kind="bar", ax=ax)
+                                _contagem_valores(df_filtrado[col]).plot(kind="bar", ax=ax)
                                 ax.set_title(f"Barras - {col}")
                             elif tipo_grafico == "Linha":
                                 df_filtrado[col].plot(kind="line", ax=ax)
                                 ax.set_title(f"Linha - {col}")
                             elif tipo_grafico == "Pizza":
-                                df_filtrado[col].value_counts().plot(kind="pie", autopct='%1.1f%%', ax=ax)
+                                _contagem_valores(df_filtrado[col]).plot(kind="pie", autopct='%1.1f%%', ax=ax)
                                 ax.set_ylabel('')
                                 ax.set_title(f"Pizza - {col}")
                             st.pyplot(fig)
@@ -934,16 +400,16 @@ if uploaded_files:
                 if len(colunas_num) > 0:
                     col = colunas_num[0]
                     st.write(f"Histograma automático para {col}")
-                    st.plotly_chart(px.histogram(df_filtrado, x=col), use_container_width=True)
+                    st.plotly_chart(_histograma_plotly(df_filtrado[col], orcamento_pontos), use_container_width=True)
                 if len(colunas_cat) > 0:
                     col = colunas_cat[0]
                     st.write(f"Barras automáticas para {col}")
-                    contagem = df_filtrado[col].value_counts().reset_index()
-                    contagem.columns = [col, "Contagem"]
+                    contagem = _contagem_plotly(df_filtrado[col], col, max_categorias)
                     st.plotly_chart(px.bar(contagem, x=col, y="Contagem"), use_container_width=True)
                 if len(colunas_num) >= 2:
                     st.write("Gráfico de linha automático para duas primeiras colunas numéricas")
-                    st.plotly_chart(px.line(df_filtrado[colunas_num[:2]]), use_container_width=True)
+                    st.plotly_chart(_linhas_plotly(df_filtrado[colunas_num[:2]], orcamento_pontos),
+                                    use_container_width=True)
             else:
                 st.info("Carregue dados e aplique filtros para gerar gráficos automáticos.")
 
@@ -957,12 +423,25 @@ if uploaded_files:
 
         with aba7:
             st.subheader("⬇️ Exportações (dados filtrados)")
-            excel_bytes = to_excel(df_filtrado)
-            csv_bytes = to_csv(df_filtrado)
-            json_bytes = to_json(df_filtrado)
-            st.download_button("Baixar em Excel", data=excel_bytes, file_name="dados_filtrados.xlsx", mime="application/vnd.ms-excel")
-            st.download_button("Baixar em CSV", data=csv_bytes, file_name="dados_filtrados.csv", mime="text/csv")
-            st.download_button("Baixar em JSON", data=json_bytes, file_name="dados_filtrados.json", mime="application/json")
+            # cada arquivo é escrito (em blocos, num arquivo temporário) só quando o botão é clicado
+            st.download_button("Baixar em Excel", data=partial(exportar, df_filtrado, "xlsx"),
+                               file_name="dados_filtrados.xlsx",
+                               mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+            st.download_button("Baixar em CSV", data=partial(exportar, df_filtrado, "csv"),
+                               file_name="dados_filtrados.csv", mime="text/csv")
+            st.download_button("Baixar em JSON", data=partial(exportar, df_filtrado, "json"),
+                               file_name="dados_filtrados.json", mime="application/json")
+            st.download_button("Baixar em NDJSON (um registro por linha)", data=partial(exportar, df_filtrado, "ndjson"),
+                               file_name="dados_filtrados.ndjson", mime="application/x-ndjson")
+            if "parquet" in ESCRITORES:
+                # colunares: reabrem o caso já tipado (datas com fuso, IPs categóricos) pelo próprio upload
+                st.download_button("Baixar em Parquet (compactado)", data=partial(exportar, df_filtrado, "parquet"),
+                                   file_name="dados_filtrados.parquet", mime="application/vnd.apache.parquet")
+                st.download_button("Baixar em Feather/Arrow (abertura rápida)",
+                                   data=partial(exportar, df_filtrado, "feather"),
+                                   file_name="dados_filtrados.feather", mime="application/vnd.apache.arrow.file")
+            if len(df_filtrado) >= LIMITE_LINHAS_EXCEL:
+                st.caption(f"Acima de {LIMITE_LINHAS_EXCEL - 1:,} linhas o Excel é dividido em várias abas.".replace(",", "."))
 
         with aba8:
             st.subheader("📝 Gerar Relatório Policial (hash no final)")
@@ -975,13 +454,17 @@ if uploaded_files:
                     analista = st.text_input("Analista Responsável", "Perito(a) Criminal")
                 with colB:
                     solicitante = st.text_input("Autoridade solicitante", "Delegado(a) de Polícia")
-                    local_fuso = "America/Sao_Paulo"
+                    local_fuso = FUSO_PADRAO
                     incluir_graficos = st.checkbox("Incluir gráficos no relatório", True)
+                    incluir_arvore = st.checkbox(
+                        "Incluir hash em árvore (paralelo) no manifesto", False,
+                        help="Digest adicional, diferente do SHA-512 do arquivo; "
+                             "calculado por blocos em paralelo.")
                     obs = st.text_area("Observações (opcional)")
 
                 submitted = st.form_submit_button("Gerar Relatório")
             if submitted:
-                agora = datetime.now(pytz.timezone("America/Sao_Paulo")).strftime("%d/%m/%Y %H:%M:%S %Z")
+                agora = pd.Timestamp.now(tz=FUSO_PADRAO).strftime("%d/%m/%Y %H:%M:%S %Z")
                 metadados = {
                     "Órgão/Instituição": orgao,
                     "Unidade/Setor": unidade,
@@ -994,31 +477,37 @@ if uploaded_files:
                 if obs:
                     metadados["Observações"] = obs
 
-                pacotes = gerar_relatorio_html_txt_docx(
+                # análise feita uma vez; todos os formatos são renderizados a partir do modelo
+                modelo = montar_modelo(
                     df_base=df,
                     df_filtrado=df_filtrado if 'df_filtrado' in locals() else None,
                     incluir_graficos=incluir_graficos,
                     metadados=metadados,
-                    wa_doc=st.session_state.get("wa_doc")
+                    wa_doc=st.session_state.get("wa_doc"),
+                    manifesto=_manifesto_upload(uploaded_files, digests, arvore=incluir_arvore),
+                    agregados=_agregados(df, versao_dados),
+                    filtros=tuple(filtros)
                 )
+                docx_bytes = renderizar_docx(modelo)
 
                 st.success("Relatórios gerados! Baixe nos botões abaixo.")
-                if pacotes.get("docx"):
+                if docx_bytes:
                     st.download_button(
                         "Baixar Relatório (DOCX)",
-                        data=pacotes["docx"],
+                        data=docx_bytes,
                         file_name="relatorio_policial.docx",
                         mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
                     )
                 st.download_button(
                     "Baixar Relatório (HTML)",
-                    data=pacotes["html"],
+                    # HTML/TXT são gerados em blocos só quando o botão é clicado
+                    data=partial(renderizar_html, modelo),
                     file_name="relatorio_policial.html",
                     mime="text/html"
                 )
                 st.download_button(
                     "Baixar Relatório (TXT)",
-                    data=pacotes["txt"],
+                    data=partial(renderizar_txt, modelo),
                     file_name="relatorio_policial.txt",
                     mime="text/plain"
                 )
@@ -1028,14 +517,7 @@ if uploaded_files:
                     st.error("Para PDF, instale o pacote: pip install reportlab")
                 else:
                     try:
-                        pdf_bytes = gerar_relatorio_pdf(
-                            df_base=df,
-                            df_filtrado=df_filtrado if 'df_filtrado' in locals() else None,
-                            incluir_graficos=incluir_graficos,
-                            metadados=metadados,
-                            titulo="Relatório Policial - Análise de IPs",
-                            wa_doc=st.session_state.get("wa_doc")
-                        )
+                        pdf_bytes = renderizar_pdf(modelo, titulo="Relatório Policial - Análise de IPs")
                         st.download_button(
                             "Baixar Relatório (PDF)",
                             data=pdf_bytes,
@@ -1048,7 +530,7 @@ if uploaded_files:
                 # -------- NOVO BOTÃO: PDF contendo apenas o HASH para comparação --------
                 try:
                     hash_pdf = gerar_pdf_hash(
-                        hash_str=pacotes["content_hash"],
+                        hash_str=modelo.content_hash,
                         metadados={
                             "Nº do Procedimento/BO": metadados.get("Nº do Procedimento/BO", ""),
                             "Data/Hora de Geração": metadados.get("Data/Hora de Geração", ""),
@@ -0,0 +1,30 @@
+"""
+Estado agregado por (dia local, IP) nas trocas de horário de verão.
+
+Rodar na raiz do repositório:
+    python -m pytest tests
+"""
+import pandas as pd
+
+from analise.agregados import agregar
+
+FUSO = "America/Sao_Paulo"
+
+def _tempos(utc):
+    return pd.Series(pd.to_datetime(utc, utc=True)).dt.tz_convert(FUSO)
+
+def test_dia_sem_meia_noite():
+    # 04/11/2018: o relógio pulou de 00:00 para 01:00
+    estado = agregar(_tempos(["2018-11-04 04:00", "2018-11-04 12:00", "2018-11-03 12:00"]),
+                     pd.Series(["1.2.3.4", "1.2.3.4", "5.6.7.8"]))
+    por_dia = estado.por_dia()
+    assert por_dia.tolist() == [1, 2]
+    assert por_dia.index[1] == pd.Timestamp("2018-11-04 01:00", tz=FUSO)
+    assert estado.fim_do_dia(por_dia.index[0].value) == por_dia.index[1].value
+
+def test_dia_de_25_horas():
+    # 17/02/2018: 23:00-24:00 aconteceu duas vezes; o dia seguinte começa à meia-noite -03
+    estado = agregar(_tempos(["2018-02-18 01:30", "2018-02-18 02:30"]), pd.Series(["1.2.3.4", "1.2.3.4"]))
+    por_dia = estado.por_dia()
+    assert por_dia.tolist() == [2]
+    assert estado.fim_do_dia(por_dia.index[0].value) == pd.Timestamp("2018-02-18 03:00", tz="UTC").value
@@ -0,0 +1,47 @@
+"""
+Extração de artefatos do texto: tipos conferidos fora da expressão (IPv6,
+IMEI) e o mesmo resultado com o texto em pedaços.
+
+Rodar na raiz do repositório:
+    python -m pytest tests
+"""
+from analise.artefatos import _achados, extrair_artefatos
+
+TEXTO = (
+    "IP Address 2001:db8::1 Time 2024-01-01T10:00:00Z\n"
+    "IP Address ::ffff:10.0.0.1 Time 2024-01-01T10:05:00.123Z\n"
+    "IP Address 2001:0db8:0000:0000:0000:0000:0000:0002 Time 2024-01-02T00:00:00Z\n"
+    "IP Address 200.1.2.3 Time 2024-01-03T00:00:00Z\n"
+    "Hora 12:34:56 MAC aa:bb:cc:dd:ee:ff\n"
+    "IMEI 490154203237518 e 35-209900-176148-1, tel 123456789012345 x\n"
+    "ligou 551199887766554 e +55 (11) 91234-5678; contato fulano.tal@exemplo.com.br\n"
+)
+
+def test_ipv6_comprimido_e_pares():
+    res = extrair_artefatos(TEXTO)
+    assert res["ipv6"] == [("2001:db8::1", "2024-01-01T10:00:00Z"),
+                           ("::ffff:10.0.0.1", "2024-01-01T10:05:00.123Z"),
+                           ("2001:0db8:0000:0000:0000:0000:0000:0002", "2024-01-02T00:00:00Z")]
+    assert res["ipv4"] == [("200.1.2.3", "2024-01-03T00:00:00Z")]
+    assert res["emails"] == ["fulano.tal@exemplo.com.br"]
+
+def test_horas_e_mac_nao_sao_ipv6():
+    res = extrair_artefatos("Hora 12:34:56 MAC aa:bb:cc:dd:ee:ff")
+    assert res["ipv6"] == [] and not any(res.values())
+
+def test_imei_com_e_sem_luhn():
+    res = extrair_artefatos(TEXTO)
+    assert res["imeis"] == ["490154203237518", "35-209900-176148-1"]
+    # 15 dígitos sem Luhn não somem: são conferidos como telefone
+    assert res["telefones"] == ["123456789012345", "551199887766554", "+55 (11) 91234-5678"]
+    assert extrair_artefatos("tel 123456789012345 x")["telefones"] == ["123456789012345"]
+    assert extrair_artefatos("ligou 551199887766554")["telefones"] == ["551199887766554"]
+
+def test_pedacos_iguais_ao_texto_inteiro():
+    texto = TEXTO * 3
+    inteiro = list(_achados(texto))
+    for tamanho in (1, 7, 40, 65, 100):
+        pedacos = [texto[i:i + tamanho] for i in range(0, len(texto), tamanho)]
+        # sobreposição pequena (maior que o maior artefato): muitos cortes no meio de um
+        assert list(_achados(pedacos, sobreposicao=48)) == inteiro, tamanho
+        assert extrair_artefatos(pedacos) == extrair_artefatos(texto), tamanho
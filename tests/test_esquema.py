@@ -0,0 +1,50 @@
+"""
+Esquema dos dados combinados: IPs normalizados, portas e arquivo de origem.
+
+Rodar na raiz do repositório:
+    python -m pytest tests
+"""
+import pandas as pd
+
+from analise import esquema
+
+def test_arquivo_de_origem_categorico():
+    a = pd.DataFrame({"IP Address": ["1.2.3.4", "5.6.7.8"]})
+    b = pd.DataFrame({"IP Address": ["9.9.9.9"]})
+    c = pd.DataFrame({"IP Address": ["1.1.1.1"]})
+    df = esquema.concatenar([a, b, c], ["a.csv", "sub/b.xlsx", "a.csv"])
+
+    origem = df[esquema.COLUNA_ARQUIVO]
+    assert isinstance(origem.dtype, pd.CategoricalDtype)
+    assert origem.tolist() == ["a.csv", "a.csv", "sub/b.xlsx", "a.csv"]
+    assert sorted(origem.cat.categories) == ["a.csv", "sub/b.xlsx"]
+    assert list(df.columns) == ["IP Address", esquema.COLUNA_ARQUIVO]
+    # os frames de entrada não são alterados
+    assert esquema.COLUNA_ARQUIVO not in a.columns
+
+def test_arquivo_de_origem_preservado_e_um_so_frame():
+    reaberto = pd.DataFrame({"IP Address": ["1.2.3.4"], esquema.COLUNA_ARQUIVO: ["original.csv"]})
+    df = esquema.concatenar([reaberto], ["caso.parquet"])
+    assert df[esquema.COLUNA_ARQUIVO].tolist() == ["original.csv"]
+    assert isinstance(df[esquema.COLUNA_ARQUIVO].dtype, pd.CategoricalDtype)
+    assert esquema.COLUNA_ARQUIVO not in esquema.concatenar([reaberto.drop(columns=esquema.COLUNA_ARQUIVO)])
+
+def test_concatenar_une_categorias_de_tipos_diferentes():
+    a = pd.DataFrame({"x": pd.Series([1, 2]).astype("category")})
+    b = pd.DataFrame({"x": pd.Series(["z"]).astype("category")})
+    df = esquema.concatenar([a, b])
+    assert isinstance(df["x"].dtype, pd.CategoricalDtype)
+    assert df["x"].tolist() == [1, 2, "z"]
+
+def test_normalizar_ips_e_portas():
+    serie = pd.Series(["010.000.001.002", "[2001:DB8::1]:8080", "::ffff:1.2.3.4", "fe80::1%eth0",
+                       "1.2.3.4:443", "lixo", None])
+    ips = esquema.normalizar_ips(serie)
+    assert ips.tolist()[:6] == ["10.0.1.2", "2001:db8::1", "1.2.3.4", "fe80::1%eth0", "1.2.3.4", "lixo"]
+    assert pd.isna(ips.iloc[-1])
+
+    portas = esquema.portas_ips(serie)
+    assert portas.iloc[1] == 8080 and portas.iloc[4] == 443
+    assert portas.isna().sum() == 5
+    assert esquema.ips_com_porta(ips, portas).tolist()[:2] == ["10.0.1.2", "[2001:db8::1]:8080"]
+    assert esquema.portas_ips(pd.Series(["1.2.3.4"])) is None
@@ -0,0 +1,41 @@
+"""
+Filtro de intervalo de datas nas trocas de horário de verão (America/Sao_Paulo).
+
+Rodar na raiz do repositório:
+    python -m pytest tests
+"""
+from datetime import datetime
+
+import pandas as pd
+
+from analise.filtros import MotorFiltros, intervalo_de_parede
+
+FUSO = "America/Sao_Paulo"
+
+def test_horario_ambiguo_cobre_as_duas_ocorrencias():
+    # 17/02/2018: à meia-noite o relógio voltou para 23:00, e 23:30 aconteceu duas vezes
+    ini, fim = intervalo_de_parede(datetime(2018, 2, 17, 23, 30), datetime(2018, 2, 17, 23, 30), FUSO)
+    assert ini == pd.Timestamp("2018-02-18 01:30", tz="UTC")  # primeira ocorrência (-02)
+    assert fim == pd.Timestamp("2018-02-18 02:30:59.999999", tz="UTC")  # segunda ocorrência (-03)
+
+def test_horario_inexistente_vai_ate_a_troca():
+    # 04/11/2018: à meia-noite o relógio pulou para 01:00, e 00:30 não existiu
+    ini, _ = intervalo_de_parede(datetime(2018, 11, 4, 0, 30), datetime(2018, 11, 4, 2, 0), FUSO)
+    assert ini == pd.Timestamp("2018-11-04 03:00", tz="UTC")
+    _, fim = intervalo_de_parede(datetime(2018, 11, 3, 22, 0), datetime(2018, 11, 4, 0, 30), FUSO)
+    assert fim < pd.Timestamp("2018-11-04 03:00", tz="UTC")
+    assert fim >= pd.Timestamp("2018-11-04 02:59:59", tz="UTC")
+
+def test_sem_fuso():
+    ini, fim = intervalo_de_parede(datetime(2024, 1, 1, 10, 0), datetime(2024, 1, 1, 10, 5))
+    assert ini == pd.Timestamp("2024-01-01 10:00")
+    assert fim == pd.Timestamp("2024-01-01 10:05:59.999999")
+
+def test_motor_filtra_na_troca():
+    # registros dos dois 23:30 de 17/02/2018 e um fora do intervalo
+    utc = pd.to_datetime(["2018-02-18 01:30", "2018-02-18 02:30", "2018-02-18 04:00"], utc=True)
+    df = pd.DataFrame({"Time": utc.tz_convert(FUSO), "IP Address": ["1.1.1.1", "2.2.2.2", "3.3.3.3"]})
+    minimo = df["Time"].min().tz_localize(None)
+    intervalo = intervalo_de_parede(minimo, minimo, FUSO)
+    filtrado = MotorFiltros(df).aplicar([("Time", "intervalo", intervalo)])
+    assert filtrado["IP Address"].tolist() == ["1.1.1.1", "2.2.2.2"]
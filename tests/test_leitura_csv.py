@@ -0,0 +1,68 @@
+"""
+Leitura de CSV com bytes fora do encoding detectado na amostra.
+
+Rodar na raiz do repositório:
+    python -m pytest tests
+"""
+from io import BytesIO
+
+import pandas as pd
+
+from analise import codificacao, leitura_csv
+from analise.hashing import gerar_hash
+from analise.ingestao import ler_arquivo
+
+def _csv_misto(linhas: int = 9000) -> bytes:
+    # UTF-8 válido até a penúltima linha (bem além da amostra); a última em Latin-1
+    corpo = ["Data,Cidade,IP"] + [f"2024-01-01 10:{i % 60:02d}:00,Ribeirão Preto,10.0.{i % 250}.1"
+                                  for i in range(linhas)]
+    texto = ("\n".join(corpo) + "\n").encode("utf-8")
+    assert len(texto) > codificacao.TAMANHO_AMOSTRA
+    return texto + "2024-01-02 10:00:00,São Paulo,1.2.3.4\n".encode("latin-1")
+
+def test_csv_com_final_latin1_e_lido_inteiro():
+    conteudo = _csv_misto()
+    digest = gerar_hash(conteudo, "sha512")
+    resultado = ler_arquivo("cdr.csv", BytesIO(conteudo), digest)
+
+    df = resultado["df"]
+    assert df is not None
+    assert len(df) == 9001
+    assert df["Cidade"].iloc[0] == "Ribeirão Preto"
+    assert df["Cidade"].iloc[-1] == "São Paulo"
+    assert not [m for nivel, m in resultado["avisos"] if nivel == "error"]
+    assert [m for nivel, m in resultado["avisos"] if nivel == "warning" and "Windows-1252" in m]
+    # a detecção pela amostra não é mais reaproveitada para esse arquivo
+    assert digest not in codificacao._memo
+
+def test_csv_valido_sem_aviso():
+    conteudo = "Data,IP\n2024-01-01 10:00:00,1.2.3.4\n".encode("utf-8")
+    resultado = ler_arquivo("ok.csv", BytesIO(conteudo))
+    assert len(resultado["df"]) == 1
+    assert not [m for nivel, m in resultado["avisos"] if nivel != "info"]
+
+def test_csv_em_blocos_com_final_latin1(monkeypatch):
+    # caminho de arquivos grandes: os blocos anteriores ao byte inválido não se perdem
+    monkeypatch.setattr(leitura_csv, "LIMIAR_BLOCOS", 1024)
+    resultado = ler_arquivo("cdr.csv", BytesIO(_csv_misto()))
+
+    df = resultado["df"]
+    assert len(df) == 9001
+    assert isinstance(df["Cidade"].dtype, pd.CategoricalDtype)
+    assert df["Cidade"].iloc[-1] == "São Paulo"
+    assert [m for nivel, m in resultado["avisos"] if "em blocos" in m]
+    assert [m for nivel, m in resultado["avisos"] if nivel == "warning" and "Windows-1252" in m]
+
+    # vários blocos, o inválido no último
+    em_blocos = leitura_csv.ler_csv_em_blocos(BytesIO(_csv_misto()), "utf-8", tamanho_bloco=1000)
+    assert len(em_blocos) == 9001
+    assert em_blocos["Cidade"].iloc[-1] == "São Paulo"
+    assert em_blocos["Data"].iloc[0] == "2024-01-01 10:00:00"
+
+def test_pyarrow_nao_devolve_coluna_binaria():
+    # coluna numérica na amostra e texto inválido no fim: o pyarrow a entregaria como bytes
+    linhas = ["n,c"] + [f"{i},{i}" for i in range(3000)]
+    conteudo = ("\n".join(linhas) + "\n").encode("utf-8") + "9,São\n".encode("latin-1")
+    df = leitura_csv.ler_csv(BytesIO(conteudo), "utf-8")
+    assert len(df) == 3001
+    assert df["c"].iloc[-1] == "São"
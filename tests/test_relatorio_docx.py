@@ -0,0 +1,64 @@
+"""
+Ida e volta do relatório DOCX: o arquivo gerado precisa abrir no python-docx
+com o mesmo cabeçalho e as mesmas células da tabela IP × Time.
+
+Rodar na raiz do repositório:
+    python -m pytest tests
+"""
+from io import BytesIO
+
+import pandas as pd
+import pytest
+
+docx = pytest.importorskip("docx")
+
+from analise import relatorio, relatorio_docx  # noqa: E402
+
+def _tabela_do_docx(docx_bytes: bytes):
+    return docx.Document(BytesIO(docx_bytes)).tables[0]
+
+def _gerar(tabela: pd.DataFrame) -> bytes:
+    doc = docx.Document()
+    relatorio_docx._tabela_docx(doc, relatorio.COLUNAS_TABELA,
+                                [tabela[c].astype(str).tolist() for c in relatorio.COLUNAS_TABELA],
+                                linhas_por_bloco=7)
+    bio = BytesIO()
+    doc.save(bio)
+    return bio.getvalue()
+
+def test_tabela_reaberta_com_as_mesmas_celulas():
+    # mais linhas que um bloco, para cobrir a junção dos blocos
+    tabela = pd.DataFrame({
+        "Time (America/Sao_Paulo)": [f"01/02/2024 10:{i:02d}:00" for i in range(25)],
+        "IP Address": [f"10.0.0.{i}" for i in range(24)] + ["[2001:db8::1]:8080"],
+    })
+    t = _tabela_do_docx(_gerar(tabela))
+    assert [c.text for c in t.rows[0].cells] == relatorio.COLUNAS_TABELA
+    assert len(t.rows) == len(tabela) + 1
+    linhas = [[c.text for c in row.cells] for row in t.rows[1:]]
+    assert linhas == tabela[relatorio.COLUNAS_TABELA].values.tolist()
+
+def test_caracteres_especiais_escapados():
+    tabela = pd.DataFrame({
+        "Time (America/Sao_Paulo)": ["<01/02/2024> & \"10:00\""],
+        "IP Address": ["1.2.3.4\x00\x1f"],  # controles que o XML não aceita são descartados
+    })
+    t = _tabela_do_docx(_gerar(tabela))
+    assert [c.text for c in t.rows[1].cells] == ["<01/02/2024> & \"10:00\"", "1.2.3.4"]
+
+def test_relatorio_completo():
+    df = pd.DataFrame({
+        "Time": pd.to_datetime(["2024-01-01 12:00:00", "2024-01-02 13:30:00", "2024-01-03 09:15:00"], utc=True),
+        "IP Address": ["1.2.3.4", "2001:db8::1", "1.2.3.4"],
+    })
+    modelo = relatorio.montar_modelo(df, None, False, {"Caso": "teste"})
+    saida = relatorio_docx.renderizar_docx(modelo)
+
+    documento = docx.Document(BytesIO(saida))
+    t = documento.tables[0]
+    assert [c.text for c in t.rows[0].cells] == relatorio.COLUNAS_TABELA
+    assert len(t.rows) == len(df) + 1
+    # mais recentes primeiro, no fuso do relatório
+    assert [c.text for c in t.rows[1].cells] == ["03/01/2024 06:15:00", "1.2.3.4"]
+    assert [c.text for c in t.rows[3].cells] == ["01/01/2024 09:00:00", "1.2.3.4"]
+    assert documento.paragraphs[-1].text == modelo.content_hash